@@ -3,20 +3,46 @@
 🙏 Biblia API - Professional FastAPI Backend
 Target: 50+ year old users | Focus: Simplicity + Accessibility + Performance
 """
-from fastapi import FastAPI, HTTPException, Query, status
+from fastapi import FastAPI, Header, HTTPException, Query, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from typing import List, Dict, Optional
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+from typing import List, Dict, Optional, Tuple
+from itertools import chain
 import os
 import sys
+import asyncio
 import logging
 from datetime import datetime
+from urllib.parse import quote
+from zoneinfo import ZoneInfo
 
 # Add current directory to path for models import
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
     from models import DatabaseManager, Book as BookModel, Chapter as ChapterModel, Verse as VerseModel
+    from async_db import create_async_db
+    from corpus import CorpusStore, daily_position, database_marker, database_version
+    from corpus_stats import CorpusStats
+    from search_queries import (SEARCH_MODES as SQL_SEARCH_MODES, count_params, count_query, page_key,
+                                search_params, search_query)
+    from search_engine import SearchEngine, TESTAMENTS
+    from highlight import HIGHLIGHT_MODES, add_highlight, like_spans, token_spans
+    from suggest import MAX_SUGGESTIONS, Suggester
+    from fuzzy import CORRECTED_BOOK_HEADER, CORRECTED_QUERY_HEADER
+    from http_cache import CacheRule, ConditionalCacheMiddleware
+    from book_resolver import BookResolver, not_found_message
+    from catalog import get_catalog
+    from references import (MAX_REFERENCES, InvalidReferenceError, UnknownBookError, parse_references,
+                            passage_query)
+    from export import EXPORT_FORMATS, export_filename, export_stream
+    from responses import EncodedCache, EncodedResponse, FastJSONResponse
+    from pagination import (NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, CountCache, InvalidCursorError,
+                            cursor_scope, decode_cursor, page_headers)
+    from schemas import (BookOut, ChapterOut, ChapterPayloadOut, DailyVerseOut, PassageResultOut,
+                         SearchResultOut, VerseOut)
 except ImportError as e:
     print(f"❌ Error importing models: {e}")
     print("📂 Current directory:", os.getcwd())
@@ -41,9 +67,74 @@ app = FastAPI(
     """,
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    default_response_class=FastJSONResponse
 )
 
+CORPUS_STORE_ENABLED = os.getenv('CORPUS_STORE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+# Binary corpus snapshot (snapshot.py export); when set the corpus is loaded from it instead of Postgres
+CORPUS_SNAPSHOT_PATH = os.getenv('CORPUS_SNAPSHOT_PATH') or None
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+DAILY_VERSE_TZ = ZoneInfo(os.getenv('DAILY_VERSE_TZ', 'America/Sao_Paulo'))
+SEARCH_MODES = ('index',) + SQL_SEARCH_MODES
+SEARCH_MODE = os.getenv('SEARCH_MODE', 'index').lower()
+# Retry searches that match nothing with misspelled words corrected (needs the corpus store)
+FUZZY_SEARCH_ENABLED = os.getenv('FUZZY_SEARCH_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+HTTP_CACHE_ENABLED = os.getenv('HTTP_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+HTTP_CACHE_MAX_AGE = int(os.getenv('HTTP_CACHE_MAX_AGE', '300'))
+PASSAGE_MAX_VERSES = int(os.getenv('PASSAGE_MAX_VERSES', '500'))
+# Seconds /health waits for the database probe
+HEALTH_DB_TIMEOUT = float(os.getenv('HEALTH_DB_TIMEOUT', '1'))
+# Without the corpus store, how often (seconds) the corpus tables are checked for ingests
+DATABASE_VERSION_TTL = int(os.getenv('DATABASE_VERSION_TTL', '30'))
+
+# Fingerprint of the corpus tables, used as the HTTP cache version when the store is not loaded,
+# and the cheap marker polled to notice when it must be recomputed
+database_corpus_version = None
+database_corpus_marker = None
+database_version_task = None
+database_pool_ready = False
+
+def corpus_version():
+    """(version, last_modified) for HTTP validators, or None while unknown"""
+    if corpus_store.loaded:
+        data = corpus_store.data
+        return data.version, data.last_modified
+    return database_corpus_version
+
+def corpus_max_age() -> int:
+    """Cache-Control max-age; served from the database, content may change on the next version check"""
+    if corpus_store.loaded:
+        return HTTP_CACHE_MAX_AGE
+    return min(HTTP_CACHE_MAX_AGE, DATABASE_VERSION_TTL)
+
+def daily_verse_date():
+    return datetime.now(DAILY_VERSE_TZ).date()
+
+def seconds_until_next_day() -> int:
+    now = datetime.now(DAILY_VERSE_TZ)
+    return max(1, 86400 - (now.hour * 3600 + now.minute * 60 + now.second))
+
+# Conditional caching; registered before CORS so 304 responses still carry CORS headers
+if HTTP_CACHE_ENABLED:
+    app.add_middleware(
+        ConditionalCacheMiddleware,
+        validator=corpus_version,
+        salt=f"{app.version}:{SEARCH_MODE}",
+        rules=[
+            CacheRule("/verses/random", None),
+            CacheRule("/verses/daily", lambda: min(corpus_max_age(), seconds_until_next_day()),
+                      variant=lambda: daily_verse_date().isoformat()),
+            CacheRule("/books", corpus_max_age),
+            CacheRule("/chapters", corpus_max_age),
+            CacheRule("/verses", corpus_max_age),
+            CacheRule("/verse/", corpus_max_age),
+            CacheRule("/passage", corpus_max_age),
+            CacheRule("/search", corpus_max_age),
+            CacheRule("/stats", corpus_max_age),
+        ]
+    )
+
 # Professional CORS configuration
 app.add_middleware(
     CORSMiddleware,
@@ -56,6 +147,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, CORRECTED_QUERY_HEADER, CORRECTED_BOOK_HEADER],
 )
 
 # Initialize database models with error handling
@@ -64,11 +156,103 @@ try:
     book_model = BookModel(db_manager)
     chapter_model = ChapterModel(db_manager)
     verse_model = VerseModel(db_manager)
+    async_db = create_async_db(db_manager)
+    corpus_store = CorpusStore()
+    search_engine = SearchEngine()
+    corpus_store.add_listener(search_engine.on_corpus_loaded)
+    suggester = Suggester()
+    corpus_store.add_listener(suggester.on_corpus_loaded)
+    corpus_stats = CorpusStats()
+    corpus_store.add_listener(lambda store: corpus_stats.load(
+        None if CORPUS_SNAPSHOT_PATH else db_manager, store.data
+    ))
+    corpus_store.add_listener(lambda store: set_book_resolver(BookResolver.from_corpus(store.data)))
+    # Encoded /books and chapter payloads, valid until the next corpus reload
+    encoded_cache = EncodedCache()
+    corpus_store.add_listener(lambda store: warm_encoded_cache(store))
+    # X-Total-Count of listings, keyed by corpus version
+    count_cache = CountCache()
     logger.info("✅ Database models initialized successfully")
 except Exception as e:
     logger.error(f"❌ Failed to initialize database models: {e}")
     raise
 
+def parse_cursor(cursor: Optional[str], scope: str, size: int):
+    """Decode a page cursor for the current query (None for the first page)"""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor, scope, size)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+async def cached_count(key: tuple, query: str, params: tuple) -> int:
+    """Total rows of a listing, counted once per corpus version"""
+    version = corpus_version()
+    key = (version[0] if version else None, *key)
+    total = count_cache.get(key) if version else None
+    if total is None:
+        result = await async_db.execute_query(query, params, fetch=True)
+        total = result[0]['count'] if result else 0
+        if version:
+            count_cache.put(key, total)
+    return total
+
+def warm_encoded_cache(store: CorpusStore):
+    """Drop the previous corpus' payloads and render every chapter of the new one once"""
+    encoded_cache.clear()
+    encoded_cache.warm((('chapter', chapter.id), store.get_chapter_payload(chapter.id))
+                       for chapter in store.data.chapters)
+    logger.info(f"📄 Chapter payloads rendered: {encoded_cache.stats()}")
+
+async def load_corpus_store():
+    """Load (or reload) the in-memory corpus without blocking the event loop"""
+    if CORPUS_SNAPSHOT_PATH:
+        await asyncio.get_running_loop().run_in_executor(None, corpus_store.load_snapshot, CORPUS_SNAPSHOT_PATH)
+    else:
+        await asyncio.get_running_loop().run_in_executor(None, corpus_store.load, db_manager)
+
+# Book name/abbreviation -> id, rebuilt with the corpus store (or loaded from the books table)
+book_resolver: Optional[BookResolver] = None
+
+def set_book_resolver(resolver: BookResolver):
+    global book_resolver
+    book_resolver = resolver
+
+async def get_book_resolver() -> BookResolver:
+    if book_resolver is None:
+        books = await async_db.execute_query(
+            "SELECT id, name, url, total_chapters, biblical_order FROM books ORDER BY biblical_order NULLS LAST, id",
+            fetch=True
+        )
+        set_book_resolver(BookResolver(get_catalog().in_order(books)))
+        logger.info(f"🔤 Book resolver built from database: {book_resolver.alias_count} aliases")
+    return book_resolver
+
+async def resolve_book(name: str) -> Tuple[int, Dict[str, str]]:
+    """Book id for a name and the headers reporting a spelling correction; 404 with candidates if none"""
+    resolver = await get_book_resolver()
+    match = resolver.match(name)
+    if match.book_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=not_found_message(name, match.candidates)
+        )
+    return match.book_id, book_correction_headers(
+        [resolver.book_by_id[match.book_id]['name']] if match.corrected else []
+    )
+
+def book_correction_headers(names: List[str]) -> Dict[str, str]:
+    names = list(dict.fromkeys(names))
+    return {CORRECTED_BOOK_HEADER: quote(', '.join(names))} if names else {}
+
+def validate_testament(testament: Optional[str]):
+    if testament is not None and testament not in TESTAMENTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Testamento inválido. Use: {', '.join(TESTAMENTS)}"
+        )
+
 # Exception handler for professional error responses
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
@@ -95,26 +279,53 @@ async def root():
         "quick_links": {
             "all_books": "/books",
             "random_verse": "/verses/random",
+            "daily_verse": "/verses/daily",
+            "passage": "/passage?ref=Sl 23",
             "search_love": "/search?q=amor",
-            "stats": "/stats"
+            "stats": "/stats",
+            "export": "/export?format=ndjson"
         },
         "timestamp": datetime.now().isoformat()
     }
 
+def snapshot_health(database: str) -> Dict:
+    data = corpus_store.data
+    return {
+        "status": "✅ Healthy",
+        "database": database,
+        "books_count": len(data.books),
+        "corpus_store": f"✅ Loaded from {data.source}",
+        "search_index": "✅ Ready" if search_engine.ready else "⚠️ Not built",
+        "timestamp": datetime.now().isoformat(),
+        "uptime": "Ready to serve"
+    }
+
 @app.get("/health", tags=["🏥 Health"])
 async def health_check():
     """🏥 Professional Health Check"""
+    # Serving from the snapshot before Postgres is reachable: healthy without waiting on the pool
+    if corpus_store.loaded and CORPUS_SNAPSHOT_PATH and not database_pool_ready:
+        return snapshot_health("⚠️ Not connected, serving from snapshot")
     try:
-        # Test database connection
-        books = book_model.get_all()
+        # Test database connection; bounded so container healthchecks never wait on DB_POOL_TIMEOUT
+        result = await asyncio.wait_for(
+            async_db.execute_query("SELECT COUNT(*) AS count FROM books", fetch=True),
+            HEALTH_DB_TIMEOUT
+        )
         return {
             "status": "✅ Healthy",
             "database": "✅ Connected",
-            "books_count": len(books),
+            "books_count": result[0]['count'],
+            "db_pool": async_db.pool_stats(),
+            "corpus_store": f"✅ Loaded from {corpus_store.data.source}" if corpus_store.loaded
+                            else "⚠️ Not loaded (serving from database)",
+            "search_index": "✅ Ready" if search_engine.ready else "⚠️ Not built (using full-text SQL)",
             "timestamp": datetime.now().isoformat(),
             "uptime": "Ready to serve"
         }
     except Exception as e:
+        if corpus_store.loaded and CORPUS_SNAPSHOT_PATH:
+            return snapshot_health(f"⚠️ Unavailable ({e.__class__.__name__}), serving from snapshot")
         logger.error(f"❌ Health check failed: {e}")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -123,19 +334,22 @@ async def health_check():
 
 # ==================== BOOKS API ====================
 
-@app.get("/books", response_model=List[Dict], tags=["📚 Books"])
+@app.get("/books", response_model=List[BookOut], tags=["📚 Books"])
 async def get_books():
     """📚 Lista todos os 66 livros da Bíblia em ordem bíblica"""
     try:
-        # Use biblical order instead of random ID order
+        if corpus_store.loaded:
+            return EncodedResponse(encoded_cache.get('books', corpus_store.list_books))
+
+        # Biblical order (from the catalog where biblical_order is not set) instead of ID order
         query = """
-        SELECT id, name, testament, url, total_chapters, created_at, biblical_order
+        SELECT id, name, testament, url, total_chapters, biblical_order
         FROM books
         ORDER BY biblical_order
         """
-        books = db_manager.execute_query(query, fetch=True)
+        books = get_catalog().in_order(await async_db.execute_query(query, fetch=True))
         logger.info(f"📚 Retrieved {len(books)} books in biblical order")
-        return books
+        return FastJSONResponse(books)
     except Exception as e:
         logger.error(f"❌ Error fetching books: {e}")
         raise HTTPException(
@@ -143,11 +357,17 @@ async def get_books():
             detail="Erro ao buscar livros da Bíblia"
         )
 
-@app.get("/books/{book_id}", response_model=Dict, tags=["📚 Books"])
+BOOK_QUERY = "SELECT id, name, testament, url, total_chapters, biblical_order FROM books WHERE id = %s"
+
+@app.get("/books/{book_id}", response_model=BookOut, tags=["📚 Books"])
 async def get_book(book_id: int):
     """📖 Detalhes de um livro específico"""
     try:
-        book = book_model.get_by_id(book_id)
+        if corpus_store.loaded:
+            book = corpus_store.get_book(book_id)
+        else:
+            result = await async_db.execute_query(BOOK_QUERY, (book_id,), fetch=True)
+            book = result[0] if result else None
         if not book:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -155,7 +375,7 @@ async def get_book(book_id: int):
             )
 
         logger.info(f"📖 Retrieved book: {book.get('name', 'Unknown')}")
-        return book
+        return FastJSONResponse(book)
     except HTTPException:
         raise
     except Exception as e:
@@ -165,12 +385,49 @@ async def get_book(book_id: int):
             detail="Erro ao buscar detalhes do livro"
         )
 
-@app.get("/books/{book_id}/chapters", response_model=List[Dict], tags=["📚 Books"])
-async def get_book_chapters(book_id: int):
-    """📑 Todos os capítulos de um livro"""
+CHAPTER_COLUMNS = """
+SELECT c.id, c.book_id, c.chapter_number, c.total_verses, b.name as book_name, b.testament
+FROM chapters c
+JOIN books b ON c.book_id = b.id
+"""
+
+CHAPTER_COUNT_QUERY = "SELECT COUNT(*) AS count FROM chapters WHERE book_id = %s"
+
+@app.get("/books/{book_id}/chapters", response_model=List[ChapterOut], tags=["📚 Books"])
+async def get_book_chapters(
+    book_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Capítulos por página (padrão: todos)"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (cabeçalho X-Next-Cursor)")
+):
+    """📑 Capítulos de um livro, inteiros ou paginados"""
     try:
+        scope = cursor_scope('book_chapters', book_id)
+        after = parse_cursor(cursor, scope, 1)
+        after_number = after[0] if after else 0
+
+        if corpus_store.loaded:
+            book = corpus_store.data.book_by_id.get(book_id)
+            if book is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Livro com ID {book_id} não encontrado"
+                )
+            total = book.chapter_end - book.chapter_start
+            if limit is None and after is None:
+                body = encoded_cache.get(('book_chapters', book_id), lambda: corpus_store.get_book_chapters(book_id))
+                return EncodedResponse(body, headers=page_headers(total, None, scope))
+
+            chapters = [chapter for chapter in corpus_store.get_book_chapters(book_id)
+                        if chapter['chapter_number'] > after_number]
+            has_more = limit is not None and len(chapters) > limit
+            chapters = chapters[:limit]
+            return FastJSONResponse(chapters, headers=page_headers(
+                total, (chapters[-1]['chapter_number'],) if has_more else None, scope
+            ))
+
         # Verify book exists
-        book = book_model.get_by_id(book_id)
+        result = await async_db.execute_query(BOOK_QUERY, (book_id,), fetch=True)
+        book = result[0] if result else None
         if not book:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -178,17 +435,23 @@ async def get_book_chapters(book_id: int):
             )
 
         # Get chapters
-        query = """
-        SELECT c.*, b.name as book_name
-        FROM chapters c
-        JOIN books b ON c.book_id = b.id
-        WHERE c.book_id = %s
+        query = CHAPTER_COLUMNS + """
+        WHERE c.book_id = %s AND c.chapter_number > %s
         ORDER BY c.chapter_number
+        LIMIT %s
         """
-        chapters = db_manager.execute_query(query, (book_id,), fetch=True)
+        chapters = await async_db.execute_query(
+            query, (book_id, after_number, limit + 1 if limit else None), fetch=True
+        )
+        has_more = limit is not None and len(chapters) > limit
+        chapters = chapters[:limit]
+
+        total = await cached_count(('book_chapters', book_id), CHAPTER_COUNT_QUERY, (book_id,))
 
         logger.info(f"📑 Retrieved {len(chapters)} chapters for book {book.get('name', book_id)}")
-        return chapters
+        return FastJSONResponse(chapters, headers=page_headers(
+            total, (chapters[-1]['chapter_number'],) if has_more else None, scope
+        ))
     except HTTPException:
         raise
     except Exception as e:
@@ -200,17 +463,21 @@ async def get_book_chapters(book_id: int):
 
 # ==================== CHAPTERS API ====================
 
-@app.get("/chapters/{chapter_id}", response_model=Dict, tags=["📄 Chapters"])
+@app.get("/chapters/{chapter_id}", response_model=ChapterOut, tags=["📄 Chapters"])
 async def get_chapter(chapter_id: int):
     """📄 Detalhes de um capítulo específico"""
     try:
-        query = """
-        SELECT c.*, b.name as book_name, b.testament
-        FROM chapters c
-        JOIN books b ON c.book_id = b.id
-        WHERE c.id = %s
-        """
-        result = db_manager.execute_query(query, (chapter_id,), fetch=True)
+        if corpus_store.loaded:
+            chapter = corpus_store.get_chapter(chapter_id)
+            if not chapter:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Capítulo com ID {chapter_id} não encontrado"
+                )
+            return FastJSONResponse(chapter)
+
+        query = CHAPTER_COLUMNS + "WHERE c.id = %s"
+        result = await async_db.execute_query(query, (chapter_id,), fetch=True)
 
         if not result:
             raise HTTPException(
@@ -220,7 +487,7 @@ async def get_chapter(chapter_id: int):
 
         chapter = result[0]
         logger.info(f"📄 Retrieved chapter: {chapter.get('book_name')} {chapter.get('chapter_number')}")
-        return chapter
+        return FastJSONResponse(chapter)
     except HTTPException:
         raise
     except Exception as e:
@@ -230,14 +497,49 @@ async def get_chapter(chapter_id: int):
             detail="Erro ao buscar detalhes do capítulo"
         )
 
-@app.get("/chapters/{chapter_id}/verses", response_model=List[Dict], tags=["📄 Chapters"])
+CHAPTER_PAYLOAD_QUERY = "SELECT payload FROM chapter_payloads WHERE chapter_id = %s"
+
+# Fallback while chapter_payloads is not populated: the same document built from the base tables
+CHAPTER_NAV_QUERY = """
+SELECT * FROM (
+    SELECT c.id, c.book_id, c.chapter_number, c.total_verses, b.name as book_name, b.testament,
+           LAG(c.id) OVER w AS prev_chapter_id,
+           LEAD(c.id) OVER w AS next_chapter_id
+    FROM chapters c
+    JOIN books b ON c.book_id = b.id
+    WINDOW w AS (ORDER BY b.biblical_order NULLS LAST, b.id, c.chapter_number)
+) nav
+WHERE id = %s
+"""
+CHAPTER_VERSES_QUERY = """
+SELECT id, verse_number, text
+FROM verses
+WHERE chapter_id = %s
+ORDER BY verse_number
+"""
+
+@app.get("/chapters/{chapter_id}/verses", response_model=ChapterPayloadOut, tags=["📄 Chapters"])
 async def get_chapter_verses(chapter_id: int):
-    """📝 Todos os versículos de um capítulo"""
+    """📝 Capítulo para leitura: cabeçalho, capítulos anterior/seguinte e todos os versículos"""
     try:
-        # Verify chapter exists
-        query = "SELECT c.*, b.name as book_name FROM chapters c JOIN books b ON c.book_id = b.id WHERE c.id = %s"
-        result = db_manager.execute_query(query, (chapter_id,), fetch=True)
+        if corpus_store.loaded:
+            body = encoded_cache.get(('chapter', chapter_id), lambda: corpus_store.get_chapter_payload(chapter_id))
+            if body is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Capítulo com ID {chapter_id} não encontrado"
+                )
+            return EncodedResponse(body)
+
+        try:
+            result = await async_db.execute_query(CHAPTER_PAYLOAD_QUERY, (chapter_id,), fetch=True)
+        except Exception as e:
+            logger.warning(f"⚠️ chapter_payloads unavailable ({e}), building chapter {chapter_id} from tables")
+            result = None
+        if result:
+            return EncodedResponse(result[0]['payload'].encode('utf-8'))
 
+        result = await async_db.execute_query(CHAPTER_NAV_QUERY, (chapter_id,), fetch=True)
         if not result:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -245,20 +547,9 @@ async def get_chapter_verses(chapter_id: int):
             )
 
         chapter = result[0]
-
-        # Get verses with book context
-        verses_query = """
-        SELECT v.*, c.chapter_number, b.name as book_name, b.testament
-        FROM verses v
-        JOIN chapters c ON v.chapter_id = c.id
-        JOIN books b ON c.book_id = b.id
-        WHERE v.chapter_id = %s
-        ORDER BY v.verse_number
-        """
-        verses = db_manager.execute_query(verses_query, (chapter_id,), fetch=True)
-
-        logger.info(f"📝 Retrieved {len(verses)} verses for {chapter.get('book_name')} {chapter.get('chapter_number')}")
-        return verses
+        chapter['verses'] = await async_db.execute_query(CHAPTER_VERSES_QUERY, (chapter_id,), fetch=True)
+        logger.info(f"📝 Built payload for {chapter['book_name']} {chapter['chapter_number']} from tables")
+        return FastJSONResponse(chapter)
     except HTTPException:
         raise
     except Exception as e:
@@ -270,30 +561,52 @@ async def get_chapter_verses(chapter_id: int):
 
 # ==================== VERSES API ====================
 
-@app.get("/verses/random", response_model=Dict, tags=["✝️ Verses"])
-async def get_random_verse():
-    """🎲 Versículo aleatório do dia - Inspiração divina"""
+# Database fallbacks for /verses/random and /verses/daily when the corpus store is not loaded
+FILTERED_VERSES_FROM = """
+FROM verses v
+JOIN chapters c ON v.chapter_id = c.id
+JOIN books b ON c.book_id = b.id
+WHERE (%s::text IS NULL OR b.testament = %s)
+  AND (%s::int IS NULL OR b.id = %s)
+"""
+VERSE_WITH_CONTEXT_COLUMNS = """
+SELECT v.id, v.chapter_id, v.verse_number, v.text,
+       c.chapter_number, b.name as book_name, b.testament,
+       b.id as book_id
+"""
+RANDOM_VERSE_QUERY = VERSE_WITH_CONTEXT_COLUMNS + FILTERED_VERSES_FROM + "ORDER BY RANDOM() LIMIT 1"
+DAILY_VERSE_COUNT_QUERY = "SELECT COUNT(*) AS count" + FILTERED_VERSES_FROM
+DAILY_VERSE_QUERY = (VERSE_WITH_CONTEXT_COLUMNS + FILTERED_VERSES_FROM
+                     + "ORDER BY b.biblical_order, c.chapter_number, v.verse_number LIMIT 1 OFFSET %s")
+daily_verse_fallback_cache: Dict[tuple, Optional[Dict]] = {}
+
+@app.get("/verses/random", response_model=VerseOut, tags=["✝️ Verses"])
+async def get_random_verse(
+    testament: Optional[str] = Query(None, description="Filtrar por testamento: old_testament ou new_testament"),
+    book_id: Optional[int] = Query(None, ge=1, description="Filtrar por livro (ID)")
+):
+    """🎲 Versículo aleatório - Inspiração divina"""
     try:
-        query = """
-        SELECT v.*, c.chapter_number, b.name as book_name, b.testament,
-               b.id as book_id, c.id as chapter_id
-        FROM verses v
-        JOIN chapters c ON v.chapter_id = c.id
-        JOIN books b ON c.book_id = b.id
-        ORDER BY RANDOM()
-        LIMIT 1
-        """
-        result = db_manager.execute_query(query, fetch=True)
+        validate_testament(testament)
 
-        if not result:
+        if corpus_store.loaded:
+            verse = corpus_store.random_verse(testament, book_id)
+        else:
+            result = await async_db.execute_query(
+                RANDOM_VERSE_QUERY,
+                (testament, testament, book_id, book_id),
+                fetch=True
+            )
+            verse = result[0] if result else None
+
+        if not verse:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Nenhum versículo encontrado"
             )
 
-        verse = result[0]
         logger.info(f"🎲 Random verse: {verse.get('book_name')} {verse.get('chapter_number')}:{verse.get('verse_number')}")
-        return verse
+        return FastJSONResponse(verse)
     except HTTPException:
         raise
     except Exception as e:
@@ -303,19 +616,79 @@ async def get_random_verse():
             detail="Erro ao buscar versículo aleatório"
         )
 
-@app.get("/verses/{verse_id}", response_model=Dict, tags=["✝️ Verses"])
+@app.get("/verses/daily", response_model=DailyVerseOut, tags=["✝️ Verses"])
+async def get_daily_verse(
+    testament: Optional[str] = Query(None, description="Filtrar por testamento: old_testament ou new_testament"),
+    book_id: Optional[int] = Query(None, ge=1, description="Filtrar por livro (ID)")
+):
+    """📅 Versículo do dia - o mesmo para todos durante o dia"""
+    try:
+        validate_testament(testament)
+        today = daily_verse_date()
+
+        if corpus_store.loaded:
+            verse = corpus_store.daily_verse(today, testament, book_id)
+        else:
+            key = (today, testament, book_id)
+            if key not in daily_verse_fallback_cache:
+                count = await async_db.execute_query(
+                    DAILY_VERSE_COUNT_QUERY,
+                    (testament, testament, book_id, book_id),
+                    fetch=True
+                )
+                verse = None
+                if count and count[0]['count']:
+                    offset = daily_position(today, count[0]['count'], testament, book_id)
+                    result = await async_db.execute_query(
+                        DAILY_VERSE_QUERY,
+                        (testament, testament, book_id, book_id, offset),
+                        fetch=True
+                    )
+                    verse = result[0] if result else None
+                daily_verse_fallback_cache.clear()
+                daily_verse_fallback_cache[key] = verse
+            verse = daily_verse_fallback_cache[key]
+
+        if not verse:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Nenhum versículo encontrado"
+            )
+
+        logger.info(f"📅 Daily verse {today}: {verse.get('book_name')} {verse.get('chapter_number')}:{verse.get('verse_number')}")
+        return FastJSONResponse({**verse, "date": today.isoformat()})
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Error fetching daily verse: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro ao buscar versículo do dia"
+        )
+
+@app.get("/verses/{verse_id}", response_model=VerseOut, tags=["✝️ Verses"])
 async def get_verse(verse_id: int):
     """✝️ Versículo específico com contexto completo"""
     try:
+        if corpus_store.loaded:
+            verse = corpus_store.get_verse(verse_id)
+            if not verse:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Versículo com ID {verse_id} não encontrado"
+                )
+            return FastJSONResponse(verse)
+
         query = """
-        SELECT v.*, c.chapter_number, b.name as book_name, b.testament,
-               b.id as book_id, c.id as chapter_id
+        SELECT v.id, v.chapter_id, v.verse_number, v.text,
+               c.chapter_number, b.name as book_name, b.testament,
+               b.id as book_id
         FROM verses v
         JOIN chapters c ON v.chapter_id = c.id
         JOIN books b ON c.book_id = b.id
         WHERE v.id = %s
         """
-        result = db_manager.execute_query(query, (verse_id,), fetch=True)
+        result = await async_db.execute_query(query, (verse_id,), fetch=True)
 
         if not result:
             raise HTTPException(
@@ -325,7 +698,7 @@ async def get_verse(verse_id: int):
 
         verse = result[0]
         logger.info(f"✝️ Retrieved verse: {verse.get('book_name')} {verse.get('chapter_number')}:{verse.get('verse_number')}")
-        return verse
+        return FastJSONResponse(verse)
     except HTTPException:
         raise
     except Exception as e:
@@ -335,35 +708,42 @@ async def get_verse(verse_id: int):
             detail="Erro ao buscar versículo"
         )
 
-@app.get("/verse/{book_name}/{chapter_num}/{verse_num}", response_model=Dict, tags=["✝️ Verses"])
+VERSE_BY_REFERENCE_QUERY = """
+SELECT v.id, v.chapter_id, v.verse_number, v.text,
+       c.chapter_number, b.name as book_name, b.testament,
+       b.id as book_id
+FROM verses v
+JOIN chapters c ON v.chapter_id = c.id
+JOIN books b ON c.book_id = b.id
+WHERE c.book_id = %s
+AND c.chapter_number = %s
+AND v.verse_number = %s
+"""
+
+@app.get("/verse/{book_name}/{chapter_num}/{verse_num}", response_model=VerseOut, tags=["✝️ Verses"])
 async def get_verse_by_reference(book_name: str, chapter_num: int, verse_num: int):
-    """📍 Versículo por referência direta (Ex: João/3/16)"""
+    """📍 Versículo por referência direta (Ex: João/3/16, Jo/3/16, 1Co/13/4)"""
     try:
-        query = """
-        SELECT v.*, c.chapter_number, b.name as book_name, b.testament,
-               b.id as book_id, c.id as chapter_id
-        FROM verses v
-        JOIN chapters c ON v.chapter_id = c.id
-        JOIN books b ON c.book_id = b.id
-        WHERE LOWER(b.name) LIKE LOWER(%s)
-        AND c.chapter_number = %s
-        AND v.verse_number = %s
-        """
-        result = db_manager.execute_query(
-            query,
-            (f"%{book_name}%", chapter_num, verse_num),
-            fetch=True
-        )
+        book_id, headers = await resolve_book(book_name)
 
-        if not result:
+        if corpus_store.loaded:
+            verse = corpus_store.get_verse_by_reference(book_id, chapter_num, verse_num)
+        else:
+            result = await async_db.execute_query(
+                VERSE_BY_REFERENCE_QUERY,
+                (book_id, chapter_num, verse_num),
+                fetch=True
+            )
+            verse = result[0] if result else None
+
+        if not verse:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Versículo {book_name} {chapter_num}:{verse_num} não encontrado"
             )
 
-        verse = result[0]
         logger.info(f"📍 Reference verse: {verse.get('book_name')} {chapter_num}:{verse_num}")
-        return verse
+        return FastJSONResponse(verse, headers=headers)
     except HTTPException:
         raise
     except Exception as e:
@@ -373,14 +753,138 @@ async def get_verse_by_reference(book_name: str, chapter_num: int, verse_num: in
             detail="Erro ao buscar versículo por referência"
         )
 
+# ==================== PASSAGES API ====================
+
+class BatchReferencesRequest(BaseModel):
+    references: List[str] = Field(..., min_length=1, max_length=MAX_REFERENCES,
+                                  description="Referências, ex.: [\"Sl 23\", \"Rm 8:28-39\", \"Jo 3:16,18\"]")
+
+async def lookup_passages(references: List[str]) -> Tuple[Dict, Dict[str, str]]:
+    """Parse references and fetch every passage at once (store ranges or a single SQL query)
+
+    Also returns the headers reporting misspelled book names that were corrected.
+    """
+    resolver = await get_book_resolver()
+    try:
+        passages = [passage for text in references for passage in parse_references(text, resolver)]
+    except UnknownBookError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except InvalidReferenceError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if len(passages) > MAX_REFERENCES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Máximo de {MAX_REFERENCES} referências por consulta"
+        )
+
+    if corpus_store.loaded:
+        groups = corpus_store.get_passages(passages, PASSAGE_MAX_VERSES)
+    else:
+        query, params = passage_query(passages, PASSAGE_MAX_VERSES + 1)
+        rows = await async_db.execute_query(query, params, fetch=True)
+        groups = None
+        if len(rows) <= PASSAGE_MAX_VERSES:
+            groups = [[] for _ in passages]
+            for row in rows:
+                groups[row.pop('position')].append(row)
+
+    if groups is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Passagem muito longa (máximo de {PASSAGE_MAX_VERSES} versículos)"
+        )
+
+    headers = book_correction_headers([resolver.book_by_id[passage.book_id]['name']
+                                       for passage in passages if passage.corrected])
+    return {
+        "reference": "; ".join(passage.reference for passage in passages),
+        "passages": [
+            {
+                "reference": passage.reference,
+                "book_id": passage.book_id,
+                "book_name": resolver.book_by_id[passage.book_id]['name'],
+                "verses": verses
+            }
+            for passage, verses in zip(passages, groups)
+        ],
+        "total_verses": sum(len(verses) for verses in groups)
+    }, headers
+
+@app.get("/passage", response_model=PassageResultOut, tags=["📜 Passages"])
+async def get_passage(
+    ref: str = Query(..., min_length=2, description="Referência(s), ex.: Sl 23; Rm 8:28-39; Jo 3:16,18")
+):
+    """📜 Passagem bíblica: intervalos, capítulos inteiros e listas de referências"""
+    try:
+        result, headers = await lookup_passages([ref])
+        if not result["total_verses"]:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Passagem {ref} não encontrada"
+            )
+        logger.info(f"📜 Passage '{ref}': {result['total_verses']} verses")
+        return FastJSONResponse(result, headers=headers)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Error fetching passage '{ref}': {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro ao buscar passagem"
+        )
+
+@app.post("/verses/batch", response_model=PassageResultOut, tags=["📜 Passages"])
+async def get_verses_batch(request: BatchReferencesRequest):
+    """📚 Várias referências em uma única chamada, agrupadas por referência"""
+    try:
+        result, headers = await lookup_passages(request.references)
+        logger.info(f"📚 Batch of {len(result['passages'])} references: {result['total_verses']} verses")
+        return FastJSONResponse(result, headers=headers)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Error fetching verse batch: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro ao buscar referências"
+        )
+
 # ==================== SEARCH API ====================
 
-@app.get("/search", response_model=List[Dict], tags=["🔍 Search"])
+async def run_search(q: str, mode: str, limit: int, testament: Optional[str], book_id: Optional[int],
+                     after, highlight: Optional[str]):
+    """(rows, next page key, total matches) of one search page"""
+    if mode == 'index':
+        result, next_key = search_engine.page(q, limit, testament, book_id, after, highlight)
+        return result, next_key, search_engine.count(q, testament, book_id)
+
+    result = await async_db.execute_query(
+        search_query(mode),
+        search_params(mode, q, limit + 1, testament, book_id, after),
+        fetch=True
+    )
+    last_key = page_key(mode, result[:limit])
+    next_key = last_key if len(result) > limit else None
+    result = result[:limit]
+    total = await cached_count(('search', mode, q, testament, book_id),
+                               count_query(mode), count_params(mode, q, testament, book_id))
+    if highlight:
+        for row in result:
+            spans = like_spans(row['text'], q) if mode == 'like' else token_spans(row['text'], q)
+            add_highlight(row, spans, highlight)
+    return result, next_key, total
+
+@app.get("/search", response_model=List[SearchResultOut], tags=["🔍 Search"])
 async def search_verses(
     q: str = Query(..., min_length=2, description="Palavra ou frase para buscar"),
-    limit: int = Query(50, le=100, ge=1, description="Máximo de resultados (1-100)")
+    limit: int = Query(50, le=100, ge=1, description="Máximo de resultados (1-100)"),
+    mode: Optional[str] = Query(None, description=f"Modo de busca: {', '.join(SEARCH_MODES)}"),
+    testament: Optional[str] = Query(None, description="Filtrar por testamento: old_testament ou new_testament"),
+    book_id: Optional[int] = Query(None, ge=1, description="Filtrar por livro (ID)"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (cabeçalho X-Next-Cursor)"),
+    highlight: Optional[str] = Query(None, description=f"Destacar os termos encontrados: {', '.join(HIGHLIGHT_MODES)}")
 ):
-    """🔍 Busca inteligente de versículos por palavra-chave"""
+    """🔍 Busca inteligente de versículos por palavra-chave, paginada por cursor"""
     try:
         if len(q.strip()) < 2:
             raise HTTPException(
@@ -388,34 +892,45 @@ async def search_verses(
                 detail="Busca deve ter pelo menos 2 caracteres"
             )
 
-        # Smart search with relevance ranking
-        query = """
-        SELECT v.*, c.chapter_number, b.name as book_name, b.testament,
-               b.id as book_id, c.id as chapter_id,
-               CASE
-                   WHEN LOWER(v.text) LIKE LOWER(%s) THEN 1
-                   WHEN LOWER(v.text) LIKE LOWER(%s) THEN 2
-                   ELSE 3
-               END as relevance_score
-        FROM verses v
-        JOIN chapters c ON v.chapter_id = c.id
-        JOIN books b ON c.book_id = b.id
-        WHERE LOWER(v.text) LIKE LOWER(%s)
-        ORDER BY relevance_score, b.id, c.chapter_number, v.verse_number
-        LIMIT %s
-        """
+        mode = (mode or SEARCH_MODE).lower()
+        if mode not in SEARCH_MODES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Modo de busca inválido. Use: {', '.join(SEARCH_MODES)}"
+            )
+        validate_testament(testament)
+        if highlight is not None and highlight not in HIGHLIGHT_MODES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Destaque inválido. Use: {', '.join(HIGHLIGHT_MODES)}"
+            )
 
-        exact_match = f"%{q}%"
-        word_match = f"% {q} %"
+        # The embedded index is rebuilt with the corpus store; use full-text SQL until it is ready
+        if mode == 'index' and not search_engine.ready:
+            mode = 'fts'
 
-        result = db_manager.execute_query(
-            query,
-            (exact_match, word_match, exact_match, limit),
-            fetch=True
-        )
+        # Cursors carry the sort key of the mode that produced them. Index keys are verse
+        # positions in the loaded corpus, so its version is part of the scope: a reload invalidates them.
+        scope = cursor_scope('search', mode, q, testament, book_id,
+                             search_engine.version if mode == 'index' else None)
+        after = parse_cursor(cursor, scope, 2 if mode == 'index' else 4)
+        result, next_key, total = await run_search(q, mode, limit, testament, book_id, after, highlight)
+
+        # Nothing matched: retry with misspelled words replaced by the closest corpus words.
+        # Cursors stay scoped to the original query, which is corrected the same way on every page.
+        corrected = None
+        if total == 0 and FUZZY_SEARCH_ENABLED:
+            corrected = suggester.correct(q)
+            if corrected:
+                result, next_key, total = await run_search(corrected, mode, limit, testament, book_id,
+                                                           after, highlight)
 
-        logger.info(f"🔍 Search '{q}' returned {len(result)} results")
-        return result
+        headers = page_headers(total, next_key, scope)
+        if corrected:
+            headers[CORRECTED_QUERY_HEADER] = quote(corrected)
+            logger.info(f"🔤 Search '{q}' corrected to '{corrected}'")
+        logger.info(f"🔍 Search '{q}' ({mode}) returned {len(result)} of {total} results")
+        return FastJSONResponse(result, headers=headers)
     except HTTPException:
         raise
     except Exception as e:
@@ -428,41 +943,24 @@ async def search_verses(
 @app.get("/search/suggest", tags=["🔍 Search"])
 async def search_suggestions(
     q: str = Query(..., min_length=1, description="Termo para sugestões"),
-    limit: int = Query(10, le=20, ge=1, description="Máximo de sugestões")
+    limit: int = Query(10, le=MAX_SUGGESTIONS, ge=1, description="Máximo de sugestões")
 ):
-    """💡 Sugestões inteligentes para auto-complete"""
+    """💡 Sugestões inteligentes para auto-complete: livros e palavras do texto bíblico"""
     try:
         if len(q.strip()) < 1:
-            return {"suggestions": []}
+            return FastJSONResponse({"suggestions": []})
 
-        # Get book name suggestions
-        book_query = """
-        SELECT DISTINCT name as suggestion
-        FROM books
-        WHERE LOWER(name) LIKE LOWER(%s)
-        ORDER BY name
-        LIMIT %s
-        """
-
-        book_suggestions = db_manager.execute_query(
-            book_query,
-            (f"%{q}%", limit),
-            fetch=True
-        )
+        # Built with the corpus store; without it, suggest book names only
+        if not suggester.ready:
+            resolver = await get_book_resolver()
+            suggester.load_books(resolver.books)
 
-        suggestions = [s['suggestion'] for s in book_suggestions]
-
-        # Add common biblical terms if needed
-        if len(suggestions) < limit:
-            common_terms = ['amor', 'fé', 'esperança', 'paz', 'graça', 'salvação', 'vida', 'luz']
-            matching_terms = [term for term in common_terms if q.lower() in term.lower()]
-            suggestions.extend(matching_terms[:limit - len(suggestions)])
-
-        logger.info(f"💡 Generated {len(suggestions)} suggestions for '{q}'")
-        return {"suggestions": suggestions[:limit]}
+        suggestions = suggester.suggest(q, limit)
+        logger.debug(f"💡 Generated {len(suggestions)} suggestions for '{q}'")
+        return FastJSONResponse({"suggestions": suggestions})
     except Exception as e:
         logger.error(f"❌ Suggestion error for '{q}': {e}")
-        return {"suggestions": [], "error": "Erro ao gerar sugestões"}
+        return FastJSONResponse({"suggestions": [], "error": "Erro ao gerar sugestões"})
 
 # ==================== STATISTICS API ====================
 
@@ -470,6 +968,16 @@ async def search_suggestions(
 async def get_bible_stats():
     """📊 Estatísticas completas da Bíblia"""
     try:
+        if corpus_stats.ready:
+            stats = corpus_stats.summary()
+            stats.update({
+                "api_version": "1.0.0",
+                "target_audience": "50+ years",
+                "last_updated": stats["refreshed_at"],
+                "database_status": "✅ Connected"
+            })
+            return stats
+
         stats_query = """
         SELECT
             COUNT(DISTINCT b.id) as total_books,
@@ -483,7 +991,7 @@ async def get_bible_stats():
         LEFT JOIN verses v ON c.id = v.chapter_id
         """
 
-        result = db_manager.execute_query(stats_query, fetch=True)
+        result = await async_db.execute_query(stats_query, fetch=True)
         stats = result[0] if result else {}
 
         # Add performance info
@@ -503,18 +1011,179 @@ async def get_bible_stats():
             detail="Erro ao buscar estatísticas"
         )
 
+@app.get("/stats/books/{book_id}", tags=["📊 Statistics"])
+async def get_book_stats(book_id: int):
+    """📘 Estatísticas de um livro: capítulos, versículos e palavras"""
+    try:
+        if not corpus_stats.ready:
+            await asyncio.get_running_loop().run_in_executor(None, corpus_stats.load, db_manager)
+
+        stats = corpus_stats.book(book_id)
+        if not stats:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Livro com ID {book_id} não encontrado"
+            )
+        return stats
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Error fetching statistics for book {book_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro ao buscar estatísticas do livro"
+        )
+
+# ==================== EXPORT API ====================
+
+@app.get("/export", tags=["📦 Export"])
+async def export_verses(
+    format: str = Query("ndjson", description="ndjson ou csv"),
+    book: Optional[str] = Query(None, description="Livro (nome, abreviação ou ID); omita para a Bíblia completa"),
+    testament: Optional[str] = Query(None, description="old_testament ou new_testament"),
+    after_id: int = Query(0, ge=0, description="Retomar após este ID de versículo"),
+    gzip: bool = Query(False, description="Comprimir com gzip")
+):
+    """📦 Exportação completa em streaming (NDJSON ou CSV), ordenada por ID de versículo"""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Formato inválido. Use: {', '.join(EXPORT_FORMATS)}"
+        )
+    validate_testament(testament)
+
+    book_id = book_code = None
+    headers = {}
+    if book is not None:
+        if book.isdigit():
+            book_id = int(book)
+        else:
+            book_id, headers = await resolve_book(book)
+        catalog_book = get_catalog().get(book)
+        book_code = catalog_book.code if catalog_book else str(book_id)
+
+    try:
+        body = export_stream(db_manager, format, book_id, testament, after_id, gzip)
+        # Run the query before answering so database errors still get a proper status code
+        first = await run_in_threadpool(next, body, b'')
+    except Exception as e:
+        logger.error(f"❌ Error starting export: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro ao exportar versículos"
+        )
+
+    logger.info(f"📦 Export started: format={format} book={book_id} testament={testament} after_id={after_id}")
+    filename = export_filename(format, book_code, testament, gzip)
+    return StreamingResponse(
+        chain([first], body),
+        media_type="application/gzip" if gzip else EXPORT_FORMATS[format][0],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', **headers}
+    )
+
+# ==================== ADMIN API ====================
+
+@app.post("/corpus/reload", tags=["🛠️ Admin"])
+async def reload_corpus(x_admin_token: Optional[str] = Header(None)):
+    """🔄 Recarrega o corpus em memória após uma nova ingestão"""
+    if not ADMIN_TOKEN or x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acesso negado"
+        )
+    try:
+        await refresh_database_version()
+        await load_corpus_store()
+        data = corpus_store.data
+        logger.info("🔄 Corpus store reloaded")
+        return {
+            "status": "✅ Reloaded",
+            "books": len(data.books),
+            "chapters": len(data.chapters),
+            "verses": data.verse_count,
+            "source": data.source,
+            "loaded_at": data.loaded_at.isoformat()
+        }
+    except Exception as e:
+        logger.error(f"❌ Error reloading corpus: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro ao recarregar o corpus"
+        )
+
 # ==================== STARTUP & SHUTDOWN ====================
 
+async def open_database_pool():
+    global database_pool_ready
+    try:
+        await async_db.open()
+        database_pool_ready = True
+        logger.info(f"📖 Database pool ready: {async_db.pool_stats()}")
+    except Exception as e:
+        logger.error(f"❌ Could not open database pool: {e}")
+
+async def refresh_database_version():
+    """Re-fingerprint the corpus tables (HTTP validators when the store is not loaded)"""
+    global database_corpus_version, database_corpus_marker
+    loop = asyncio.get_running_loop()
+    try:
+        database_corpus_marker = await loop.run_in_executor(None, database_marker, db_manager)
+        database_corpus_version = await loop.run_in_executor(None, database_version, db_manager)
+    except Exception as e:
+        logger.error(f"❌ Could not fingerprint corpus tables, HTTP validators disabled: {e}")
+        database_corpus_version = database_corpus_marker = None
+
+async def watch_database_version():
+    """While serving from the database, re-fingerprint the tables whenever an ingest changes them"""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(DATABASE_VERSION_TTL)
+        if corpus_store.loaded:
+            continue
+        try:
+            marker = await loop.run_in_executor(None, database_marker, db_manager)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not check corpus tables for changes: {e}")
+            continue
+        if marker != database_corpus_marker:
+            await refresh_database_version()
+            logger.info("🔄 Corpus tables changed, HTTP validators refreshed")
+
 @app.on_event("startup")
 async def startup_event():
     """🚀 Professional startup sequence"""
     logger.info("🚀 Starting Biblia API...")
-    logger.info("📖 Database connection verified")
+    if CORPUS_SNAPSHOT_PATH:
+        # Serving from the snapshot does not need Postgres: open the pool without waiting for it
+        asyncio.get_running_loop().create_task(open_database_pool())
+    else:
+        await open_database_pool()
+
+    if CORPUS_STORE_ENABLED or CORPUS_SNAPSHOT_PATH:
+        try:
+            await load_corpus_store()
+        except Exception as e:
+            logger.error(f"❌ Could not load corpus store, serving reads from database: {e}")
+
+    global database_version_task
+    if not corpus_store.loaded:
+        await refresh_database_version()
+    database_version_task = asyncio.get_running_loop().create_task(watch_database_version())
+
+    if not corpus_stats.ready:
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, corpus_stats.load, db_manager)
+        except Exception as e:
+            logger.error(f"❌ Could not load statistics summary, /stats will aggregate on demand: {e}")
     logger.info("✅ API ready to serve God's Word")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """👋 Graceful shutdown"""
+    if database_version_task is not None:
+        database_version_task.cancel()
+    await async_db.close()
+    db_manager.close()
     logger.info("👋 Biblia API shutting down gracefully")
 
 if __name__ == "__main__":
@@ -0,0 +1,127 @@
+"""
+Async data access for the FastAPI endpoints.
+
+Both managers expose the same ``execute_query(query, params, fetch)`` contract
+as ``DatabaseManager`` (``%s`` placeholders, rows as dicts), so endpoint SQL
+does not change between modes:
+
+- ``native``: psycopg 3 ``AsyncConnectionPool``; queries never touch a thread.
+- ``threadpool``: the synchronous ``DatabaseManager`` is offloaded to a
+  bounded thread pool so the event loop keeps serving other requests.
+
+The mode is selected with ``DB_ASYNC_MODE`` (default ``native``, falling back
+to ``threadpool`` when psycopg 3 is not installed).
+
+``DB_POOL_MAX_SIZE`` bounds the connections of the whole process. In native
+mode it is split between the two pools: the synchronous one keeps
+``DB_SYNC_POOL_SIZE`` (corpus load, statistics, export) and the async pool
+gets the rest.
+"""
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+from models import DatabaseManager
+
+try:
+    from psycopg.conninfo import make_conninfo
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+except ImportError:  # psycopg 3 is optional; threadpool mode works without it
+    make_conninfo = None
+    dict_row = None
+    AsyncConnectionPool = None
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDatabaseManager:
+    """Native async access through a psycopg 3 connection pool"""
+
+    mode = "native"
+
+    def __init__(self, db_manager: DatabaseManager):
+        if AsyncConnectionPool is None:
+            raise RuntimeError("psycopg[pool] is required for DB_ASYNC_MODE=native")
+        params = {
+            ('dbname' if key == 'database' else key): value
+            for key, value in db_manager.connection_params.items() if value
+        }
+        conninfo = make_conninfo(**params)
+        # Split the connection budget: endpoints query through this pool, the sync pool keeps the remainder
+        budget = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+        sync_size = max(1, min(int(os.getenv('DB_SYNC_POOL_SIZE', '2')), budget - 1))
+        db_manager.pool.resize(sync_size)
+        self.pool = AsyncConnectionPool(
+            conninfo,
+            min_size=min(int(os.getenv('DB_POOL_MIN_SIZE', '1')), max(1, budget - sync_size)),
+            max_size=max(1, budget - sync_size),
+            timeout=float(os.getenv('DB_POOL_TIMEOUT', '10')),
+            max_lifetime=float(os.getenv('DB_POOL_MAX_LIFETIME', '1800')),
+            check=AsyncConnectionPool.check_connection,
+            kwargs={"row_factory": dict_row},
+            open=False,
+        )
+
+    async def open(self):
+        await self.pool.open()
+
+    async def close(self):
+        await self.pool.close()
+
+    async def execute_query(self, query: str, params: tuple = None, fetch: bool = False):
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, params)
+                if fetch:
+                    return await cursor.fetchall()
+                return cursor.rowcount
+
+    def pool_stats(self) -> Dict:
+        return {"mode": self.mode, **self.pool.get_stats()}
+
+
+class ThreadPoolDatabaseManager:
+    """Runs the synchronous DatabaseManager on a bounded thread pool"""
+
+    mode = "threadpool"
+
+    def __init__(self, db_manager: DatabaseManager, max_workers: int = None):
+        self.db = db_manager
+        self.max_workers = max_workers or int(
+            os.getenv('DB_ASYNC_THREADS', str(db_manager.pool.max_size))
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="db"
+        )
+
+    async def open(self):
+        await asyncio.get_running_loop().run_in_executor(self.executor, self.db.pool.prefill)
+
+    async def close(self):
+        self.executor.shutdown(wait=True)
+
+    async def execute_query(self, query: str, params: tuple = None, fetch: bool = False):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, self.db.execute_query, query, params, fetch
+        )
+
+    def pool_stats(self) -> Dict:
+        return {"mode": self.mode, "threads": self.max_workers, **self.db.pool_stats()}
+
+
+def create_async_db(db_manager: DatabaseManager, mode: str = None):
+    """Build the async data access layer selected by DB_ASYNC_MODE"""
+    mode = (mode or os.getenv('DB_ASYNC_MODE', 'native')).lower()
+    if mode not in ('native', 'threadpool'):
+        raise ValueError(f"Unknown DB_ASYNC_MODE '{mode}' (use 'native' or 'threadpool')")
+
+    if mode == 'native':
+        if AsyncConnectionPool is not None:
+            return AsyncDatabaseManager(db_manager)
+        logger.warning("psycopg[pool] not installed, falling back to DB_ASYNC_MODE=threadpool")
+
+    return ThreadPoolDatabaseManager(db_manager)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark for a running Biblia API.
+
+Fires requests from N concurrent keep-alive clients and reports throughput
+and latency percentiles per concurrency level. With a blocking event loop,
+req/s stays flat as clients are added; with the async data layer it scales
+until the DB pool (DB_POOL_MAX_SIZE) saturates.
+
+Usage:
+    python benchmarks/bench_concurrency.py --url http://localhost:8001 \
+        --path /chapters/1/verses --concurrency 1 2 4 8 16 32
+"""
+import argparse
+import http.client
+import statistics
+import threading
+import time
+from urllib.parse import urlparse
+
+
+def run_client(host: str, port: int, path: str, deadline: float, latencies: list, errors: list):
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    local = []
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(str(e))
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        local.append(time.perf_counter() - start)
+    conn.close()
+    latencies.extend(local)
+
+
+def run_level(url: str, path: str, concurrency: int, duration: float) -> dict:
+    parsed = urlparse(url)
+    host, port = parsed.hostname, parsed.port or 80
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=run_client, args=(host, port, path, deadline, latencies, errors))
+        for _ in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    count = len(latencies)
+    return {
+        "concurrency": concurrency,
+        "requests": count,
+        "errors": len(errors),
+        "rps": count / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000 if count else 0.0,
+        "p95_ms": latencies[int(count * 0.95) - 1] * 1000 if count else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Biblia API concurrency benchmark")
+    parser.add_argument("--url", default="http://localhost:8001", help="API base URL")
+    parser.add_argument("--path", default="/chapters/1/verses", help="Endpoint path to hit")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32],
+                        help="Concurrent client counts to test")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per level")
+    args = parser.parse_args()
+
+    print(f"Benchmarking {args.url}{args.path} ({args.duration:.0f}s per level)")
+    print(f"{'clients':>8} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'scaling':>8}")
+
+    baseline = None
+    for level in args.concurrency:
+        result = run_level(args.url, args.path, level, args.duration)
+        baseline = baseline or result["rps"] or None
+        scaling = result["rps"] / baseline if baseline else 0.0
+        print(f"{result['concurrency']:>8} {result['requests']:>9} {result['errors']:>7} "
+              f"{result['rps']:>9.1f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {scaling:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
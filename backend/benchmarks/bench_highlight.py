@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Highlighting benchmark: what ``highlight=offsets`` / ``highlight=snippet`` add to /search.
+
+Calls the API application in-process (straight through ASGI, no HTTP client
+or network) for ``GET /search?mode=index&limit=100`` with every term, without
+highlighting and with each highlight mode, both with the search result cache
+cleared before every request (``cold``) and with it warm (``cached``). The
+modes are interleaved run by run and the median latency is reported. Exits
+with status 1 when the mean overhead of a mode exceeds ``--max-overhead``
+percent.
+
+The corpus comes from the database (DB_* env vars) or from a snapshot file.
+
+Usage:
+    python benchmarks/bench_highlight.py --runs 300
+    python benchmarks/bench_highlight.py --snapshot corpus.snap --terms amor "vida eterna"
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from urllib.parse import urlencode
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api
+from highlight import HIGHLIGHT_MODES
+
+DEFAULT_TERMS = ['amor', 'fé', 'graça', 'salvação', 'vida eterna', 'pastor', 'Jerusalém']
+
+
+async def request(path: str, params: dict) -> int:
+    """Run one GET through the ASGI app and return the response size"""
+    scope = {
+        'type': 'http', 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'root_path': '',
+        'query_string': urlencode(params).encode(), 'headers': [],
+        'server': ('bench', 80), 'client': ('127.0.0.1', 0),
+    }
+    size = 0
+    status = None
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        nonlocal size, status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        else:
+            size += len(message.get('body', b''))
+
+    await api.app(scope, receive, send)
+    if status != 200:
+        raise RuntimeError(f"GET {path} {params} returned {status}")
+    return size
+
+
+async def time_term(term: str, limit: int, runs: int, cold: bool):
+    """Median latency (µs) and response size per highlight mode (None = no highlighting)"""
+    modes = (None,) + HIGHLIGHT_MODES
+    timings = {mode: [] for mode in modes}
+    sizes = {}
+    for _ in range(runs):
+        for mode in modes:
+            params = {'q': term, 'limit': limit, 'mode': 'index'}
+            if mode:
+                params['highlight'] = mode
+            if cold:
+                api.search_engine.index.clear_cache()
+            start = time.perf_counter()
+            sizes[mode] = await request('/search', params)
+            timings[mode].append((time.perf_counter() - start) * 1_000_000)
+    return {mode: statistics.median(values) for mode, values in timings.items()}, sizes
+
+
+async def run(args):
+    print(f"{'term':<20} {'cache':<7} {'plain µs':>9} "
+          + ' '.join(f"{mode + ' µs':>12} {'+%':>7}" for mode in HIGHLIGHT_MODES))
+    overheads = {(mode, cold): [] for mode in HIGHLIGHT_MODES for cold in (True, False)}
+    for term in args.terms:
+        for cold in (True, False):
+            medians, sizes = await time_term(term, args.limit, args.runs, cold)
+            plain = medians[None]
+            line = f"{term:<20} {'cold' if cold else 'cached':<7} {plain:>9.0f} "
+            for mode in HIGHLIGHT_MODES:
+                overhead = (medians[mode] - plain) / plain * 100
+                overheads[(mode, cold)].append(overhead)
+                line += f"{medians[mode]:>12.0f} {overhead:>+6.1f}% "
+            print(line + f" ({sizes[None]} → " + ' / '.join(str(sizes[mode]) for mode in HIGHLIGHT_MODES) + " bytes)")
+
+    print()
+    failed = False
+    for (mode, cold), values in overheads.items():
+        mean = statistics.mean(values)
+        failed |= mean > args.max_overhead
+        print(f"{mode:<8} {'cold' if cold else 'cached':<7} mean overhead {mean:+.1f}%, worst {max(values):+.1f}% "
+              f"({'✅' if mean <= args.max_overhead else '❌'} limit {args.max_overhead:.0f}%)")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark search hit highlighting")
+    parser.add_argument('--snapshot', help='Load the corpus from this snapshot instead of the database')
+    parser.add_argument('--terms', nargs='+', default=DEFAULT_TERMS, help='Search terms')
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--runs', type=int, default=300, help='Requests per term, mode and cache state')
+    parser.add_argument('--max-overhead', type=float, default=10.0, help='Allowed mean overhead in percent')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    if args.snapshot:
+        api.corpus_store.load_snapshot(args.snapshot)
+    else:
+        api.corpus_store.load(api.db_manager)
+
+    sys.exit(1 if asyncio.run(run(args)) else 0)
+
+
+if __name__ == '__main__':
+    main()
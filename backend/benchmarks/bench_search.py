@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Search benchmark: LIKE scan vs Portuguese full-text search vs the embedded index.
+
+Runs every search mode over the same terms against the configured database
+(DB_* env vars) and reports mean / p95 latency and result counts per mode.
+The ``index`` mode loads the corpus once and queries the in-process engine.
+
+Usage:
+    python benchmarks/bench_search.py --terms amor "vida eterna" graça --runs 50
+    python benchmarks/bench_search.py --explain
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import CorpusStore
+from models import DatabaseManager
+from search_engine import SearchEngine
+from search_queries import SEARCH_MODES as SQL_SEARCH_MODES, search_params, search_query
+
+SEARCH_MODES = ('index',) + SQL_SEARCH_MODES
+
+DEFAULT_TERMS = ['amor', 'fé', 'graça', 'salvação', 'vida eterna', 'pastor', 'Jerusalém']
+
+
+def time_mode(db: DatabaseManager, engine: SearchEngine, mode: str, term: str, limit: int, runs: int):
+    timings = []
+    rows = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        if mode == 'index':
+            # Bypass the result cache so every run measures a cold query
+            engine.index.clear_cache()
+            rows = engine.index.search(term, limit)
+        else:
+            rows = db.execute_query(search_query(mode), search_params(mode, term, limit), fetch=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.mean(timings), timings[max(0, int(len(timings) * 0.95) - 1)], len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /search modes against Postgres")
+    parser.add_argument('--terms', nargs='+', default=DEFAULT_TERMS, help='Search terms')
+    parser.add_argument('--modes', nargs='+', default=list(SEARCH_MODES), choices=SEARCH_MODES)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--runs', type=int, default=20, help='Runs per term and mode')
+    parser.add_argument('--explain', action='store_true', help='Print EXPLAIN ANALYZE for the first term')
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+
+    engine = SearchEngine()
+    if 'index' in args.modes:
+        store = CorpusStore()
+        store.add_listener(engine.on_corpus_loaded)
+        store.load(db)
+
+    if args.explain:
+        for mode in args.modes:
+            if mode == 'index':
+                continue
+            plan = db.execute_query(
+                "EXPLAIN ANALYZE " + search_query(mode),
+                search_params(mode, args.terms[0], args.limit),
+                fetch=True
+            )
+            print(f"\n=== {mode} ===")
+            for row in plan:
+                print(row['QUERY PLAN'])
+        return
+
+    print(f"{'term':<16} {'mode':<6} {'mean ms':>9} {'p95 ms':>9} {'rows':>6}")
+    totals = {mode: [] for mode in args.modes}
+    for term in args.terms:
+        for mode in args.modes:
+            mean, p95, count = time_mode(db, engine, mode, term, args.limit, args.runs)
+            totals[mode].append(mean)
+            print(f"{term:<16} {mode:<6} {mean:>9.2f} {p95:>9.2f} {count:>6}")
+
+    print()
+    for mode, means in totals.items():
+        print(f"{mode:<6} overall mean: {statistics.mean(means):.2f} ms")
+    db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark: per-request cost of encoding a chapter's verse list.
+
+Compares, for the largest chapter (Salmos 119, 176 verses by default):
+
+- ``legacy``: what ``response_model=List[Dict]`` did, i.e. FastAPI's
+  ``serialize_response`` (validation + ``jsonable_encoder``) over rows that
+  still carry ``created_at``, then ``JSONResponse`` (stdlib json);
+- ``orjson``: the chapter reading payload (header + compact verses) encoded
+  by ``FastJSONResponse``;
+- ``cached``: an ``EncodedCache`` hit wrapped in an ``EncodedResponse``, which
+  is what ``/chapters/{id}/verses`` serves.
+
+Only serialization is timed, not routing or the database. The corpus comes
+from the database (DB_* env vars) or from a snapshot file.
+
+Usage:
+    python benchmarks/bench_serialization.py --runs 2000
+    python benchmarks/bench_serialization.py --snapshot corpus.snap --book Salmos --chapter 119
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from corpus import CorpusStore
+from responses import EncodedCache, EncodedResponse, FastJSONResponse
+
+
+def time_calls(func, runs: int):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    timings.sort()
+    return statistics.mean(timings), timings[max(0, int(len(timings) * 0.95) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response serialization of a chapter's verses")
+    parser.add_argument('--snapshot', help='Load the corpus from this snapshot instead of the database')
+    parser.add_argument('--book', default='Salmos')
+    parser.add_argument('--chapter', type=int, default=119)
+    parser.add_argument('--runs', type=int, default=1000)
+    args = parser.parse_args()
+
+    store = CorpusStore()
+    if args.snapshot:
+        store.load_snapshot(args.snapshot)
+    else:
+        from models import DatabaseManager
+        db = DatabaseManager()
+        store.load(db)
+        db.close()
+
+    data = store.data
+    book = next((book for book in data.books if book.name == args.book), None)
+    chapter = data.chapter_by_ref.get((book.id, args.chapter)) if book else None
+    if chapter is None:
+        sys.exit(f"❌ {args.book} {args.chapter} not found in the corpus")
+
+    rows = store.get_chapter_verses(chapter.id)
+    payload = store.get_chapter_payload(chapter.id)
+    created_at = datetime.now()
+    legacy_rows = [{**row, 'created_at': created_at} for row in rows]
+    field = create_model_field(name='Response_get_chapter_verses', type_=List[Dict], mode='serialization')
+    cache = EncodedCache()
+    cache.get(chapter.id, lambda: payload)
+
+    loop = asyncio.new_event_loop()
+
+    def legacy():
+        content = loop.run_until_complete(serialize_response(field=field, response_content=legacy_rows))
+        return JSONResponse(content).body
+
+    cases = {
+        'legacy': legacy,
+        'orjson': lambda: FastJSONResponse(payload).body,
+        'cached': lambda: EncodedResponse(cache.get(chapter.id, lambda: payload)).body,
+    }
+
+    print(f"{args.book} {args.chapter}: {len(rows)} verses, "
+          f"{len(cases['legacy']())} bytes legacy / {len(cases['orjson']())} bytes payload, {args.runs} runs")
+    print(f"{'path':<8} {'mean µs':>10} {'p95 µs':>10} {'speedup':>8}")
+    baseline = None
+    for name, func in cases.items():
+        mean, p95 = time_calls(func, args.runs)
+        baseline = baseline or mean
+        print(f"{name:<8} {mean:>10.1f} {p95:>10.1f} {baseline / mean:>7.1f}x")
+    loop.close()
+
+
+if __name__ == '__main__':
+    main()
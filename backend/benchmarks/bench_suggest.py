@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Autocomplete benchmark: latency of ``Suggester.suggest`` per keystroke.
+
+Builds the suggestion indexes from the corpus (database via DB_* env vars, or
+a snapshot file) and types every prefix of each term, reporting the mean
+latency per prefix length and the suggestions for the full term. Then times
+``Suggester.correct`` (the /search retry for queries with no results) on
+misspelled queries.
+
+Usage:
+    python benchmarks/bench_suggest.py --runs 2000
+    python benchmarks/bench_suggest.py --snapshot corpus.snap --terms "1 co" salvação --typos salvassão
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import CorpusStore
+from suggest import Suggester
+
+DEFAULT_TERMS = ['graça', 'salvação', 'Jerusalém', 'misericórdia', 'vida eterna', '1 Coríntios', 'apoc']
+DEFAULT_TYPOS = ['salvassão', 'misericordia', 'grassa', 'Jeruzalém', 'vida eterrna', 'xyzzy']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /search/suggest completions")
+    parser.add_argument('--snapshot', help='Load the corpus from this snapshot instead of the database')
+    parser.add_argument('--terms', nargs='+', default=DEFAULT_TERMS, help='Terms to type')
+    parser.add_argument('--typos', nargs='+', default=DEFAULT_TYPOS, help='Misspelled queries to correct')
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--runs', type=int, default=1000, help='Runs per prefix')
+    args = parser.parse_args()
+
+    store = CorpusStore()
+    suggester = Suggester()
+    store.add_listener(suggester.on_corpus_loaded)
+    started = time.perf_counter()
+    if args.snapshot:
+        store.load_snapshot(args.snapshot)
+    else:
+        from models import DatabaseManager
+        db = DatabaseManager()
+        store.load(db)
+        db.close()
+    print(f"Corpus and suggestions loaded in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    by_length = {}
+    for term in args.terms:
+        for end in range(1, len(term) + 1):
+            prefix = term[:end]
+            start = time.perf_counter()
+            for _ in range(args.runs):
+                suggester.suggest(prefix, args.limit)
+            by_length.setdefault(end, []).append((time.perf_counter() - start) / args.runs * 1_000_000)
+        print(f"{term!r:<16} → {suggester.suggest(term, args.limit)}")
+
+    print(f"\n{'prefix length':>13} {'mean µs':>9}")
+    for length, timings in sorted(by_length.items()):
+        print(f"{length:>13} {statistics.mean(timings):>9.1f}")
+
+    print(f"\n{'query':<16} {'correction':<16} {'µs':>7}")
+    for query in args.typos:
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            suggester.correct(query)
+        elapsed = (time.perf_counter() - start) / args.runs * 1_000_000
+        print(f"{query!r:<16} {suggester.correct(query)!r:<16} {elapsed:>7.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+"""
+Book name / abbreviation resolver.
+
+Readers type book names many ways: "João", "joao", "Jo", "1 Jo", "I João",
+"1Jo", "Gn", "Gên.", "Cantares". Instead of ``LOWER(name) LIKE '%q%'`` (no
+index, arbitrary first match) every accepted spelling is precomputed into an
+alias table keyed by a compact form of the text, so resolving a name is one
+dict lookup.
+
+Aliases come from, in priority order:
+
+1. the book names themselves;
+2. the bibliaonline.com.br URL codes, from ``books.url`` and the book catalog
+   (gn, ex, mt, jo...);
+3. common Portuguese abbreviations and alternative names (``ABBREVIATIONS``);
+4. unambiguous prefixes of the names ("apoc", "genes", "1cor").
+
+Keys are looked up with accents first ("jó" is Jó) and then accent-folded
+("jo" is João, following the URL codes). A name matching no alias is taken
+as a misspelling of the book whose name is most similar by trigrams
+("Geremias" is Jeremias, see ``fuzzy``), but only when the match is strong
+(``BOOK_MIN_SIMILARITY``), starts with the same sound, has a similar length
+and is clearly better than the runner-up. Otherwise nothing resolves and the
+closest names are offered as candidates: "amor" is not Amós.
+"""
+import os
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from catalog import get_catalog
+from fuzzy import MIN_SIMILARITY, TrigramIndex, sound_key
+from textnorm import fold
+
+ROMAN_PREFIX_RE = re.compile(r"^(iii|ii|i)(?=\s)")
+ROMAN_DIGITS = {'i': '1', 'ii': '2', 'iii': '3'}
+ORDINAL_RE = re.compile(r"^(\d)\s*[ºªoa]?(?=\s)")
+NON_ALNUM_RE = re.compile(r"[^\w]|_", re.UNICODE)
+NUMBER_PREFIX_RE = re.compile(r"^\d+\s*")
+
+MIN_PREFIX = 3
+
+# Book names are few and short, so a wrong correction is likelier than for search words
+BOOK_MIN_SIMILARITY = float(os.getenv('FUZZY_BOOK_MIN_SIMILARITY', '0.6'))
+MAX_LENGTH_RATIO = 1.5
+AMBIGUITY_MARGIN = 0.1   # the best match must beat the runner-up by this much
+MAX_CANDIDATES = 3
+
+# Abbreviations in common Brazilian use (ARA/ACF/NVI/Bíblia de Jerusalém), by book name
+ABBREVIATIONS: Dict[str, Tuple[str, ...]] = {
+    'Gênesis': ('gn', 'gen', 'gên'),
+    'Êxodo': ('ex', 'êx', 'exo'),
+    'Levítico': ('lv', 'lev'),
+    'Números': ('nm', 'num', 'nú'),
+    'Deuteronômio': ('dt', 'deut', 'deu'),
+    'Josué': ('js', 'jos'),
+    'Juízes': ('jz', 'juí', 'jui'),
+    'Rute': ('rt', 'rut'),
+    '1 Samuel': ('1sm', '1sam', '1s'),
+    '2 Samuel': ('2sm', '2sam', '2s'),
+    '1 Reis': ('1rs', '1re', '1rei'),
+    '2 Reis': ('2rs', '2re', '2rei'),
+    '1 Crônicas': ('1cr', '1crô', '1cron'),
+    '2 Crônicas': ('2cr', '2crô', '2cron'),
+    'Esdras': ('ed', 'esd'),
+    'Neemias': ('ne', 'nee'),
+    'Ester': ('et', 'est'),
+    'Jó': ('jó',),
+    'Salmos': ('sl', 'sal', 'salmo'),
+    'Provérbios': ('pv', 'pr', 'prov'),
+    'Eclesiastes': ('ec', 'ecl', 'coélet'),
+    'Cântico dos Cânticos': ('ct', 'cant', 'cânticos', 'cantares', 'ct dos ct'),
+    'Isaías': ('is', 'isa'),
+    'Jeremias': ('jr', 'jer'),
+    'Lamentações': ('lm', 'lam'),
+    'Ezequiel': ('ez', 'eze', 'ezeq'),
+    'Daniel': ('dn', 'dan'),
+    'Oséias': ('os', 'ose'),
+    'Joel': ('jl',),
+    'Amós': ('am',),
+    'Obadias': ('ob', 'oba', 'abd', 'abdias'),
+    'Jonas': ('jn', 'jon'),
+    'Miquéias': ('mq', 'miq'),
+    'Naum': ('na',),
+    'Habacuque': ('hc', 'hab'),
+    'Sofonias': ('sf', 'sof'),
+    'Ageu': ('ag',),
+    'Zacarias': ('zc', 'zac'),
+    'Malaquias': ('ml', 'mal'),
+    'Mateus': ('mt', 'mat'),
+    'Marcos': ('mc', 'mr', 'mar'),
+    'Lucas': ('lc', 'luc'),
+    'João': ('jo', 'joa'),
+    'Atos': ('at', 'atos dos apóstolos'),
+    'Romanos': ('rm', 'rom'),
+    '1 Coríntios': ('1co', '1cor'),
+    '2 Coríntios': ('2co', '2cor'),
+    'Gálatas': ('gl', 'gál', 'gal'),
+    'Efésios': ('ef', 'efé'),
+    'Filipenses': ('fp', 'fl', 'flp', 'fil'),
+    'Colossenses': ('cl', 'col'),
+    '1 Tessalonicenses': ('1ts', '1tes'),
+    '2 Tessalonicenses': ('2ts', '2tes'),
+    '1 Timóteo': ('1tm', '1tim'),
+    '2 Timóteo': ('2tm', '2tim'),
+    'Tito': ('tt', 'tit'),
+    'Filemom': ('fm', 'flm', 'filemon'),
+    'Hebreus': ('hb', 'heb'),
+    'Tiago': ('tg', 'tia'),
+    '1 Pedro': ('1pe', '1pd', '1ped'),
+    '2 Pedro': ('2pe', '2pd', '2ped'),
+    '1 João': ('1jo',),
+    '2 João': ('2jo',),
+    '3 João': ('3jo',),
+    'Judas': ('jd', 'jud'),
+    'Apocalipse': ('ap', 'apoc', 'apc'),
+}
+
+
+def alias_key(text: str, keep_accents: bool = False) -> str:
+    """Compact lookup form: lowercase, numbered-book prefix as a digit, no spaces or punctuation"""
+    key = text.strip().lower()
+    key = ROMAN_PREFIX_RE.sub(lambda m: ROMAN_DIGITS[m.group(1)], key)
+    key = ORDINAL_RE.sub(r"\1", key)
+    if not keep_accents:
+        key = fold(key)
+    return NON_ALNUM_RE.sub('', key)
+
+
+def url_code(url: Optional[str]) -> Optional[str]:
+    """Book code from a bibliaonline URL (``.../acf/gn`` -> ``gn``)"""
+    if not url:
+        return None
+    return url.rstrip('/').rsplit('/', 1)[-1] or None
+
+
+class BookMatch(NamedTuple):
+    book_id: Optional[int]
+    corrected: bool = False             # resolved as a misspelling, not through an alias
+    candidates: Tuple[str, ...] = ()    # closest book names when nothing resolved
+
+
+def not_found_message(name: str, candidates: Iterable[str] = ()) -> str:
+    candidates = list(candidates)
+    suggestion = f". Você quis dizer: {', '.join(candidates)}?" if candidates else ""
+    return f"Livro não encontrado: '{name}'{suggestion}"
+
+
+class BookResolver:
+    """Precomputed alias -> book id table for one set of books"""
+
+    def __init__(self, books: Iterable[Dict]):
+        """``books``: dicts with id, name, url and total_chapters, in biblical order"""
+        self.books: List[Dict] = list(books)
+        self.book_by_id: Dict[int, Dict] = {book['id']: book for book in self.books}
+        self._exact: Dict[str, int] = {}
+        self._folded: Dict[str, int] = {}
+        self._names = [(alias_key(book['name']), book['id']) for book in self.books]
+        # Numbered books are also matched without their number ("Reis": 1 Reis or 2 Reis)
+        self._similar = TrigramIndex(
+            (alias_key(name, keep_accents=True), -position, (book['id'], alias_key(name, keep_accents=True)))
+            for position, book in enumerate(self.books)
+            for name in {book['name'], NUMBER_PREFIX_RE.sub('', book['name'])}
+        )
+        self._build()
+
+    @classmethod
+    def from_corpus(cls, data) -> 'BookResolver':
+        return cls({'id': book.id, 'name': book.name, 'url': book.url, 'total_chapters': book.total_chapters}
+                   for book in data.books)
+
+    def _add(self, alias: str, book_id: int):
+        # setdefault: aliases are added in priority order, so the first claim wins
+        self._exact.setdefault(alias_key(alias, keep_accents=True), book_id)
+        self._folded.setdefault(alias_key(alias), book_id)
+
+    def _build(self):
+        for book in self.books:
+            self._add(book['name'], book['id'])
+        catalog = get_catalog()
+        for book in self.books:
+            entry = catalog.get(book['name'])
+            for code in (url_code(book.get('url')), entry.code if entry else None):
+                if code:
+                    self._add(code, book['id'])
+        for book in self.books:
+            for abbreviation in ABBREVIATIONS.get(book['name'], ()):
+                self._add(abbreviation, book['id'])
+
+        # Prefixes that identify exactly one book and are not already taken
+        owners: Dict[str, set] = {}
+        for key, book_id in self._names:
+            for end in range(MIN_PREFIX, len(key)):
+                owners.setdefault(key[:end], set()).add(book_id)
+        for prefix, book_ids in owners.items():
+            if len(book_ids) == 1:
+                self._folded.setdefault(prefix, next(iter(book_ids)))
+
+    @property
+    def alias_count(self) -> int:
+        return len(self._folded)
+
+    def match(self, name: str) -> BookMatch:
+        """Resolve a name, abbreviation or URL code, falling back to a confident spelling correction"""
+        book_id = self._exact.get(alias_key(name, keep_accents=True))
+        if book_id is not None:
+            return BookMatch(book_id)
+        key = alias_key(name)
+        if not key:
+            return BookMatch(None)
+        book_id = self._folded.get(key)
+        if book_id is not None:
+            return BookMatch(book_id)
+        if len(key) < MIN_PREFIX:
+            return BookMatch(None)
+
+        # Misspelled names: similar books that also start alike and have a similar length
+        name_key = alias_key(name, keep_accents=True)
+        sound = sound_key(name_key)
+        similar: Dict[int, float] = {}
+        for (book_id, book_key), score in self._similar.match(name_key, MIN_SIMILARITY, limit=10):
+            book_sound = sound_key(book_key)
+            if (book_id not in similar and book_sound[:1] == sound[:1]
+                    and max(len(sound), len(book_sound)) <= MAX_LENGTH_RATIO * min(len(sound), len(book_sound))):
+                similar[book_id] = score
+        ranked = list(similar.items())
+        if ranked and ranked[0][1] >= BOOK_MIN_SIMILARITY and (
+                len(ranked) == 1 or ranked[0][1] - ranked[1][1] >= AMBIGUITY_MARGIN):
+            return BookMatch(ranked[0][0], corrected=True)
+        return BookMatch(None, candidates=tuple(
+            self.book_by_id[book_id]['name'] for book_id, _ in ranked[:MAX_CANDIDATES]
+        ))
+
+    def resolve(self, name: str) -> Optional[int]:
+        """Book id for a name, abbreviation or URL code; None if nothing matches"""
+        return self.match(name).book_id
+
+    def resolve_many(self, names: Iterable[str]) -> Dict[str, Optional[int]]:
+        """Resolve several names at once; duplicates are resolved once"""
+        resolved: Dict[str, Optional[int]] = {}
+        for name in names:
+            if name not in resolved:
+                resolved[name] = self.resolve(name)
+        return resolved
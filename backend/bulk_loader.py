@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Bulk corpus ingestion with COPY.
+
+``Verse.insert_batch`` goes through ``executemany`` (one round trip per verse),
+and ``Book.insert`` / ``Chapter.insert`` each check out a connection per call.
+``BulkLoader`` loads a batch of chapters on one connection, in one transaction
+and in a fixed number of round trips:
+
+1. upsert the chapters with one multi-row ``INSERT ... RETURNING``;
+2. ``COPY`` every verse into a session temp table (``verses_stage``);
+3. merge the staged rows into ``verses`` with one ``INSERT ... SELECT ...
+   ON CONFLICT``, skipping rows whose text did not change.
+
+It is used by the scraper (one batch per group of scraped chapters) and as a
+standalone loader for corpus files:
+
+    python bulk_loader.py corpus.json            # {"books": [{"name", "testament", "url",
+                                                 #   "chapters": [{"number", "verses": [{"number", "text"}]}]}]}
+    python bulk_loader.py corpus.csv             # columns: book,testament,chapter,verse,text[,url]
+    python bulk_loader.py corpus.json --no-stats # skip the book_stats / chapter_payloads refresh
+"""
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from psycopg2.extras import execute_values
+
+from catalog import get_catalog
+from models import DatabaseManager, Book
+
+logger = logging.getLogger(__name__)
+
+# (chapter_number, [(verse_number, text), ...])
+ChapterRows = Tuple[int, List[Tuple[int, str]]]
+
+STAGE_TABLE_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS verses_stage (
+    chapter_id INTEGER NOT NULL,
+    verse_number INTEGER NOT NULL,
+    text TEXT NOT NULL
+) ON COMMIT DELETE ROWS
+"""
+
+CHAPTERS_UPSERT_SQL = """
+INSERT INTO chapters (book_id, chapter_number, total_verses)
+VALUES %s
+ON CONFLICT (book_id, chapter_number)
+DO UPDATE SET
+    total_verses = EXCLUDED.total_verses,
+    scraped_at = CURRENT_TIMESTAMP,
+    updated_at = CURRENT_TIMESTAMP
+RETURNING chapter_number, id
+"""
+
+VERSES_MERGE_SQL = """
+INSERT INTO verses (chapter_id, verse_number, text)
+SELECT chapter_id, verse_number, text FROM verses_stage
+ON CONFLICT (chapter_id, verse_number)
+DO UPDATE SET
+    text = EXCLUDED.text,
+    updated_at = CURRENT_TIMESTAMP
+WHERE verses.text IS DISTINCT FROM EXCLUDED.text
+"""
+
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+class LoadStats:
+    """Counters for one load; ``rows_per_second`` covers verses staged"""
+
+    def __init__(self):
+        self.books = 0
+        self.chapters = 0
+        self.verses = 0
+        self.verses_written = 0  # inserted or changed
+        self.seconds = 0.0
+
+    def add(self, other: 'LoadStats'):
+        self.books += other.books
+        self.chapters += other.chapters
+        self.verses += other.verses
+        self.verses_written += other.verses_written
+        self.seconds += other.seconds
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.verses / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.books} books, {self.chapters} chapters, {self.verses} verses "
+                f"({self.verses_written} written) in {self.seconds:.2f}s - {self.rows_per_second:,.0f} rows/sec")
+
+
+def copy_verses(cursor, rows: Iterable[Tuple[int, int, str]]) -> int:
+    """COPY (chapter_id, verse_number, text) rows into verses_stage; returns the row count"""
+    buffer = io.StringIO()
+    count = 0
+    for chapter_id, verse_number, text in rows:
+        buffer.write(f"{chapter_id}\t{verse_number}\t{text.translate(COPY_ESCAPES)}\n")
+        count += 1
+    buffer.seek(0)
+    cursor.execute(STAGE_TABLE_SQL)
+    cursor.copy_expert("COPY verses_stage (chapter_id, verse_number, text) FROM STDIN", buffer)
+    return count
+
+
+def load_chapters(cursor, book_id: int, chapters: Iterable[ChapterRows]) -> LoadStats:
+    """Upsert chapters and their verses on ``cursor`` (the caller commits)"""
+    stats = LoadStats()
+    started = time.perf_counter()
+
+    # Last occurrence wins, as with row-by-row upserts (ON CONFLICT cannot touch a row twice)
+    by_chapter: Dict[int, Dict[int, str]] = {}
+    for chapter_number, verses in chapters:
+        by_chapter.setdefault(chapter_number, {}).update(verses)
+    if not by_chapter:
+        return stats
+
+    chapter_ids = dict(execute_values(
+        cursor, CHAPTERS_UPSERT_SQL,
+        [(book_id, number, len(verses)) for number, verses in by_chapter.items()],
+        fetch=True,
+    ))
+    stats.chapters = len(chapter_ids)
+    stats.verses = copy_verses(cursor, (
+        (chapter_ids[number], verse_number, text)
+        for number, verses in by_chapter.items()
+        for verse_number, text in verses.items()
+    ))
+    cursor.execute(VERSES_MERGE_SQL)
+    stats.verses_written = cursor.rowcount
+    # The stage only empties on commit: clear it so the next load in this transaction merges its own rows only
+    cursor.execute("TRUNCATE verses_stage")
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+class BulkLoader:
+    """Load books and chapters with one connection and transaction per batch"""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db = db_manager
+        self.book_model = Book(db_manager)
+        self.stats = LoadStats()
+
+    def load_chapters(self, book_id: int, chapters: Iterable[ChapterRows]) -> LoadStats:
+        """Upsert a batch of chapters of one book in a single transaction"""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                stats = load_chapters(cursor, book_id, chapters)
+            conn.commit()
+        self.stats.add(stats)
+        return stats
+
+    def load_book(self, name: str, testament: str, url: str, chapters: List[ChapterRows],
+                  total_chapters: Optional[int] = None) -> LoadStats:
+        """Create the book if needed and load all its chapters in one transaction"""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT id FROM books WHERE name = %s AND testament = %s", (name, testament))
+                row = cursor.fetchone()
+                if row:
+                    book_id = row[0]
+                else:
+                    cursor.execute(
+                        "INSERT INTO books (name, testament, url, total_chapters, biblical_order) "
+                        "VALUES (%s, %s, %s, %s, %s) RETURNING id",
+                        (name, testament, url, total_chapters or len(chapters), get_catalog().order_of(name)),
+                    )
+                    book_id = cursor.fetchone()[0]
+                stats = load_chapters(cursor, book_id, chapters)
+            conn.commit()
+        stats.books = 1
+        self.stats.add(stats)
+        logger.info(f"📚 {name}: {stats}")
+        return stats
+
+    def load_corpus(self, books: Iterable[Dict], refresh_stats: bool = True) -> LoadStats:
+        """Load parsed corpus books (see ``read_corpus``), one transaction per book"""
+        for book in books:
+            self.load_book(book['name'], book['testament'], book.get('url') or '', book['chapters'],
+                           book.get('total_chapters'))
+        if refresh_stats:
+            self.book_model.refresh_stats()
+            self.book_model.refresh_chapter_payloads()
+        return self.stats
+
+
+def _json_books(path: str) -> List[Dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    books = data['books'] if isinstance(data, dict) else data
+    return [
+        {
+            'name': book['name'],
+            'testament': book['testament'],
+            'url': book.get('url'),
+            'total_chapters': book.get('total_chapters'),
+            'chapters': [
+                (chapter['number'], [(verse['number'], verse['text']) for verse in chapter['verses']])
+                for chapter in book['chapters']
+            ],
+        }
+        for book in books
+    ]
+
+
+def _csv_books(path: str) -> List[Dict]:
+    books: Dict[Tuple[str, str], Dict] = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            key = (row['book'], row['testament'])
+            book = books.setdefault(key, {'name': row['book'], 'testament': row['testament'],
+                                          'url': row.get('url'), 'chapters': {}})
+            book['chapters'].setdefault(int(row['chapter']), []).append((int(row['verse']), row['text']))
+    for book in books.values():
+        book['chapters'] = sorted(book['chapters'].items())
+    return list(books.values())
+
+
+def read_corpus(path: str) -> List[Dict]:
+    """Books from a .json or .csv corpus file, as dicts with name, testament, url and chapters"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.json':
+        return _json_books(path)
+    if extension == '.csv':
+        return _csv_books(path)
+    raise ValueError(f"Unsupported corpus file '{path}' (expected .json or .csv)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-load a corpus file into Postgres with COPY')
+    parser.add_argument('path', help='Corpus file (.json or .csv)')
+    parser.add_argument('--no-stats', action='store_true', help='Do not refresh book_stats and chapter_payloads afterwards')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    books = read_corpus(args.path)
+    db_manager = DatabaseManager()
+    try:
+        stats = BulkLoader(db_manager).load_corpus(books, refresh_stats=not args.no_stats)
+        print(f"✅ Loaded {stats}")
+    except Exception as e:
+        print(f"❌ Load failed: {e}")
+        sys.exit(1)
+    finally:
+        db_manager.close()
+
+
+if __name__ == '__main__':
+    main()
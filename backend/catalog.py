@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Canonical book catalog: the 66 books of ``bible_books.json``, loaded once.
+
+``get_catalog()`` parses the file on first use and indexes it by name,
+accent-folded name, bibliaonline URL code (``gn``, ``jó``, ``1co``) and
+testament, with each book's biblical order and chapter count. The scraper
+tooling uses it to pick books, and the API uses it to put books in biblical
+order and to seed the reference resolver, whether or not
+``books.biblical_order`` has been filled in.
+
+Usage:
+    python catalog.py                 # list the catalog
+    python catalog.py --sync-db       # write biblical_order into the books table
+"""
+import argparse
+import json
+import os
+import sys
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from textnorm import fold
+
+BIBLE_BOOKS_PATH = os.getenv(
+    'BIBLE_BOOKS_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bible_books.json')
+)
+TESTAMENTS = ('old_testament', 'new_testament')
+
+
+class CatalogBook(NamedTuple):
+    order: int      # 1-based biblical order
+    name: str
+    testament: str
+    url: str
+    code: str       # last URL segment on bibliaonline.com.br
+    chapters: int
+
+
+class BookCatalog:
+    """Books in biblical order with lookup indexes"""
+
+    def __init__(self, data: Dict):
+        """``data``: bible_books.json content ({testament: [{book, url, chapters}]})"""
+        self.books: List[CatalogBook] = []
+        for testament in TESTAMENTS:
+            for entry in data.get(testament, []):
+                self.books.append(CatalogBook(
+                    len(self.books) + 1, entry['book'], testament, entry['url'],
+                    entry['url'].rstrip('/').rsplit('/', 1)[-1], entry['chapters'],
+                ))
+
+        self._by_name = {book.name: book for book in self.books}
+        self._by_folded = {fold(book.name): book for book in self.books}
+        self._by_code = {book.code: book for book in self.books}
+        self._by_testament = {testament: [book for book in self.books if book.testament == testament]
+                              for testament in TESTAMENTS}
+
+    @classmethod
+    def from_file(cls, path: str = BIBLE_BOOKS_PATH) -> 'BookCatalog':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self.books)
+
+    def __iter__(self):
+        return iter(self.books)
+
+    def get(self, name: str) -> Optional[CatalogBook]:
+        """Book by exact name, URL code or accent-insensitive name ("jo" is João, as on the site)"""
+        if not name:
+            return None
+        return (self._by_name.get(name) or self._by_code.get(name.strip().lower())
+                or self._by_folded.get(fold(name.strip())))
+
+    def by_code(self, code: str) -> Optional[CatalogBook]:
+        return self._by_code.get(code)
+
+    def testament(self, testament: Optional[str] = None) -> List[CatalogBook]:
+        """Books of one testament (all books when None), in biblical order"""
+        return list(self.books) if testament is None else list(self._by_testament.get(testament, []))
+
+    def find(self, text: str) -> List[CatalogBook]:
+        """Exact match if any, otherwise every book whose folded name contains ``text``"""
+        book = self.get(text)
+        if book:
+            return [book]
+        key = fold(text.strip())
+        return [book for book in self.books if key in fold(book.name)]
+
+    def order_of(self, name: str) -> Optional[int]:
+        book = self._by_name.get(name)
+        return book.order if book else None
+
+    def in_order(self, rows: Iterable[Dict], name_key: str = 'name') -> List[Dict]:
+        """Book rows sorted in biblical order, with a missing ``biblical_order`` filled from the catalog
+
+        Rows for books the catalog does not know keep their relative order at the end.
+        """
+        ordered = []
+        for position, row in enumerate(rows):
+            if row.get('biblical_order') is None:
+                row = {**row, 'biblical_order': self.order_of(row[name_key])}
+            ordered.append((row['biblical_order'] is None, row['biblical_order'] or 0, position, row))
+        ordered.sort(key=lambda item: item[:3])
+        return [item[3] for item in ordered]
+
+
+@lru_cache(maxsize=None)
+def get_catalog() -> BookCatalog:
+    """The catalog, parsed once per process"""
+    return BookCatalog.from_file()
+
+
+def sync_database(db_manager) -> int:
+    """Set books.biblical_order from the catalog; returns the rows updated"""
+    from psycopg2.extras import execute_values
+
+    with db_manager.get_connection() as conn:
+        with conn.cursor() as cursor:
+            execute_values(cursor, """
+            UPDATE books b SET biblical_order = v.biblical_order
+            FROM (VALUES %s) AS v(name, biblical_order)
+            WHERE b.name = v.name AND b.biblical_order IS DISTINCT FROM v.biblical_order
+            """, [(book.name, book.order) for book in get_catalog()])
+            conn.commit()
+            return cursor.rowcount
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Canonical book catalog')
+    parser.add_argument('--sync-db', action='store_true', help='Write biblical_order into the books table')
+    args = parser.parse_args()
+
+    if args.sync_db:
+        from models import DatabaseManager
+        db_manager = DatabaseManager()
+        try:
+            print(f"✅ biblical_order updated on {sync_database(db_manager)} books")
+        except Exception as e:
+            print(f"❌ Sync failed: {e}")
+            sys.exit(1)
+        finally:
+            db_manager.close()
+        return
+
+    for book in get_catalog():
+        print(f"{book.order:>2}  {book.code:<4} {book.name:<22} {book.chapters:>3}  {book.testament}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,456 @@
+"""
+In-memory, read-only Bible corpus.
+
+The corpus is small and fixed (66 books, 1,189 chapters, 31,106 verses), so it
+is loaded once from Postgres and served from compact structures:
+
+- books and chapters are ``__slots__`` records in biblical order;
+- verses live in parallel ``array`` columns (id, number, chapter index) whose
+  rows are contiguous per chapter, so every chapter/book is an offset range;
+- all verse texts share one UTF-8 buffer addressed by an offsets array.
+
+Lookups by verse id, chapter id and (book, chapter, verse) are O(1). A reload
+builds a fresh snapshot and swaps it in atomically, then notifies listeners so
+derived indexes can rebuild.
+"""
+import hashlib
+import logging
+import random
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+from catalog import get_catalog
+from models import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+
+class BookRecord:
+    __slots__ = ('id', 'name', 'testament', 'url', 'total_chapters', 'biblical_order',
+                 'created_at', 'chapter_start', 'chapter_end', 'verse_start', 'verse_end')
+
+    def __init__(self, id: int, name: str, testament: str, url: str, total_chapters: int,
+                 biblical_order: Optional[int], created_at: Optional[datetime]):
+        self.id = id
+        self.name = name
+        self.testament = testament
+        self.url = url
+        self.total_chapters = total_chapters
+        self.biblical_order = biblical_order
+        self.created_at = created_at
+        self.chapter_start = self.chapter_end = 0
+        self.verse_start = self.verse_end = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'name': self.name,
+            'testament': self.testament,
+            'url': self.url,
+            'total_chapters': self.total_chapters,
+            'biblical_order': self.biblical_order,
+        }
+
+
+class ChapterRecord:
+    __slots__ = ('id', 'book_id', 'chapter_number', 'total_verses', 'scraped_at',
+                 'index', 'book', 'verse_start', 'verse_end')
+
+    def __init__(self, id: int, book_id: int, chapter_number: int, total_verses: Optional[int],
+                 scraped_at: Optional[datetime]):
+        self.id = id
+        self.book_id = book_id
+        self.chapter_number = chapter_number
+        self.total_verses = total_verses
+        self.scraped_at = scraped_at
+        self.index = 0
+        self.book = None
+        self.verse_start = self.verse_end = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'book_id': self.book_id,
+            'chapter_number': self.chapter_number,
+            'total_verses': self.total_verses,
+            'book_name': self.book.name,
+            'testament': self.book.testament,
+        }
+
+
+class CorpusData:
+    """One immutable snapshot of the corpus"""
+
+    def __init__(self, books: List[BookRecord], chapters: List[ChapterRecord],
+                 verse_ids, verse_numbers, verse_chapters, text_offsets, text_blob,
+                 version: Optional[str] = None, source: str = 'database'):
+        """Columns are arrays or same-typed memoryviews; ``version`` skips rehashing a known snapshot"""
+        self.books = books
+        self.chapters = chapters
+        self.verse_ids = verse_ids            # verse index -> verses.id
+        self.verse_numbers = verse_numbers    # verse index -> verse_number
+        self.verse_chapters = verse_chapters  # verse index -> chapter index
+        self.text_offsets = text_offsets      # verse index -> start in text_blob (n + 1 entries)
+        self.text_blob = text_blob            # all verse texts, UTF-8
+        self.source = source                  # 'database' or 'snapshot:<file>'
+        self.loaded_at = datetime.now()
+        self.version = version or self._content_version()
+        self.last_modified = max(
+            [chapter.scraped_at for chapter in chapters if chapter.scraped_at]
+            + [book.created_at for book in books if book.created_at],
+            default=self.loaded_at
+        )
+
+        self.book_by_id = {book.id: book for book in books}
+        self.chapter_by_id = {chapter.id: chapter for chapter in chapters}
+        self.chapter_by_ref = {(chapter.book_id, chapter.chapter_number): chapter for chapter in chapters}
+        self.verse_index_by_id = {verse_id: i for i, verse_id in enumerate(verse_ids)}
+        self.verses_by_testament: Dict[str, array] = {}
+        for book in books:
+            self.verses_by_testament.setdefault(book.testament, array('I')).extend(
+                range(book.verse_start, book.verse_end)
+            )
+
+    def _content_version(self) -> str:
+        """Hash of everything the read endpoints serve; changes only when the corpus does"""
+        digest = hashlib.blake2b(digest_size=12)
+        for book in self.books:
+            digest.update(repr((book.id, book.name, book.testament, book.url, book.total_chapters,
+                                book.biblical_order)).encode('utf-8'))
+        for chapter in self.chapters:
+            digest.update(repr((chapter.id, chapter.book_id, chapter.chapter_number,
+                                chapter.total_verses)).encode('utf-8'))
+        for column in (self.verse_ids, self.verse_numbers, self.verse_chapters, self.text_offsets):
+            digest.update(column.tobytes())
+        digest.update(self.text_blob)
+        return digest.hexdigest()
+
+    @property
+    def verse_count(self) -> int:
+        return len(self.verse_ids)
+
+    def text(self, i: int) -> str:
+        return str(self.text_blob[self.text_offsets[i]:self.text_offsets[i + 1]], 'utf-8')
+
+    def verse_dict(self, i: int) -> Dict:
+        chapter = self.chapters[self.verse_chapters[i]]
+        book = chapter.book
+        return {
+            'id': self.verse_ids[i],
+            'chapter_id': chapter.id,
+            'verse_number': self.verse_numbers[i],
+            'text': self.text(i),
+            'chapter_number': chapter.chapter_number,
+            'book_name': book.name,
+            'testament': book.testament,
+            'book_id': book.id,
+        }
+
+    def verse_domain(self, testament: Optional[str] = None, book_id: Optional[int] = None) -> Sequence[int]:
+        """Dense sequence of verse indexes, optionally restricted to a testament and/or book"""
+        if book_id is not None:
+            book = self.book_by_id.get(book_id)
+            if book is None or (testament is not None and book.testament != testament):
+                return ()
+            return range(book.verse_start, book.verse_end)
+        if testament is not None:
+            return self.verses_by_testament.get(testament, ())
+        return range(self.verse_count)
+
+    def find_verse_index(self, chapter: ChapterRecord, verse_number: int) -> Optional[int]:
+        start, end = chapter.verse_start, chapter.verse_end
+        # Verse numbers are almost always 1..n, so try the direct slot first
+        guess = start + verse_number - 1
+        if start <= guess < end and self.verse_numbers[guess] == verse_number:
+            return guess
+        i = bisect_left(self.verse_numbers, verse_number, start, end)
+        if i < end and self.verse_numbers[i] == verse_number:
+            return i
+        return None
+
+    def verse_range(self, book_id: int, start_chapter: int, start_verse: Optional[int],
+                    end_chapter: int, end_verse: Optional[int]) -> range:
+        """Verse indexes from start_chapter:start_verse through end_chapter:end_verse of a book
+
+        Verses of a book are contiguous and ordered by (chapter, verse), so any span is
+        one index range. A missing start/end verse means the start/end of that chapter.
+        """
+        book = self.book_by_id.get(book_id)
+        if book is None:
+            return range(0)
+        start = end = None
+        for chapter in self.chapters[book.chapter_start:book.chapter_end]:
+            number = chapter.chapter_number
+            if number > end_chapter:
+                break
+            if start is None and number >= start_chapter:
+                start = chapter.verse_start
+                if number == start_chapter and start_verse:
+                    start = bisect_left(self.verse_numbers, start_verse, chapter.verse_start, chapter.verse_end)
+            end = chapter.verse_end
+            if number == end_chapter and end_verse is not None:
+                end = bisect_right(self.verse_numbers, end_verse, chapter.verse_start, chapter.verse_end)
+        if start is None or end is None or end <= start:
+            return range(0)
+        return range(start, end)
+
+    @classmethod
+    def from_rows(cls, book_rows: List[Dict], chapter_rows: List[Dict], verse_rows: List[Dict]) -> 'CorpusData':
+        """Assemble a snapshot from rows ordered by (biblical order), (book, chapter), (chapter, verse)"""
+        chapters_by_book: Dict[int, List[Dict]] = {}
+        for row in chapter_rows:
+            chapters_by_book.setdefault(row['book_id'], []).append(row)
+        verses_by_chapter: Dict[int, List[Dict]] = {}
+        for row in verse_rows:
+            verses_by_chapter.setdefault(row['chapter_id'], []).append(row)
+
+        books, chapters = [], []
+        verse_ids, verse_numbers, verse_chapters = array('i'), array('H'), array('H')
+        text_offsets = array('I', [0])
+        texts = []
+        offset = 0
+
+        for book_row in book_rows:
+            book = BookRecord(book_row['id'], book_row['name'], book_row['testament'], book_row['url'],
+                              book_row['total_chapters'], book_row.get('biblical_order'),
+                              book_row.get('created_at'))
+            book.chapter_start, book.verse_start = len(chapters), len(verse_ids)
+
+            for chapter_row in chapters_by_book.get(book.id, []):
+                chapter = ChapterRecord(chapter_row['id'], book.id, chapter_row['chapter_number'],
+                                        chapter_row.get('total_verses'), chapter_row.get('scraped_at'))
+                chapter.index, chapter.book = len(chapters), book
+                chapter.verse_start = len(verse_ids)
+
+                for verse_row in verses_by_chapter.get(chapter.id, []):
+                    encoded = verse_row['text'].encode('utf-8')
+                    verse_ids.append(verse_row['id'])
+                    verse_numbers.append(verse_row['verse_number'])
+                    verse_chapters.append(chapter.index)
+                    texts.append(encoded)
+                    offset += len(encoded)
+                    text_offsets.append(offset)
+
+                chapter.verse_end = len(verse_ids)
+                chapters.append(chapter)
+
+            book.chapter_end, book.verse_end = len(chapters), len(verse_ids)
+            books.append(book)
+
+        return cls(books, chapters, verse_ids, verse_numbers, verse_chapters,
+                   text_offsets, b''.join(texts))
+
+
+class CorpusStore:
+    """Serves books, chapters and verses from an in-memory snapshot"""
+
+    BOOKS_QUERY = """
+    SELECT id, name, testament, url, total_chapters, created_at, biblical_order
+    FROM books
+    ORDER BY biblical_order NULLS LAST, id
+    """
+    CHAPTERS_QUERY = """
+    SELECT id, book_id, chapter_number, total_verses, scraped_at
+    FROM chapters
+    ORDER BY book_id, chapter_number
+    """
+    VERSES_QUERY = """
+    SELECT id, chapter_id, verse_number, text
+    FROM verses
+    ORDER BY chapter_id, verse_number
+    """
+
+    def __init__(self):
+        self._data: Optional[CorpusData] = None
+        self._listeners: List[Callable[['CorpusStore'], None]] = []
+        self._reload_lock = threading.Lock()
+        self._daily_cache: Dict[tuple, Optional[Dict]] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    @property
+    def data(self) -> Optional[CorpusData]:
+        return self._data
+
+    def add_listener(self, callback: Callable[['CorpusStore'], None]):
+        """Register a callback run after every successful (re)load"""
+        self._listeners.append(callback)
+
+    def load(self, db_manager: DatabaseManager) -> CorpusData:
+        """Load (or reload) the whole corpus from Postgres"""
+        with self._reload_lock:
+            started = time.perf_counter()
+            book_rows = get_catalog().in_order(db_manager.execute_query(self.BOOKS_QUERY, fetch=True))
+            chapter_rows = db_manager.execute_query(self.CHAPTERS_QUERY, fetch=True)
+            verse_rows = db_manager.execute_query(self.VERSES_QUERY, fetch=True)
+
+            data = CorpusData.from_rows(book_rows, chapter_rows, verse_rows)
+            self.swap(data)
+            logger.info(
+                f"📦 Corpus loaded: {len(data.books)} books, {len(data.chapters)} chapters, "
+                f"{data.verse_count} verses, {len(data.text_blob) / 1024:.0f} KiB text "
+                f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+            )
+            return data
+
+    reload = load
+
+    def load_snapshot(self, path: str) -> CorpusData:
+        """Load (or reload) the corpus from a binary snapshot file, without touching Postgres"""
+        from snapshot import load_snapshot
+
+        with self._reload_lock:
+            started = time.perf_counter()
+            data = load_snapshot(path)
+            self.swap(data)
+            logger.info(
+                f"📦 Corpus loaded from snapshot {path}: {len(data.books)} books, {len(data.chapters)} chapters, "
+                f"{data.verse_count} verses in {(time.perf_counter() - started) * 1000:.0f}ms"
+            )
+            return data
+
+    def swap(self, data: CorpusData):
+        """Atomically publish a new snapshot and notify listeners"""
+        self._data = data
+        self._daily_cache = {}
+        for callback in self._listeners:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.error(f"❌ Corpus reload listener {callback!r} failed: {e}")
+
+    # ==================== READS ====================
+
+    def list_books(self) -> List[Dict]:
+        return [book.to_dict() for book in self._data.books]
+
+    def get_book(self, book_id: int) -> Optional[Dict]:
+        book = self._data.book_by_id.get(book_id)
+        return book.to_dict() if book else None
+
+    def get_book_chapters(self, book_id: int) -> Optional[List[Dict]]:
+        data = self._data
+        book = data.book_by_id.get(book_id)
+        if book is None:
+            return None
+        return [chapter.to_dict() for chapter in data.chapters[book.chapter_start:book.chapter_end]]
+
+    def get_chapter(self, chapter_id: int) -> Optional[Dict]:
+        chapter = self._data.chapter_by_id.get(chapter_id)
+        return chapter.to_dict() if chapter else None
+
+    def get_chapter_verses(self, chapter_id: int) -> Optional[List[Dict]]:
+        data = self._data
+        chapter = data.chapter_by_id.get(chapter_id)
+        if chapter is None:
+            return None
+        return [data.verse_dict(i) for i in range(chapter.verse_start, chapter.verse_end)]
+
+    def get_chapter_payload(self, chapter_id: int) -> Optional[Dict]:
+        """Reading payload of a chapter: its header, prev/next chapter ids in biblical order and
+        the verses without the per-row chapter/book context (same shape as chapter_payloads)"""
+        data = self._data
+        chapter = data.chapter_by_id.get(chapter_id)
+        if chapter is None:
+            return None
+        i = chapter.index
+        return {
+            **chapter.to_dict(),
+            'prev_chapter_id': data.chapters[i - 1].id if i > 0 else None,
+            'next_chapter_id': data.chapters[i + 1].id if i + 1 < len(data.chapters) else None,
+            'verses': [
+                {'id': data.verse_ids[v], 'verse_number': data.verse_numbers[v], 'text': data.text(v)}
+                for v in range(chapter.verse_start, chapter.verse_end)
+            ],
+        }
+
+    def get_verse(self, verse_id: int) -> Optional[Dict]:
+        data = self._data
+        i = data.verse_index_by_id.get(verse_id)
+        return data.verse_dict(i) if i is not None else None
+
+    def get_verse_by_reference(self, book_id: int, chapter_number: int, verse_number: int) -> Optional[Dict]:
+        data = self._data
+        chapter = data.chapter_by_ref.get((book_id, chapter_number))
+        if chapter is None:
+            return None
+        i = data.find_verse_index(chapter, verse_number)
+        return data.verse_dict(i) if i is not None else None
+
+    def get_passages(self, passages: Sequence, limit: int) -> Optional[List[List[Dict]]]:
+        """Verses of each parsed passage (see ``references``); None if more than ``limit`` in total"""
+        data = self._data
+        ranges = [[data.verse_range(passage.book_id, *span) for span in passage.spans] for passage in passages]
+        if sum(len(indexes) for spans in ranges for indexes in spans) > limit:
+            return None
+        return [[data.verse_dict(i) for indexes in spans for i in indexes] for spans in ranges]
+
+    def random_verse(self, testament: Optional[str] = None, book_id: Optional[int] = None) -> Optional[Dict]:
+        """Uniformly random verse in O(1), optionally filtered by testament or book"""
+        data = self._data
+        domain = data.verse_domain(testament, book_id)
+        if not domain:
+            return None
+        return data.verse_dict(domain[random.randrange(len(domain))])
+
+    def daily_verse(self, day: date, testament: Optional[str] = None,
+                    book_id: Optional[int] = None) -> Optional[Dict]:
+        """Deterministic verse for ``day``: the same for everyone, computed once per day"""
+        key = (day, testament, book_id)
+        cache = self._daily_cache
+        if key not in cache:
+            if any(cached_day != day for cached_day, _, _ in cache):
+                cache = self._daily_cache = {}
+            data = self._data
+            domain = data.verse_domain(testament, book_id)
+            verse = None
+            if domain:
+                verse = data.verse_dict(domain[daily_position(day, len(domain), testament, book_id)])
+            cache[key] = verse
+        return cache[key]
+
+
+# Hashes the verse text itself: a re-scrape that corrects text changes no count or id
+DATABASE_VERSION_QUERY = """
+SELECT (SELECT COUNT(*) FROM books) AS books,
+       (SELECT COUNT(*) FROM chapters) AS chapters,
+       (SELECT md5(string_agg(id || ':' || chapter_id || ':' || verse_number || ':' || text,
+                              E'\\n' ORDER BY id))
+          FROM verses) AS verses_hash,
+       (SELECT MAX(scraped_at) FROM chapters) AS last_modified
+"""
+
+
+# Cheap change detector, polled while serving from the database: every ingest path upserts
+# chapters, which sets scraped_at, or adds rows
+DATABASE_MARKER_QUERY = """
+SELECT (SELECT COUNT(*) FROM books) AS books,
+       (SELECT COUNT(*) FROM chapters) AS chapters,
+       (SELECT MAX(id) FROM verses) AS max_verse_id,
+       (SELECT MAX(scraped_at) FROM chapters) AS last_modified
+"""
+
+
+def database_marker(db_manager: DatabaseManager) -> tuple:
+    """Values that change whenever the corpus tables are written; see ``database_version``"""
+    row = db_manager.execute_query(DATABASE_MARKER_QUERY, fetch=True)[0]
+    return row['books'], row['chapters'], row['max_verse_id'], row['last_modified']
+
+
+def database_version(db_manager: DatabaseManager):
+    """(version, last_modified) fingerprint of the corpus tables, for when the store is not loaded"""
+    row = db_manager.execute_query(DATABASE_VERSION_QUERY, fetch=True)[0]
+    seed = f"{row['books']}:{row['chapters']}:{row['verses_hash']}:{row['last_modified']}"
+    return hashlib.blake2b(seed.encode('utf-8'), digest_size=12).hexdigest(), row['last_modified']
+
+
+def daily_position(day: date, size: int, *salt) -> int:
+    """Stable position in ``[0, size)`` derived from the date (and any filters)"""
+    seed = ':'.join([day.isoformat(), *(str(part) for part in salt)]).encode('utf-8')
+    return int.from_bytes(hashlib.sha256(seed).digest()[:8], 'big') % size
@@ -0,0 +1,149 @@
+"""
+Corpus statistics served from memory.
+
+Per-book aggregates live in the ``book_stats`` summary table, which ingestion
+refreshes incrementally (``SELECT refresh_book_stats(book_id)``). The API
+loads those 66 rows once, derives testament and corpus totals from them and
+answers /stats and /stats/books/{id} without touching the verses table.
+When the summary table is unavailable the same numbers are computed from the
+in-memory corpus.
+"""
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from corpus import CorpusData
+from models import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+BOOK_STATS_QUERY = """
+SELECT s.book_id, b.name, b.testament, s.total_chapters, s.total_verses,
+       s.total_words, s.total_characters, s.refreshed_at
+FROM book_stats s
+JOIN books b ON b.id = s.book_id
+ORDER BY b.biblical_order NULLS LAST, b.id
+"""
+
+
+def _with_averages(stats: Dict) -> Dict:
+    verses = stats['total_verses']
+    stats['avg_verse_length'] = round(stats['total_characters'] / verses, 2) if verses else 0.0
+    stats['avg_verse_words'] = round(stats['total_words'] / verses, 2) if verses else 0.0
+    return stats
+
+
+def _totals(rows: List[Dict]) -> Dict:
+    return {
+        'total_books': len(rows),
+        'total_chapters': sum(row['total_chapters'] for row in rows),
+        'total_verses': sum(row['total_verses'] for row in rows),
+        'total_words': sum(row['total_words'] for row in rows),
+        'total_characters': sum(row['total_characters'] for row in rows),
+    }
+
+
+class StatsSnapshot:
+    """Precomputed corpus, testament and book aggregates"""
+
+    def __init__(self, book_rows: List[Dict], refreshed_at: Optional[datetime], source: str):
+        self.books: Dict[int, Dict] = {}
+        for row in book_rows:
+            book = _with_averages({
+                'book_id': row['book_id'],
+                'name': row['name'],
+                'testament': row['testament'],
+                'total_chapters': int(row['total_chapters']),
+                'total_verses': int(row['total_verses']),
+                'total_words': int(row['total_words']),
+                'total_characters': int(row['total_characters']),
+            })
+            self.books[book['book_id']] = book
+
+        rows = list(self.books.values())
+        self.testaments = {}
+        for testament in ('old_testament', 'new_testament'):
+            self.testaments[testament] = _with_averages(
+                _totals([row for row in rows if row['testament'] == testament])
+            )
+        self.corpus = _with_averages(_totals(rows))
+        self.refreshed_at = refreshed_at or datetime.now()
+        self.source = source
+
+    @classmethod
+    def from_database(cls, db_manager: DatabaseManager) -> 'StatsSnapshot':
+        rows = db_manager.execute_query(BOOK_STATS_QUERY, fetch=True)
+        refreshed_at = max((row['refreshed_at'] for row in rows if row['refreshed_at']), default=None)
+        return cls(rows, refreshed_at, 'book_stats')
+
+    @classmethod
+    def from_corpus(cls, data: CorpusData) -> 'StatsSnapshot':
+        rows = []
+        for book in data.books:
+            words = characters = 0
+            for i in range(book.verse_start, book.verse_end):
+                text = data.text(i)
+                words += len(text.split())
+                characters += len(text)
+            rows.append({
+                'book_id': book.id,
+                'name': book.name,
+                'testament': book.testament,
+                'total_chapters': book.chapter_end - book.chapter_start,
+                'total_verses': book.verse_end - book.verse_start,
+                'total_words': words,
+                'total_characters': characters,
+            })
+        return cls(rows, data.loaded_at, 'corpus_store')
+
+
+class CorpusStats:
+    """Holds the current StatsSnapshot; reloaded whenever the corpus changes"""
+
+    def __init__(self):
+        self._snapshot: Optional[StatsSnapshot] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    def load(self, db_manager: Optional[DatabaseManager], data: Optional[CorpusData] = None) -> StatsSnapshot:
+        """Load from the book_stats summary, falling back to the in-memory corpus
+
+        With no ``db_manager`` (corpus served from a snapshot) statistics come from ``data`` only.
+        """
+        if db_manager is None:
+            self._snapshot = StatsSnapshot.from_corpus(data)
+            logger.info(f"📊 Statistics computed from corpus: {self._snapshot.corpus['total_verses']} verses")
+            return self._snapshot
+        try:
+            snapshot = StatsSnapshot.from_database(db_manager)
+            if not snapshot.books and data is not None:
+                snapshot = StatsSnapshot.from_corpus(data)
+        except Exception as e:
+            if data is None:
+                raise
+            logger.warning(f"⚠️ book_stats unavailable ({e}), computing statistics from corpus store")
+            snapshot = StatsSnapshot.from_corpus(data)
+        self._snapshot = snapshot
+        logger.info(f"📊 Statistics loaded from {snapshot.source}: {snapshot.corpus['total_verses']} verses")
+        return snapshot
+
+    def summary(self) -> Dict:
+        snapshot = self._snapshot
+        corpus = snapshot.corpus
+        return {
+            'total_books': corpus['total_books'],
+            'total_chapters': corpus['total_chapters'],
+            'total_verses': corpus['total_verses'],
+            'old_testament_books': snapshot.testaments['old_testament']['total_books'],
+            'new_testament_books': snapshot.testaments['new_testament']['total_books'],
+            'avg_verse_length': corpus['avg_verse_length'],
+            'total_words': corpus['total_words'],
+            'avg_verse_words': corpus['avg_verse_words'],
+            'testaments': snapshot.testaments,
+            'refreshed_at': snapshot.refreshed_at.isoformat(),
+        }
+
+    def book(self, book_id: int) -> Optional[Dict]:
+        return self._snapshot.books.get(book_id)
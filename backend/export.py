@@ -0,0 +1,94 @@
+"""
+Streaming corpus export: NDJSON or CSV, optionally gzip-compressed.
+
+Rows are read from Postgres through a server-side cursor
+(``DatabaseManager.stream_query``) in ``EXPORT_CHUNK_SIZE`` chunks and encoded
+one chunk at a time, so a full-corpus export uses the same memory as a
+one-chapter one. Rows are ordered by verse id: a client whose download was
+cut off resumes with ``after_id`` set to the last id it received.
+"""
+import csv
+import io
+import json
+import os
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from models import DatabaseManager
+
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', '2000'))
+EXPORT_COLUMNS = ('id', 'book_id', 'book_name', 'testament', 'chapter_number', 'verse_number', 'text')
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+}
+
+EXPORT_QUERY = """
+SELECT v.id, b.id AS book_id, b.name AS book_name, b.testament,
+       c.chapter_number, v.verse_number, v.text
+FROM verses v
+JOIN chapters c ON v.chapter_id = c.id
+JOIN books b ON c.book_id = b.id
+WHERE v.id > %s{filters}
+ORDER BY v.id
+"""
+
+
+def export_query(book_id: Optional[int] = None, testament: Optional[str] = None, after_id: int = 0):
+    """(query, params) for the verses to export, ordered by verse id"""
+    filters, params = [], [after_id]
+    if book_id is not None:
+        filters.append("b.id = %s")
+        params.append(book_id)
+    if testament is not None:
+        filters.append("b.testament = %s")
+        params.append(testament)
+    return EXPORT_QUERY.format(filters=''.join(f"\nAND {f}" for f in filters)), tuple(params)
+
+
+def encode_ndjson(chunks: Iterable[List[Dict]]) -> Iterator[bytes]:
+    for rows in chunks:
+        yield ''.join(
+            json.dumps({column: row[column] for column in EXPORT_COLUMNS}, ensure_ascii=False) + '\n'
+            for row in rows
+        ).encode('utf-8')
+
+
+def encode_csv(chunks: Iterable[List[Dict]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in chunks:
+        writer.writerows([row[column] for column in EXPORT_COLUMNS] for row in rows)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+
+
+ENCODERS = {'ndjson': encode_ndjson, 'csv': encode_csv}
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a byte stream into one gzip member as it is produced"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_stream(db_manager: DatabaseManager, fmt: str, book_id: Optional[int] = None,
+                  testament: Optional[str] = None, after_id: int = 0, gzip: bool = False,
+                  chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Encoded export body; iterate it in a worker thread (it blocks on the database)"""
+    query, params = export_query(book_id, testament, after_id)
+    body = ENCODERS[fmt](db_manager.stream_query(query, params, chunk_size))
+    return gzip_stream(body) if gzip else body
+
+
+def export_filename(fmt: str, book_code: Optional[str] = None, testament: Optional[str] = None,
+                    gzip: bool = False) -> str:
+    name = f"biblia-{book_code or testament or 'completa'}.{EXPORT_FORMATS[fmt][1]}"
+    return f"{name}.gz" if gzip else name
@@ -0,0 +1,140 @@
+"""
+Typo-tolerant matching with trigram similarity (the pg_trgm measure, in process).
+
+A word's trigrams are the 3-character windows of its sound key padded with two
+spaces in front and one behind ("jo" -> "  j", " jo", "jo "), and the
+similarity of two words is shared trigrams / distinct trigrams of both. The
+sound key is the accent-folded word with letters that Portuguese pronounces
+alike merged (ç/ss/c before e or i -> s, g before e or i -> j, ch -> x...),
+so the commonest misspellings cost nothing: "salvassão" and "salvação" are
+both "salvasao", "Geremias" and "Jeremias" both "jeremias".
+
+``TrigramIndex`` keeps a posting list of entries per trigram, so the closest
+entries to a word are found by counting shared trigrams over a handful of
+lists instead of comparing against every entry. It backs:
+
+- ``/search``, through ``correct_query``: when a query matches nothing, each
+  unknown word is replaced by the closest corpus word (see ``suggest.Suggester``);
+- ``BookResolver``, when a book name matches no alias.
+
+Matches below ``MIN_SIMILARITY`` (env ``FUZZY_MIN_SIMILARITY``) are ignored.
+"""
+import os
+import re
+from array import array
+from collections import Counter
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from textnorm import STOPWORDS, WORD_RE, fold, normalize
+
+MIN_SIMILARITY = float(os.getenv('FUZZY_MIN_SIMILARITY', '0.4'))
+# Response header of a /search answered with a corrected query (URL-encoded)
+CORRECTED_QUERY_HEADER = 'X-Search-Corrected'
+# Response header naming the book(s) a misspelled book name was read as (URL-encoded)
+CORRECTED_BOOK_HEADER = 'X-Book-Corrected'
+
+
+# Applied in order to the folded word, with ç already turned into s
+SOUNDS = [(re.compile(pattern), replacement) for pattern, replacement in (
+    (r"s?c(?=[ei])", 's'),
+    (r"g(?=[ei])", 'j'),
+    (r"ch", 'x'),
+    (r"qu(?=[ei])", 'k'),
+    (r"^h|(?<![ln])h", ''),
+    (r"y", 'i'),
+    (r"w", 'v'),
+    (r"(?<=[aeiou])z(?=[aeiou])", 's'),
+    (r"(\w)\1", r"\1"),
+)]
+
+
+def sound_key(text: str) -> str:
+    """Accent-folded ``text`` with letters that sound alike in Portuguese merged"""
+    key = fold(text.lower().replace('ç', 's'))
+    for pattern, replacement in SOUNDS:
+        key = pattern.sub(replacement, key)
+    return key
+
+
+def trigrams(text: str) -> set:
+    padded = f"  {sound_key(text)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a: str, b: str) -> float:
+    ta, tb = trigrams(a), trigrams(b)
+    return len(ta & tb) / len(ta | tb) if ta or tb else 0.0
+
+
+class TrigramIndex:
+    """(key, weight, value) entries searchable by trigram similarity of their keys"""
+
+    def __init__(self, entries: Iterable[Tuple[str, float, Hashable]]):
+        self.keys: List[str] = []
+        self.weights: List[float] = []
+        self.values: List[Hashable] = []
+        self.sizes = array('H')  # distinct trigrams per entry
+        postings: Dict[str, List[int]] = {}
+        for key, weight, value in entries:
+            entry = len(self.keys)
+            grams = trigrams(key)
+            self.keys.append(key)
+            self.weights.append(weight)
+            self.values.append(value)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(entry)
+        self.postings = {gram: array('I', entries) for gram, entries in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def match(self, text: str, min_similarity: float = MIN_SIMILARITY,
+              limit: int = 1) -> List[Tuple[Hashable, float]]:
+        """Up to ``limit`` (value, similarity) pairs, most similar (then heaviest) first"""
+        grams = trigrams(text)
+        shared = Counter()
+        for gram in grams:
+            entries = self.postings.get(gram)
+            if entries is not None:
+                shared.update(entries)
+
+        # similarity <= shared / len(grams), so weaker candidates are skipped before dividing
+        needed = min_similarity * len(grams)
+        size, sizes = len(grams), self.sizes
+        scored = []
+        for entry, count in shared.items():
+            if count >= needed:
+                score = count / (size + sizes[entry] - count)
+                if score >= min_similarity:
+                    scored.append((score, self.weights[entry], entry))
+        scored.sort(key=lambda item: (-item[0], -item[1], item[2]))
+        return [(self.values[entry], score) for score, _, entry in scored[:limit]]
+
+
+def correct_query(query: str, spelling: Callable[[str], Optional[str]], words: TrigramIndex,
+                  min_similarity: float = MIN_SIMILARITY) -> Optional[str]:
+    """``query`` with every word respelled as it appears in the corpus, or None if nothing changes
+
+    ``spelling`` gives the corpus spelling of a folded word (None if it never
+    occurs). Unknown words are replaced by the most similar corpus word;
+    stopwords and words with no close match are kept.
+    """
+    changed = False
+
+    def respell(match) -> str:
+        nonlocal changed
+        word = match.group()
+        if normalize(word) in STOPWORDS or word.isdigit():
+            return word
+        corrected = spelling(fold(word))
+        if corrected is None:
+            best = words.match(word, min_similarity)
+            corrected = best[0][0] if best else word
+        if corrected.lower() != word.lower():
+            changed = True
+            return corrected
+        return word
+
+    corrected = WORD_RE.sub(respell, query)
+    return corrected if changed else None
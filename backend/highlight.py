@@ -0,0 +1,83 @@
+"""
+Search hit highlighting for /search.
+
+Match positions are (start, end) character offsets into the verse ``text``:
+
+- ``index`` mode reads them from the posting lists, i.e. the exact tokens the
+  index matched, and caches the rendered result with the ranking (see
+  ``SearchIndex.search``);
+- ``fts`` rows are tokenized with the index normalization (``textnorm``), since
+  Postgres does not return match positions;
+- ``like`` rows use the same case-insensitive substring test as the SQL.
+
+``highlight=offsets`` returns them as ``matches``; ``highlight=snippet``
+renders an HTML-escaped excerpt with the matches wrapped in ``<mark>``.
+Offsets count Unicode code points (the same as JavaScript string indexes for
+the Portuguese text of the corpus).
+"""
+from html import escape
+from typing import Dict, List, Tuple
+
+from textnorm import query_terms, tokenize
+
+HIGHLIGHT_MODES = ('offsets', 'snippet')
+HIGHLIGHT_FIELDS = {'offsets': 'matches', 'snippet': 'snippet'}
+SNIPPET_LENGTH = 200
+
+Span = Tuple[int, int]
+
+
+def like_spans(text: str, q: str) -> List[Span]:
+    """Occurrences of ``q`` in ``text``, ignoring case (the LIKE mode's match)"""
+    lowered, needle = text.lower(), q.lower()
+    if not needle or len(lowered) != len(text):
+        return []
+    spans = []
+    start = lowered.find(needle)
+    while start != -1:
+        spans.append((start, start + len(needle)))
+        start = lowered.find(needle, start + len(needle))
+    return spans
+
+
+def token_spans(text: str, query: str) -> List[Span]:
+    """Words of ``text`` whose normalized form is a query term"""
+    terms = set(query_terms(query))
+    return [(start, end) for term, start, end in tokenize(text) if term in terms]
+
+
+def snippet(text: str, spans: List[Span], length: int = SNIPPET_LENGTH) -> str:
+    """HTML excerpt of about ``length`` characters around the first match, matches in <mark>"""
+    start, end = 0, len(text)
+    if end > length:
+        first = spans[0][0] if spans else 0
+        start = text.rfind(' ', 0, max(0, first - length // 4)) + 1
+        if start + length < end:
+            cut = text.rfind(' ', start, start + length)
+            end = cut if cut > start else start + length
+
+    # Verse text rarely contains markup characters: only escape when it does
+    markup = '<' in text or '>' in text or '&' in text
+    parts = ['…'] if start else []
+    position = start
+    for span_start, span_end in spans:
+        if span_start < position or span_end > end:
+            continue
+        parts += (text[position:span_start], '<mark>', text[span_start:span_end], '</mark>')
+        if markup:
+            parts[-4] = escape(parts[-4], quote=False)
+            parts[-2] = escape(parts[-2], quote=False)
+        position = span_end
+    parts.append(escape(text[position:end], quote=False) if markup else text[position:end])
+    if end < len(text):
+        parts.append('…')
+    return ''.join(parts)
+
+
+def render(text: str, spans: List[Span], mode: str):
+    """The value of the mode's field: the spans themselves, or the snippet"""
+    return snippet(text, spans) if mode == 'snippet' else spans
+
+
+def add_highlight(row: Dict, spans: List[Span], mode: str):
+    row[HIGHLIGHT_FIELDS[mode]] = render(row['text'], spans, mode)
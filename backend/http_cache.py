@@ -0,0 +1,132 @@
+"""
+HTTP conditional caching for the corpus read endpoints.
+
+The corpus only changes when it is re-scraped, so every read response is a
+pure function of (corpus version, URL). The version comes from the loaded
+corpus store, or from the corpus tables, re-checked every
+``DATABASE_VERSION_TTL`` seconds (see ``api.corpus_version``). This ASGI
+middleware:
+
+- adds a strong ``ETag`` derived from the corpus version (plus an optional
+  per-rule variant such as today's date), ``Last-Modified`` and
+  ``Cache-Control`` to successful GET responses;
+- answers ``If-None-Match`` / ``If-Modified-Since`` revalidations with
+  ``304 Not Modified`` *before* the endpoint runs, so repeat requests cost no
+  database or serialization work;
+- marks non-deterministic endpoints (e.g. /verses/random) ``no-store``.
+
+Paths that match no rule pass through untouched.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Dict, NamedTuple, Optional, Sequence, Tuple, Union
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+
+# (corpus version, last modified) or None while no version is known
+Validator = Callable[[], Optional[Tuple[str, Optional[datetime]]]]
+
+
+class CacheRule(NamedTuple):
+    prefix: str
+    max_age: Union[int, Callable[[], int], None]  # None -> no-store
+    variant: Optional[Callable[[], str]] = None    # extra ETag input, e.g. the current date
+
+
+class ConditionalCacheMiddleware:
+    def __init__(self, app, validator: Validator, rules: Sequence[CacheRule], salt: str = ''):
+        self.app = app
+        self.validator = validator
+        self.rules = list(rules)
+        self.salt = salt
+        self._etags: Dict[tuple, str] = {}
+
+    def _match(self, path: str) -> Optional[CacheRule]:
+        for rule in self.rules:
+            if path.startswith(rule.prefix):
+                return rule
+        return None
+
+    def _etag(self, version: str, variant: str) -> str:
+        key = (version, variant)
+        etag = self._etags.get(key)
+        if etag is None:
+            if len(self._etags) > 64:
+                self._etags.clear()
+            seed = f"{version}|{self.salt}|{variant}".encode('utf-8')
+            etag = self._etags[key] = '"' + hashlib.blake2b(seed, digest_size=12).hexdigest() + '"'
+        return etag
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] != 'GET':
+            await self.app(scope, receive, send)
+            return
+
+        rule = self._match(scope['path'])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        if rule.max_age is None:
+            await self.app(scope, receive, _with_headers(send, {'Cache-Control': 'no-store'}))
+            return
+
+        current = self.validator()
+        if current is None:
+            await self.app(scope, receive, send)
+            return
+
+        version, last_modified = current
+        variant = rule.variant() if rule.variant else ''
+        max_age = rule.max_age() if callable(rule.max_age) else rule.max_age
+        headers = {
+            'ETag': self._etag(version, variant),
+            'Cache-Control': f'public, max-age={max_age}',
+        }
+        # A date-dependent variant changes without the corpus changing, so only the ETag validates it
+        if last_modified is not None and not variant:
+            headers['Last-Modified'] = _http_date(last_modified)
+
+        if _not_modified(Headers(scope=scope), headers):
+            await Response(status_code=304, headers=headers)(scope, receive, send)
+            return
+
+        await self.app(scope, receive, _with_headers(send, headers))
+
+
+def _with_headers(send, headers: Dict[str, str]):
+    """Wrap ``send`` so successful responses carry ``headers``"""
+    async def send_with_headers(message):
+        if message['type'] == 'http.response.start' and message['status'] == 200:
+            response_headers = MutableHeaders(scope=message)
+            for name, value in headers.items():
+                response_headers[name] = value
+        await send(message)
+    return send_with_headers
+
+
+def _not_modified(request_headers: Headers, headers: Dict[str, str]) -> bool:
+    """RFC 9110 evaluation: If-None-Match wins; If-Modified-Since only when it is absent"""
+    if_none_match = request_headers.get('if-none-match')
+    if if_none_match is not None:
+        # "*" is not special-cased: the middleware runs before the route knows whether the resource exists
+        etag = headers['ETag']
+        # Weak comparison, as required for If-None-Match
+        return any(tag.strip().removeprefix('W/') == etag for tag in if_none_match.split(','))
+
+    if_modified_since = request_headers.get('if-modified-since')
+    last_modified = headers.get('Last-Modified')
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
@@ -1,13 +1,179 @@
 import psycopg2
+import psycopg2.extensions
 from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
 import os
+import threading
+import time
 from dotenv import load_dotenv
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
 import logging
 
 load_dotenv()
 
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available in time"""
+
+class ConnectionPool:
+    """Bounded, thread-safe psycopg2 connection pool.
+
+    Connections are opened lazily up to ``max_size``, health-checked on
+    checkout and recycled once they are older than ``max_lifetime`` seconds.
+    """
+
+    def __init__(self, connection_params: Dict, min_size: int = 1, max_size: int = 10,
+                 timeout: float = 10.0, max_lifetime: float = 1800.0, check_idle_after: float = 30.0):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.connection_params = connection_params
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.check_idle_after = check_idle_after
+        self.logger = logging.getLogger(__name__)
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle = []        # [(conn, created_at, last_used_at)], LIFO
+        self._created_at = {}  # id(conn) -> creation timestamp
+        self._size = 0         # open connections (idle + in use)
+        self._closed = False
+        self._stats = {
+            'connections_created': 0,
+            'connections_recycled': 0,
+            'connections_discarded': 0,
+            'checkouts': 0,
+            'checkout_waits': 0,
+            'checkout_timeouts': 0,
+        }
+
+    def _connect(self):
+        conn = psycopg2.connect(**self.connection_params)
+        with self._cond:
+            self._created_at[id(conn)] = time.monotonic()
+            self._stats['connections_created'] += 1
+        return conn
+
+    def _discard(self, conn, reason: str):
+        self._created_at.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+        self._stats[reason] += 1
+
+    def _is_healthy(self, conn, last_used_at: float) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used_at < self.check_idle_after:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def getconn(self):
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolTimeoutError("Connection pool is closed")
+                if self._idle:
+                    conn, created_at, last_used_at = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    conn = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['checkout_timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f"No database connection available after {self.timeout}s (max_size={self.max_size})"
+                    )
+                self._stats['checkout_waits'] += 1
+                self._cond.wait(remaining)
+            self._stats['checkouts'] += 1
+
+        # Connect / health-check outside the lock so slow I/O never blocks other threads
+        try:
+            if conn is not None:
+                expired = time.monotonic() - created_at > self.max_lifetime
+                if expired or not self._is_healthy(conn, last_used_at):
+                    with self._cond:
+                        self._discard(conn, 'connections_recycled' if expired else 'connections_discarded')
+                    conn = None
+            if conn is None:
+                conn = self._connect()
+            return conn
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def putconn(self, conn, discard: bool = False):
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            if discard or conn.closed or self._closed or self._size > self.max_size:
+                self._discard(conn, 'connections_discarded')
+                self._size -= 1
+            else:
+                created_at = self._created_at.get(id(conn), time.monotonic())
+                self._idle.append((conn, created_at, time.monotonic()))
+            self._cond.notify()
+
+    def resize(self, max_size: int):
+        """Change ``max_size``; connections over the new limit are closed as they are returned"""
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        with self._cond:
+            self.max_size = max_size
+            self.min_size = min(self.min_size, max_size)
+            self._cond.notify_all()
+
+    def prefill(self):
+        """Open ``min_size`` connections up front (e.g. at application startup)"""
+        conns = []
+        try:
+            while len(conns) < self.min_size:
+                with self._cond:
+                    if self._size >= self.min_size:
+                        break
+                conns.append(self.getconn())
+        finally:
+            for conn in conns:
+                self.putconn(conn)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                **self._stats,
+            }
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _, _ = self._idle.pop()
+                self._discard(conn, 'connections_discarded')
+                self._size -= 1
+            self._cond.notify_all()
+
 class DatabaseManager:
     def __init__(self):
         self.connection_params = {
@@ -18,21 +184,41 @@ class DatabaseManager:
             'password': os.getenv('DB_PASSWORD')
         }
         self.logger = logging.getLogger(__name__)
+        self.pool = ConnectionPool(
+            self.connection_params,
+            min_size=int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+            max_size=int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            timeout=float(os.getenv('DB_POOL_TIMEOUT', '10')),
+            max_lifetime=float(os.getenv('DB_POOL_MAX_LIFETIME', '1800')),
+            check_idle_after=float(os.getenv('DB_POOL_CHECK_IDLE_AFTER', '30'))
+        )
 
     @contextmanager
     def get_connection(self):
         conn = None
+        discard = False
         try:
-            conn = psycopg2.connect(**self.connection_params)
+            conn = self.pool.getconn()
             yield conn
         except Exception as e:
             if conn:
-                conn.rollback()
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    discard = True
+            if isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError)):
+                discard = True
             self.logger.error(f"Database connection error: {e}")
             raise
         finally:
             if conn:
-                conn.close()
+                self.pool.putconn(conn, discard=discard)
+
+    def pool_stats(self) -> Dict:
+        return self.pool.stats()
+
+    def close(self):
+        self.pool.close()
 
     def execute_query(self, query: str, params: tuple = None, fetch: bool = False):
         with self.get_connection() as conn:
@@ -43,20 +229,39 @@ class DatabaseManager:
                 conn.commit()
                 return cursor.rowcount
 
+    def stream_query(self, query: str, params: tuple = None, chunk_size: int = 2000) -> Iterator[List[Dict]]:
+        """Yield result rows in chunks from a server-side (named) cursor
+
+        Only ``chunk_size`` rows are held client-side at a time, so memory stays flat
+        however large the result is. The connection is checked out until the
+        generator is exhausted or closed.
+        """
+        with self.get_connection() as conn:
+            with conn.cursor(name='stream_query', cursor_factory=RealDictCursor) as cursor:
+                cursor.itersize = chunk_size
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield rows
+            conn.rollback()
+
 class Book:
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
 
-    def insert(self, name: str, testament: str, url: str, total_chapters: int) -> int:
+    def insert(self, name: str, testament: str, url: str, total_chapters: int,
+               biblical_order: Optional[int] = None) -> int:
         query = """
-        INSERT INTO books (name, testament, url, total_chapters)
-        VALUES (%s, %s, %s, %s)
+        INSERT INTO books (name, testament, url, total_chapters, biblical_order)
+        VALUES (%s, %s, %s, %s, %s)
         ON CONFLICT DO NOTHING
         RETURNING id
         """
         with self.db.get_connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute(query, (name, testament, url, total_chapters))
+                cursor.execute(query, (name, testament, url, total_chapters, biblical_order))
                 result = cursor.fetchone()
                 conn.commit()
                 if result:
@@ -75,23 +280,43 @@ class Book:
         result = self.db.execute_query(query, (book_id,), fetch=True)
         return result[0] if result else None
 
+    def refresh_stats(self, book_id: int = None) -> int:
+        """Recompute the book_stats summary for one book (or all books when None)"""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT refresh_book_stats(%s)", (book_id,))
+                refreshed = cursor.fetchone()[0]
+                conn.commit()
+                return refreshed
+
+    def refresh_chapter_payloads(self, book_id: int = None) -> int:
+        """Re-render the chapter_payloads of one book and its neighbours (or every chapter when None)"""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT refresh_chapter_payloads(%s)", (book_id,))
+                refreshed = cursor.fetchone()[0]
+                conn.commit()
+                return refreshed
+
 class Chapter:
+    UPSERT_QUERY = """
+    INSERT INTO chapters (book_id, chapter_number, total_verses)
+    VALUES (%s, %s, %s)
+    ON CONFLICT (book_id, chapter_number)
+    DO UPDATE SET
+        total_verses = EXCLUDED.total_verses,
+        scraped_at = CURRENT_TIMESTAMP,
+        updated_at = CURRENT_TIMESTAMP
+    RETURNING id
+    """
+
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
 
     def insert(self, book_id: int, chapter_number: int, total_verses: int = None) -> int:
-        query = """
-        INSERT INTO chapters (book_id, chapter_number, total_verses)
-        VALUES (%s, %s, %s)
-        ON CONFLICT (book_id, chapter_number)
-        DO UPDATE SET
-            total_verses = EXCLUDED.total_verses,
-            updated_at = CURRENT_TIMESTAMP
-        RETURNING id
-        """
         with self.db.get_connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute(query, (book_id, chapter_number, total_verses))
+                cursor.execute(self.UPSERT_QUERY, (book_id, chapter_number, total_verses))
                 result = cursor.fetchone()
                 conn.commit()
                 return result[0]
@@ -102,21 +327,22 @@ class Chapter:
         return result[0] if result else None
 
 class Verse:
+    UPSERT_QUERY = """
+    INSERT INTO verses (chapter_id, verse_number, text)
+    VALUES (%s, %s, %s)
+    ON CONFLICT (chapter_id, verse_number)
+    DO UPDATE SET
+        text = EXCLUDED.text,
+        updated_at = CURRENT_TIMESTAMP
+    """
+
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
 
     def insert_batch(self, verses_data: List[Tuple[int, int, str]]) -> int:
-        query = """
-        INSERT INTO verses (chapter_id, verse_number, text)
-        VALUES (%s, %s, %s)
-        ON CONFLICT (chapter_id, verse_number)
-        DO UPDATE SET
-            text = EXCLUDED.text,
-            updated_at = CURRENT_TIMESTAMP
-        """
         with self.db.get_connection() as conn:
             with conn.cursor() as cursor:
-                cursor.executemany(query, verses_data)
+                cursor.executemany(self.UPSERT_QUERY, verses_data)
                 conn.commit()
                 return cursor.rowcount
 
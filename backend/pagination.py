@@ -0,0 +1,88 @@
+"""
+Keyset pagination helpers.
+
+A page is "the next ``limit`` rows whose sort key is greater than the last
+row's", so every page costs the same as the first instead of scanning the
+rows skipped by an OFFSET. Clients never see the key itself: it is wrapped
+in an opaque cursor, which is only valid for the query that produced it (the
+``scope``) and is returned in the ``X-Next-Cursor`` header. The body of a
+listing stays a plain array.
+
+Totals (``X-Total-Count``) are counted once per query and corpus version and
+kept in a small LRU (``CountCache``).
+"""
+import base64
+import binascii
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Sequence, Tuple
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+TOTAL_COUNT_HEADER = 'X-Total-Count'
+COUNT_CACHE_SIZE = 2048
+
+
+class InvalidCursorError(ValueError):
+    """Raised for cursors that are malformed or belong to another query"""
+
+
+def cursor_scope(*parts) -> str:
+    """Fingerprint of the query a cursor belongs to (endpoint, filters, search terms...)"""
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=6).hexdigest()
+
+
+def encode_cursor(key: Sequence, scope: str) -> str:
+    payload = json.dumps([scope, *key], separators=(',', ':'), ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, scope: str, size: int) -> Tuple:
+    """The sort key in ``cursor``; it must come from the same query and have ``size`` parts"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise InvalidCursorError("Cursor inválido")
+    if not isinstance(payload, list) or len(payload) != size + 1 or payload[0] != scope:
+        raise InvalidCursorError("Cursor inválido para esta consulta")
+    key = payload[1:]
+    if not all(isinstance(part, (int, float)) and not isinstance(part, bool) for part in key):
+        raise InvalidCursorError("Cursor inválido")
+    return tuple(key)
+
+
+def page_headers(total: Optional[int], next_key: Optional[Sequence], scope: str) -> Dict[str, str]:
+    headers = {}
+    if total is not None:
+        headers[TOTAL_COUNT_HEADER] = str(total)
+    if next_key is not None:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(next_key, scope)
+    return headers
+
+
+class CountCache:
+    """LRU of query totals; keys should include the corpus version"""
+
+    def __init__(self, size: int = COUNT_CACHE_SIZE):
+        self.size = size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[int]:
+        with self._lock:
+            total = self._entries.get(key)
+            if total is not None:
+                self._entries.move_to_end(key)
+            return total
+
+    def put(self, key: Hashable, total: int):
+        with self._lock:
+            self._entries[key] = total
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
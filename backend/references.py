@@ -0,0 +1,156 @@
+"""
+Bible reference parsing: "Sl 23; Rm 8:28-39; Jo 3:16,18".
+
+Grammar (Brazilian conventions, ``:`` or ``.`` between chapter and verse):
+
+- ``;`` separates references; a reference without a book name ("Jo 3:16; 4:1")
+  continues the previous book;
+- ``,`` separates parts of one reference: after a verse has been given, bare
+  numbers are verses of the current chapter ("Jo 3:16,18"), otherwise chapters
+  ("Sl 23, 25");
+- ranges use ``-`` and may cross chapters ("Jo 3:16-4:2"); a chapter without
+  verses means the whole chapter ("Sl 23", "Gn 1-3");
+- in single-chapter books a bare number is a verse ("Judas 3", "Fm 4-6");
+- chapters and verses start at 1.
+
+Spans are served in the order they were asked for ("Jo 3:18,16" is verse 18,
+then 16), by both the store and the SQL path.
+
+Parsing yields ``Passage`` objects (book + chapter/verse spans). They are served
+from the corpus store as contiguous verse ranges, or from Postgres with one
+set-based query for all passages (``passage_query``).
+"""
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+from book_resolver import BookResolver, not_found_message
+
+MAX_REFERENCES = 50
+LAST_VERSE = 32767  # open end of a chapter in SQL comparisons
+
+BOOK_RE = re.compile(r"^(?P<book>.*?[^\W\d_].*?)\s*(?P<rest>\d.*)?$", re.UNICODE)
+PART_RE = re.compile(r"^(\d+)(?:\s*[:.]\s*(\d+))?(?:\s*[-–—]\s*(\d+)(?:\s*[:.]\s*(\d+))?)?$")
+
+
+class InvalidReferenceError(ValueError):
+    """Raised for references that cannot be parsed or name an unknown book"""
+
+
+class UnknownBookError(InvalidReferenceError):
+    """Raised for a book name that resolves to no book (``candidates``: the closest names)"""
+
+    def __init__(self, name: str, candidates: Tuple[str, ...] = ()):
+        super().__init__(not_found_message(name, candidates))
+        self.candidates = candidates
+
+
+class Span(NamedTuple):
+    start_chapter: int
+    start_verse: Optional[int]  # None -> from the first verse of start_chapter
+    end_chapter: int
+    end_verse: Optional[int]    # None -> through the last verse of end_chapter
+
+
+class Passage(NamedTuple):
+    reference: str
+    book_id: int
+    spans: Tuple[Span, ...]
+    corrected: bool = False  # the book name was a misspelling (see BookResolver.match)
+
+
+def _parse_parts(text: str, reference: str, single_chapter: bool) -> List[Span]:
+    spans = []
+    chapter = 1 if single_chapter else None  # current chapter once a verse has been given
+    for part in text.split(','):
+        match = PART_RE.match(part.strip())
+        if not match:
+            raise InvalidReferenceError(f"Referência inválida: '{reference}'")
+        a, b, c, d = (int(group) if group else None for group in match.groups())
+        if 0 in (a, b, c, d):
+            raise InvalidReferenceError(f"Capítulos e versículos começam em 1: '{reference}'")
+
+        if b is not None:                       # a:b, a:b-c, a:b-c:d
+            start = (a, b)
+            end = (c, d) if d is not None else (a, c if c is not None else b)
+        elif chapter is not None:               # verses of the current chapter
+            start = (chapter, a)
+            end = (c, d) if d is not None else (chapter, c if c is not None else a)
+        else:                                   # whole chapters
+            spans.append(Span(a, None, c if c is not None else a, d))
+            continue
+
+        if end < start:
+            raise InvalidReferenceError(f"Intervalo invertido em '{reference}'")
+        spans.append(Span(start[0], start[1], end[0], end[1]))
+        chapter = end[0]
+
+    for span in spans:
+        if span.end_chapter < span.start_chapter:
+            raise InvalidReferenceError(f"Intervalo invertido em '{reference}'")
+    return spans
+
+
+def parse_references(text: str, resolver: BookResolver) -> List[Passage]:
+    """Parse a ``;``-separated list of references into passages"""
+    passages = []
+    book_id, corrected = None, False
+    for reference in (piece.strip() for piece in text.split(';')):
+        if not reference:
+            continue
+        if len(passages) >= MAX_REFERENCES:
+            raise InvalidReferenceError(f"Máximo de {MAX_REFERENCES} referências por consulta")
+
+        match = BOOK_RE.match(reference)
+        if match:
+            # "1 Jo 3" is split as "1 Jo" + "3": the book part is everything up to the last number run
+            book_text, rest = match.group('book'), match.group('rest')
+            book_match = resolver.match(book_text)
+            book_id, corrected = book_match.book_id, book_match.corrected
+            if book_id is None:
+                raise UnknownBookError(book_text, book_match.candidates)
+        else:
+            rest = reference
+            if book_id is None:
+                raise InvalidReferenceError(f"Referência sem livro: '{reference}'")
+
+        book = resolver.book_by_id.get(book_id, {})
+        single_chapter = book.get('total_chapters') == 1
+        if not rest:
+            if not single_chapter:
+                raise InvalidReferenceError(f"Informe o capítulo em '{reference}'")
+            spans = [Span(1, None, 1, None)]
+        else:
+            spans = _parse_parts(rest, reference, single_chapter)
+        passages.append(Passage(reference, book_id, tuple(spans), corrected))
+    if not passages:
+        raise InvalidReferenceError("Nenhuma referência informada")
+    return passages
+
+
+def passage_query(passages: List[Passage], limit: int) -> Tuple[str, tuple]:
+    """One query for every span of every passage; rows carry the passage position
+
+    Rows come in request order: by passage, then by span as written, then by verse.
+    """
+    rows, params = [], []
+    for position, passage in enumerate(passages):
+        for ordinal, span in enumerate(passage.spans):
+            rows.append("(%s::int, %s::int, %s::int, %s::int, %s::int, %s::int, %s::int)")
+            params.extend((position, ordinal, passage.book_id, span.start_chapter, span.start_verse or 0,
+                           span.end_chapter, span.end_verse or LAST_VERSE))
+    query = f"""
+    SELECT r.position, v.id, v.chapter_id, v.verse_number, v.text,
+           c.chapter_number, b.name as book_name, b.testament, b.id as book_id
+    FROM (VALUES {', '.join(rows)})
+         AS r(position, span, book_id, start_chapter, start_verse, end_chapter, end_verse)
+    JOIN chapters c ON c.book_id = r.book_id
+                   AND c.chapter_number BETWEEN r.start_chapter AND r.end_chapter
+    JOIN verses v ON v.chapter_id = c.id
+                 AND (c.chapter_number, v.verse_number) >= (r.start_chapter, r.start_verse)
+                 AND (c.chapter_number, v.verse_number) <= (r.end_chapter, r.end_verse)
+    JOIN books b ON b.id = c.book_id
+    ORDER BY r.position, r.span, c.chapter_number, v.verse_number
+    LIMIT %s
+    """
+    params.append(limit)
+    return query, tuple(params)
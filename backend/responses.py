@@ -0,0 +1,96 @@
+"""
+Fast JSON responses for the read endpoints.
+
+FastAPI's default path validates every returned dict against ``response_model``,
+walks it again with ``jsonable_encoder`` and then encodes it with the stdlib
+``json``. The read endpoints return plain rows whose shape is fixed by their
+SQL / ``CorpusData.verse_dict``, so they hand FastAPI a ready ``Response``
+instead and skip both passes:
+
+- ``FastJSONResponse`` encodes with orjson (stdlib ``json`` if it is not installed);
+- ``EncodedCache`` keeps the encoded bytes of payloads that only change with
+  the corpus (book list, chapter reading payloads) and is cleared on every
+  corpus reload; hits are returned as ``EncodedResponse`` without any encoding.
+
+The ``response_model`` declarations in ``schemas.py`` still document the shapes in OpenAPI.
+"""
+import json
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from starlette.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON for API payloads (rows may carry Decimal and datetime values)"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, ensure_ascii=False, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class EncodedResponse(Response):
+    """A JSON body that is already encoded"""
+    media_type = "application/json"
+
+
+class EncodedCache:
+    """Encoded JSON payloads keyed by endpoint and arguments, valid for one corpus version"""
+
+    def __init__(self):
+        self._entries: Dict[Hashable, bytes] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Optional[bytes]:
+        """Cached bytes for ``key``, encoding ``build()`` on a miss; None (not cached) when it returns None"""
+        body = self._entries.get(key)
+        if body is not None:
+            self.hits += 1
+            return body
+        content = build()
+        if content is None:
+            return None
+        body = dumps(content)
+        with self._lock:
+            self._entries[key] = body
+            self.misses += 1
+        return body
+
+    def warm(self, items: Iterable[Tuple[Hashable, Any]]):
+        """Encode ``(key, content)`` pairs ahead of the first request"""
+        entries = {key: dumps(content) for key, content in items if content is not None}
+        with self._lock:
+            self._entries.update(entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+
+    def stats(self) -> Dict:
+        return {
+            'entries': len(self._entries),
+            'bytes': sum(len(body) for body in self._entries.values()),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
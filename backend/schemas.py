@@ -0,0 +1,75 @@
+"""
+Response schemas of the read endpoints.
+
+Only the fields clients use: no ``created_at`` / ``updated_at`` / ``scraped_at``
+bookkeeping columns. The endpoints return pre-encoded responses (see
+``responses.py``), so these models document the payloads in OpenAPI rather
+than validating them per request.
+"""
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class BookOut(BaseModel):
+    id: int
+    name: str
+    testament: str
+    url: str
+    total_chapters: int
+    biblical_order: Optional[int] = None
+
+
+class ChapterOut(BaseModel):
+    id: int
+    book_id: int
+    chapter_number: int
+    total_verses: Optional[int] = None
+    book_name: str
+    testament: str
+
+
+class ChapterVerseOut(BaseModel):
+    id: int
+    verse_number: int
+    text: str
+
+
+class ChapterPayloadOut(ChapterOut):
+    prev_chapter_id: Optional[int] = None
+    next_chapter_id: Optional[int] = None
+    verses: List[ChapterVerseOut]
+
+
+class VerseOut(BaseModel):
+    id: int
+    chapter_id: int
+    verse_number: int
+    text: str
+    chapter_number: int
+    book_name: str
+    testament: str
+    book_id: int
+
+
+class DailyVerseOut(VerseOut):
+    date: str
+
+
+class SearchResultOut(VerseOut):
+    relevance_score: float
+    matches: Optional[List[List[int]]] = None  # highlight=offsets: [start, end] in text
+    snippet: Optional[str] = None              # highlight=snippet: HTML with <mark> around matches
+
+
+class PassageOut(BaseModel):
+    reference: str
+    book_id: int
+    book_name: str
+    verses: List[VerseOut]
+
+
+class PassageResultOut(BaseModel):
+    reference: str
+    passages: List[PassageOut]
+    total_verses: int
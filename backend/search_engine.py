@@ -0,0 +1,357 @@
+"""
+Embedded full-text search over the in-memory corpus.
+
+Built from ``CorpusData`` at startup (and on every corpus reload):
+
+- terms are accent-folded and lightly stemmed (see ``textnorm``);
+- each term owns a compact posting list: parallel ``array`` columns of verse
+  indexes and precomputed BM25 impacts, sorted by impact (highest first);
+- single-term queries read the top-k straight off the head of the list;
+  multi-term queries score the verses containing every term first and only
+  rank the full union when that cannot decide the top-k. Results can be
+  restricted to one testament or book, and recent queries are cached;
+- results are totally ordered by (score desc, verse index), so the next page
+  is simply the top-k *after* the last hit's key: deep pages cost the same
+  as the first;
+- posting lists also keep where each term occurs in each verse (character
+  offsets from ``tokenize``), so hits are highlighted from the positions the
+  index matched rather than by re-scanning their text.
+
+Precomputing the BM25 contribution of every (term, verse) pair at build time
+turns query-time scoring into additions only, which keeps typical queries
+well under a millisecond without touching Postgres.
+"""
+import heapq
+import logging
+import math
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+from corpus import CorpusData
+from highlight import HIGHLIGHT_FIELDS, snippet
+from textnorm import STOPWORDS, query_terms, tokenize
+
+logger = logging.getLogger(__name__)
+
+TESTAMENTS = ('old_testament', 'new_testament')
+RESULT_CACHE_SIZE = 1024
+
+
+class TermOccurrences:
+    """Build-time record of where one term occurs, in verse order:
+    ``docs[j]``'s spans are ``starts``/``ends[offsets[j]:offsets[j + 1]]``"""
+    __slots__ = ('docs', 'offsets', 'starts', 'ends')
+
+    def __init__(self):
+        self.docs = array('I')
+        self.offsets = array('I', [0])
+        self.starts = array('H')  # character offsets in the verse text
+        self.ends = array('H')
+
+    def add(self, doc: int, spans: List[int]):
+        """Append verse ``doc``'s occurrences, given flat as [start, end, start, end, ...]"""
+        self.docs.append(doc)
+        self.starts.extend(spans[0::2])
+        self.ends.extend(spans[1::2])
+        self.offsets.append(len(self.starts))
+
+    def term_frequencies(self):
+        offsets = self.offsets
+        return (offsets[j + 1] - offsets[j] for j in range(len(self.docs)))
+
+
+class PostingList:
+    __slots__ = ('docs', 'impacts', 'span_offsets', 'span_starts', 'span_ends')
+
+    def __init__(self, scored: List[Tuple[float, int, int]], occurrences: TermOccurrences):
+        """``scored`` holds (impact, verse index, position in ``occurrences``)"""
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        self.docs = array('I', [doc for _, doc, _ in scored])        # verse indexes, impact desc
+        self.impacts = array('f', [impact for impact, _, _ in scored])  # BM25 contribution per verse
+
+        # Occurrences in the same order, for highlighting: the i-th verse's (start, end)
+        # offsets are span_starts/span_ends[span_offsets[i]:span_offsets[i + 1]]
+        offsets = occurrences.offsets
+        order = [k for _, _, j in scored for k in range(offsets[j], offsets[j + 1])]
+        self.span_offsets = array('I', accumulate((offsets[j + 1] - offsets[j] for _, _, j in scored), initial=0))
+        self.span_starts = array('H', [occurrences.starts[k] for k in order])
+        self.span_ends = array('H', [occurrences.ends[k] for k in order])
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    @property
+    def max_impact(self) -> float:
+        return self.impacts[0]
+
+    def __getitem__(self, i: int) -> Tuple[float, int]:
+        """Rank key of the i-th entry, for bisecting to a page start"""
+        return (-self.impacts[i], self.docs[i])
+
+    def spans(self, i: int) -> List[Tuple[int, int]]:
+        """(start, end) character offsets of the term in the i-th entry's verse"""
+        a, b = self.span_offsets[i], self.span_offsets[i + 1]
+        if b - a == 1:
+            return [(self.span_starts[a], self.span_ends[a])]
+        return list(zip(self.span_starts[a:b], self.span_ends[a:b]))
+
+
+class SearchIndex:
+    """Immutable inverted index over one corpus snapshot"""
+
+    def __init__(self, data: CorpusData, k1: float = 1.2, b: float = 0.75):
+        self.data = data
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, PostingList] = {}
+        self.doc_lengths = array('H')
+        self.testament_of = bytearray()  # verse index -> position in TESTAMENTS
+        self._cache: OrderedDict = OrderedDict()
+        self._build()
+
+    def _build(self):
+        data = self.data
+        raw: Dict[str, TermOccurrences] = {}
+
+        for book in data.books:
+            flag = TESTAMENTS.index(book.testament) if book.testament in TESTAMENTS else 255
+            self.testament_of.extend([flag] * (book.verse_end - book.verse_start))
+
+        for i in range(data.verse_count):
+            spans: Dict[str, List[int]] = {}
+            length = 0
+            for term, start, end in tokenize(data.text(i)):
+                length += 1
+                if term not in STOPWORDS:
+                    spans.setdefault(term, []).extend((start, end))
+            self.doc_lengths.append(min(length, 0xFFFF))
+            for term, term_spans in spans.items():
+                occurrences = raw.get(term)
+                if occurrences is None:
+                    occurrences = raw[term] = TermOccurrences()
+                occurrences.add(i, term_spans)
+
+        n = max(data.verse_count, 1)
+        avgdl = (sum(self.doc_lengths) / n) or 1.0
+        k1, b = self.k1, self.b
+        lengths = self.doc_lengths
+
+        for term, occurrences in raw.items():
+            df = len(occurrences.docs)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            self.postings[term] = PostingList([
+                (idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[doc] / avgdl)), doc, j)
+                for j, (doc, tf) in enumerate(zip(occurrences.docs, occurrences.term_frequencies()))
+            ], occurrences)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self.postings)
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def _doc_filter(self, testament: Optional[str], book_id: Optional[int]):
+        """Return a predicate on verse index, or None when unfiltered"""
+        if book_id is not None:
+            book = self.data.book_by_id.get(book_id)
+            if book is None:
+                return lambda doc: False
+            start, end = book.verse_start, book.verse_end
+            if testament is not None and book.testament != testament:
+                return lambda doc: False
+            return lambda doc: start <= doc < end
+        if testament is not None:
+            flag = TESTAMENTS.index(testament) if testament in TESTAMENTS else -1
+            testament_of = self.testament_of
+            return lambda doc: testament_of[doc] == flag
+        return None
+
+    def _cached(self, key, compute):
+        value = self._cache.get(key)
+        if value is None:
+            value = compute()
+            self._cache[key] = value
+            if len(self._cache) > RESULT_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return value
+
+    def search(self, query: str, limit: int = 50, testament: Optional[str] = None,
+               book_id: Optional[int] = None, after: Optional[Tuple[float, int]] = None,
+               highlight: Optional[str] = None) -> List[Tuple]:
+        """Top ``limit`` (verse index, score) pairs, best first, ties in biblical order
+
+        ``after`` is the (score, verse index) of the last hit of the previous page.
+        With ``highlight`` ('offsets' or 'snippet') every hit also carries its rendered
+        matches: (verse index, score, matches), cached along with the ranking.
+        """
+        terms = tuple(term for term in query_terms(query) if term in self.postings)
+        if not terms:
+            return []
+        return self._cached((terms, limit, testament, book_id, after, highlight),
+                            lambda: self._search(terms, limit, testament, book_id, after, highlight))
+
+    def count(self, query: str, testament: Optional[str] = None, book_id: Optional[int] = None) -> int:
+        """Number of verses matching any query term (every result page together)"""
+        terms = tuple(term for term in query_terms(query) if term in self.postings)
+        if not terms:
+            return 0
+
+        def compute():
+            docs = set(self.postings[terms[0]].docs).union(*(self.postings[term].docs for term in terms[1:]))
+            accept = self._doc_filter(testament, book_id)
+            return len(docs) if accept is None else sum(1 for doc in docs if accept(doc))
+
+        return self._cached(('count', terms, testament, book_id), compute)
+
+    def _search(self, terms: Tuple[str, ...], limit: int, testament: Optional[str],
+                book_id: Optional[int], after: Optional[Tuple[float, int]] = None,
+                highlight: Optional[str] = None) -> List[Tuple]:
+        postings = [self.postings[term] for term in terms]
+        accept = self._doc_filter(testament, book_id)
+        after_key = _rank_key(after[::-1]) if after is not None else None
+
+        if len(postings) == 1:
+            # Postings are impact-ordered: the first matches are already the top-k,
+            # and the page after a key starts right after it in the list
+            plist = postings[0]
+            start = bisect_right(plist, after_key) if after_key is not None else 0
+            hits = []
+            for i in range(start, len(plist)):
+                doc = plist.docs[i]
+                if accept is None or accept(doc):
+                    hits.append((doc, plist.impacts[i], plist.spans(i)) if highlight else (doc, plist.impacts[i]))
+                    if len(hits) == limit:
+                        break
+        else:
+            hits = self._search_terms(postings, limit, accept, after_key)
+            if highlight:
+                hits = self._with_spans(postings, hits)
+
+        if highlight == 'snippet':
+            text = self.data.text
+            return [(doc, score, snippet(text(doc), spans)) for doc, score, spans in hits]
+        return hits
+
+    def _search_terms(self, postings: List[PostingList], limit: int, accept,
+                      after_key: Optional[Tuple[float, int]]) -> List[Tuple[int, float]]:
+        # dict(zip()) and set algebra run in C, so only candidate verses cost Python time
+        impacts = [dict(zip(plist.docs, plist.impacts)) for plist in postings]
+
+        # Verses containing every term go first. A verse missing any term scores at
+        # most the sum of the best impacts minus the smallest one, so if the k-th
+        # full match beats that bound the ranking is already exact.
+        common = set(impacts[0]).intersection(*impacts[1:])
+        top = self._rank(common, impacts, limit, accept, after_key)
+        max_impacts = [plist.max_impact for plist in postings]
+        if len(top) == limit and top[-1][1] > sum(max_impacts) - min(max_impacts):
+            return top
+
+        union = set(impacts[0]).union(*impacts[1:])
+        return self._rank(union, impacts, limit, accept, after_key)
+
+    @staticmethod
+    def _with_spans(postings: List[PostingList], hits: List[Tuple[int, float]]) -> List[Tuple]:
+        """Add the sorted occurrences of every term to each hit"""
+        positions = [dict(zip(plist.docs, range(len(plist)))) for plist in postings]
+        result = []
+        for doc, score in hits:
+            spans = []
+            for plist, position in zip(postings, positions):
+                i = position.get(doc)
+                if i is not None:
+                    spans.extend(plist.spans(i))
+            spans.sort()
+            result.append((doc, score, spans))
+        return result
+
+    @staticmethod
+    def _rank(docs, impacts: List[Dict[int, float]], limit: int, accept,
+              after_key: Optional[Tuple[float, int]] = None) -> List[Tuple[int, float]]:
+        scored = [
+            (doc, sum(term_impacts.get(doc, 0.0) for term_impacts in impacts))
+            for doc in docs if accept is None or accept(doc)
+        ]
+        if after_key is not None:
+            scored = [item for item in scored if _rank_key(item) > after_key]
+        return heapq.nsmallest(limit, scored, key=_rank_key)
+
+
+def _rank_key(item: Tuple[int, float]):
+    """Best score first, ties in biblical (verse index) order"""
+    return (-item[1], item[0])
+
+
+class SearchEngine:
+    """Holds the current SearchIndex and rebuilds it when the corpus reloads"""
+
+    def __init__(self):
+        self._index: Optional[SearchIndex] = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._index is not None
+
+    @property
+    def index(self) -> Optional[SearchIndex]:
+        return self._index
+
+    @property
+    def version(self) -> Optional[str]:
+        """Content version of the indexed corpus; page keys are verse positions within it"""
+        index = self._index
+        return index.data.version if index is not None else None
+
+    def rebuild(self, data: CorpusData):
+        with self._lock:
+            started = time.perf_counter()
+            index = SearchIndex(data)
+            self._index = index
+            logger.info(
+                f"🔎 Search index built: {index.vocabulary_size} terms over {data.verse_count} verses "
+                f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+            )
+
+    def on_corpus_loaded(self, store):
+        self.rebuild(store.data)
+
+    def search(self, query: str, limit: int = 50, testament: Optional[str] = None,
+               book_id: Optional[int] = None, highlight: Optional[str] = None) -> List[Dict]:
+        """Ranked verse rows in the same shape as the SQL search modes"""
+        return self.page(query, limit, testament, book_id, highlight=highlight)[0]
+
+    def page(self, query: str, limit: int = 50, testament: Optional[str] = None,
+             book_id: Optional[int] = None, after: Optional[Tuple[float, int]] = None,
+             highlight: Optional[str] = None) -> Tuple[List[Dict], Optional[Tuple[float, int]]]:
+        """One page of ranked rows and the key of its last hit, or None when it is the last page
+
+        ``highlight`` ('offsets' or 'snippet') adds the match positions to every row.
+        """
+        index = self._index
+        hits = index.search(query, limit + 1, testament, book_id, after, highlight)
+        next_key = None
+        if len(hits) > limit:
+            hits = hits[:limit]
+            doc, score = hits[-1][:2]
+            next_key = (float(score), doc)  # exact score: the rows only carry the rounded one
+        verse_dict = index.data.verse_dict
+        field = HIGHLIGHT_FIELDS.get(highlight)
+        results = []
+        for hit in hits:
+            verse = verse_dict(hit[0])
+            verse['relevance_score'] = round(hit[1], 4)
+            if field:
+                verse[field] = hit[2]
+            results.append(verse)
+        return results, next_key
+
+    def count(self, query: str, testament: Optional[str] = None, book_id: Optional[int] = None) -> int:
+        return self._index.count(query, testament, book_id)
@@ -0,0 +1,128 @@
+"""
+SQL for the /search modes.
+
+- ``like``: the original LOWER(text) LIKE '%q%' scan with a three-tier CASE score.
+- ``fts``:  Portuguese full-text search over the stored ``verses.text_tsv``
+  column (GIN indexed), ranked with ``ts_rank_cd``.
+
+Both return the same columns so the response shape does not depend on the mode,
+and both accept the optional testament / book filters.
+
+Results are ordered by a total sort key (score, book order, chapter, verse) so
+they can be paged with keyset cursors: ``search_params(..., after=key)`` asks
+for the rows after ``key``, which ``page_key`` takes from the last row of the
+previous page. ``book_order`` is only selected for the key; ``page_key``
+removes it from the rows.
+"""
+from typing import Dict, List, Optional, Tuple
+
+SEARCH_MODES = ('like', 'fts')
+
+# Books without biblical_order sort after the 66 canonical ones, by id
+BOOK_ORDER = "COALESCE(b.biblical_order, 1000 + b.id)"
+
+# (score, book order, chapter number, verse number); the score is negated for fts (best first)
+SearchKey = Tuple[float, int, int, int]
+
+LIKE_SEARCH_QUERY = f"""
+SELECT * FROM (
+    SELECT v.id, v.chapter_id, v.verse_number, v.text,
+           c.chapter_number, b.name as book_name, b.testament,
+           b.id as book_id,
+           CASE
+               WHEN LOWER(v.text) LIKE LOWER(%s) THEN 1
+               WHEN LOWER(v.text) LIKE LOWER(%s) THEN 2
+               ELSE 3
+           END as relevance_score,
+           {BOOK_ORDER} as book_order
+    FROM verses v
+    JOIN chapters c ON v.chapter_id = c.id
+    JOIN books b ON c.book_id = b.id
+    WHERE LOWER(v.text) LIKE LOWER(%s)
+      AND (%s::text IS NULL OR b.testament = %s)
+      AND (%s::int IS NULL OR b.id = %s)
+) r
+WHERE (%s::float8 IS NULL
+       OR (r.relevance_score, r.book_order, r.chapter_number, r.verse_number)
+          > (%s::float8, %s::int, %s::int, %s::int))
+ORDER BY relevance_score, book_order, chapter_number, verse_number
+LIMIT %s
+"""
+
+# websearch_to_tsquery accepts free text, "quoted phrases", OR and -exclusions
+FTS_SEARCH_QUERY = f"""
+SELECT * FROM (
+    SELECT v.id, v.chapter_id, v.verse_number, v.text,
+           c.chapter_number, b.name as book_name, b.testament,
+           b.id as book_id,
+           -- float8: ts_rank_cd is real, and the cursor compares against a float8 parameter
+           ts_rank_cd(v.text_tsv, query)::float8 as relevance_score,
+           {BOOK_ORDER} as book_order
+    FROM verses v
+    JOIN chapters c ON v.chapter_id = c.id
+    JOIN books b ON c.book_id = b.id,
+         websearch_to_tsquery('portuguese', %s) query
+    WHERE v.text_tsv @@ query
+      AND (%s::text IS NULL OR b.testament = %s)
+      AND (%s::int IS NULL OR b.id = %s)
+) r
+WHERE (%s::float8 IS NULL
+       OR (-r.relevance_score, r.book_order, r.chapter_number, r.verse_number)
+          > (%s::float8, %s::int, %s::int, %s::int))
+ORDER BY relevance_score DESC, book_order, chapter_number, verse_number
+LIMIT %s
+"""
+
+LIKE_COUNT_QUERY = """
+SELECT COUNT(*) AS count
+FROM verses v
+JOIN chapters c ON v.chapter_id = c.id
+JOIN books b ON c.book_id = b.id
+WHERE LOWER(v.text) LIKE LOWER(%s)
+  AND (%s::text IS NULL OR b.testament = %s)
+  AND (%s::int IS NULL OR b.id = %s)
+"""
+
+FTS_COUNT_QUERY = """
+SELECT COUNT(*) AS count
+FROM verses v
+JOIN chapters c ON v.chapter_id = c.id
+JOIN books b ON c.book_id = b.id
+WHERE v.text_tsv @@ websearch_to_tsquery('portuguese', %s)
+  AND (%s::text IS NULL OR b.testament = %s)
+  AND (%s::int IS NULL OR b.id = %s)
+"""
+
+
+def search_params(mode: str, q: str, limit: int, testament: str = None, book_id: int = None,
+                  after: Optional[SearchKey] = None) -> tuple:
+    """Build the parameter tuple for the given mode's query (only rows after ``after`` when given)"""
+    filters = (testament, testament, book_id, book_id)
+    keyset = (after[0], *after) if after else (None,) * 5
+    if mode == 'fts':
+        return (q, *filters, *keyset, limit)
+    exact_match = f"%{q}%"
+    word_match = f"% {q} %"
+    return (exact_match, word_match, exact_match, *filters, *keyset, limit)
+
+
+def search_query(mode: str) -> str:
+    return FTS_SEARCH_QUERY if mode == 'fts' else LIKE_SEARCH_QUERY
+
+
+def count_params(mode: str, q: str, testament: str = None, book_id: int = None) -> tuple:
+    return (q if mode == 'fts' else f"%{q}%", testament, testament, book_id, book_id)
+
+
+def count_query(mode: str) -> str:
+    return FTS_COUNT_QUERY if mode == 'fts' else LIKE_COUNT_QUERY
+
+
+def page_key(mode: str, rows: List[Dict]) -> Optional[SearchKey]:
+    """Remove ``book_order`` from the rows and return the sort key of the last one"""
+    key = None
+    for row in rows:
+        score = float(row['relevance_score'])
+        key = (-score if mode == 'fts' else score, row.pop('book_order'),
+               row['chapter_number'], row['verse_number'])
+    return key
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Binary corpus snapshots: the in-memory corpus written to one file and mapped back.
+
+The API can start from a snapshot instead of Postgres (``CORPUS_SNAPSHOT_PATH``)
+in a few milliseconds and with no database at all: edge deployments, demos
+and tests run on a single file.
+
+Layout (little-endian, every section 8-byte aligned):
+
+    header     magic "BIBSNAP\\0", format version (u16), flags (u16), section count (u32)
+    directory  per section: name (8 bytes), offset (u64), length (u64)
+    META       JSON: content version, export time, books, chapter scraped_at
+    BOOKCHAP   u32[books + 1]      first chapter index of each book
+    CHAPID     i32[chapters]       chapters.id
+    CHAPNUM    u16[chapters]       chapter_number
+    CHAPTOT    i32[chapters]       total_verses (-1 for NULL)
+    CHAPVRS    u32[chapters + 1]   first verse index of each chapter
+    VERSEID    i32[verses]         verses.id
+    VERSENUM   u16[verses]         verse_number
+    VERSECHP   u16[verses]         chapter index
+    TEXTOFF    u32[verses + 1]     verse text offsets into TEXT
+    TEXT       UTF-8 verse texts, concatenated
+
+The verse columns use the same types as ``CorpusData``'s arrays, so the loader
+hands out ``memoryview`` casts of the mapped file instead of copying them,
+and the content version recorded at export is reused.
+
+Usage:
+    python snapshot.py export corpus.snap     # from the database (DB_* env vars)
+    python snapshot.py info corpus.snap       # load it and print counts and timings
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from corpus import BookRecord, ChapterRecord, CorpusData
+
+MAGIC = b'BIBSNAP\0'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sHHI')
+SECTION = struct.Struct('<8sQQ')
+
+# name -> array typecode ('' for raw bytes / JSON)
+SECTIONS = (
+    ('META', ''), ('BOOKCHAP', 'I'), ('CHAPID', 'i'), ('CHAPNUM', 'H'), ('CHAPTOT', 'i'), ('CHAPVRS', 'I'),
+    ('VERSEID', 'i'), ('VERSENUM', 'H'), ('VERSECHP', 'H'), ('TEXTOFF', 'I'), ('TEXT', ''),
+)
+
+
+class SnapshotError(Exception):
+    """Raised for files that are not readable corpus snapshots"""
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _fromisoformat(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _columns(data: CorpusData) -> Dict[str, bytes]:
+    book_index = {book.id: i for i, book in enumerate(data.books)}
+    book_chapters = array('I', (book.chapter_start for book in data.books))
+    book_chapters.append(len(data.chapters))
+    chapter_verses = array('I', (chapter.verse_start for chapter in data.chapters))
+    chapter_verses.append(data.verse_count)
+    meta = {
+        'version': data.version,
+        'exported_at': datetime.now().isoformat(),
+        'books': [
+            {**book.to_dict(), 'created_at': _isoformat(book.created_at), 'index': book_index[book.id]}
+            for book in data.books
+        ],
+        'chapter_scraped_at': [_isoformat(chapter.scraped_at) for chapter in data.chapters],
+    }
+    columns = {
+        'META': json.dumps(meta, ensure_ascii=False).encode('utf-8'),
+        'BOOKCHAP': book_chapters,
+        'CHAPID': array('i', (chapter.id for chapter in data.chapters)),
+        'CHAPNUM': array('H', (chapter.chapter_number for chapter in data.chapters)),
+        'CHAPTOT': array('i', (-1 if chapter.total_verses is None else chapter.total_verses
+                               for chapter in data.chapters)),
+        'CHAPVRS': chapter_verses,
+        'VERSEID': array('i', data.verse_ids),
+        'VERSENUM': array('H', data.verse_numbers),
+        'VERSECHP': array('H', data.verse_chapters),
+        'TEXTOFF': array('I', data.text_offsets),
+        'TEXT': bytes(data.text_blob),
+    }
+    for name, column in columns.items():
+        if isinstance(column, array):
+            if sys.byteorder == 'big':
+                column.byteswap()
+            columns[name] = column.tobytes()
+    return columns
+
+
+def write_snapshot(data: CorpusData, path: str) -> int:
+    """Write ``data`` to ``path`` atomically; returns the file size"""
+    columns = _columns(data)
+    offset = HEADER.size + SECTION.size * len(SECTIONS)
+    directory, chunks = [], []
+    for name, _ in SECTIONS:
+        padding = -offset % 8
+        chunks.append(b'\0' * padding)
+        offset += padding
+        directory.append(SECTION.pack(name.encode('ascii'), offset, len(columns[name])))
+        chunks.append(columns[name])
+        offset += len(columns[name])
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(SECTIONS)))
+            f.writelines(directory)
+            f.writelines(chunks)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return offset
+
+
+def _sections(buffer: memoryview) -> Dict[str, memoryview]:
+    if len(buffer) < HEADER.size:
+        raise SnapshotError("File too small for a corpus snapshot")
+    magic, version, _, count = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise SnapshotError("Not a corpus snapshot (bad magic)")
+    if version != FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot format version {version} (expected {FORMAT_VERSION})")
+
+    sections = {}
+    for i in range(count):
+        name, offset, length = SECTION.unpack_from(buffer, HEADER.size + i * SECTION.size)
+        if offset + length > len(buffer):
+            raise SnapshotError(f"Truncated snapshot: section {name!r} ends past the end of the file")
+        sections[name.rstrip(b'\0').decode('ascii')] = buffer[offset:offset + length]
+    missing = [name for name, _ in SECTIONS if name not in sections]
+    if missing:
+        raise SnapshotError(f"Snapshot is missing sections: {', '.join(missing)}")
+    return sections
+
+
+def _column(section: memoryview, typecode: str):
+    """Zero-copy typed view of a section (a copied, byte-swapped array on big-endian hosts)"""
+    if sys.byteorder == 'big':
+        column = array(typecode, section.tobytes())
+        column.byteswap()
+        return column
+    return section.cast(typecode)
+
+
+def load_snapshot(path: str) -> CorpusData:
+    """Map a snapshot file and build a ``CorpusData`` over it"""
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    sections = _sections(memoryview(mapped))
+    meta = json.loads(str(sections['META'], 'utf-8'))
+    columns = {name: _column(sections[name], typecode) for name, typecode in SECTIONS if typecode}
+
+    book_chapters, chapter_verses = columns['BOOKCHAP'], columns['CHAPVRS']
+    chapter_ids, chapter_numbers, chapter_totals = columns['CHAPID'], columns['CHAPNUM'], columns['CHAPTOT']
+    scraped_at = meta['chapter_scraped_at']
+
+    books: List[BookRecord] = []
+    chapters: List[ChapterRecord] = []
+    for b, row in enumerate(meta['books']):
+        book = BookRecord(row['id'], row['name'], row['testament'], row['url'], row['total_chapters'],
+                          row.get('biblical_order'), _fromisoformat(row.get('created_at')))
+        book.chapter_start, book.chapter_end = book_chapters[b], book_chapters[b + 1]
+        book.verse_start = chapter_verses[book.chapter_start]
+        book.verse_end = chapter_verses[book.chapter_end]
+        for c in range(book.chapter_start, book.chapter_end):
+            total = chapter_totals[c]
+            chapter = ChapterRecord(chapter_ids[c], book.id, chapter_numbers[c], None if total < 0 else total,
+                                    _fromisoformat(scraped_at[c]))
+            chapter.index, chapter.book = c, book
+            chapter.verse_start, chapter.verse_end = chapter_verses[c], chapter_verses[c + 1]
+            chapters.append(chapter)
+        books.append(book)
+
+    data = CorpusData(books, chapters, columns['VERSEID'], columns['VERSENUM'], columns['VERSECHP'],
+                      columns['TEXTOFF'], sections['TEXT'], version=meta['version'],
+                      source=f"snapshot:{os.path.basename(path)}")
+    data.mapped_file = mapped  # keeps the mapping alive as long as the snapshot is in use
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export or inspect binary corpus snapshots')
+    sub = parser.add_subparsers(dest='command', required=True)
+    export = sub.add_parser('export', help='Write the database corpus to a snapshot file')
+    export.add_argument('path')
+    info = sub.add_parser('info', help='Load a snapshot and print what it contains')
+    info.add_argument('path')
+    info.add_argument('--verify', action='store_true', help='Recompute the content version and compare')
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        from models import DatabaseManager
+        from corpus import CorpusStore
+
+        db_manager = DatabaseManager()
+        try:
+            started = time.perf_counter()
+            data = CorpusStore().load(db_manager)
+            size = write_snapshot(data, args.path)
+            print(f"✅ {args.path}: {len(data.books)} books, {len(data.chapters)} chapters, "
+                  f"{data.verse_count} verses, {size / 1024:.0f} KiB in {time.perf_counter() - started:.2f}s")
+        except Exception as e:
+            print(f"❌ Export failed: {e}")
+            sys.exit(1)
+        finally:
+            db_manager.close()
+        return
+
+    started = time.perf_counter()
+    data = load_snapshot(args.path)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"{args.path}: {len(data.books)} books, {len(data.chapters)} chapters, {data.verse_count} verses, "
+          f"{len(data.text_blob) / 1024:.0f} KiB text, version {data.version}, loaded in {elapsed:.1f}ms")
+    if args.verify:
+        recomputed = data._content_version()
+        print(f"{'✓' if recomputed == data.version else '✗'} content version {recomputed}")
+        sys.exit(0 if recomputed == data.version else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""
+Autocomplete for /search/suggest, built from the corpus at startup (and on every reload).
+
+Two prefix indexes, each a sorted array of accent-folded keys searched with
+``bisect``:
+
+- books: every book under its name, each word of its name, its abbreviations
+  and URL codes (the ``book_resolver`` aliases), suggested in biblical order;
+- vocabulary: every corpus word except stopwords, in its most frequent
+  spelling, ranked by how often it occurs.
+
+The top completions of every prefix of up to ``CACHED_PREFIX_LENGTH``
+characters are precomputed, since short prefixes match most of the
+vocabulary; longer prefixes match few enough keys to rank on the fly. Nothing
+is queried from Postgres per keystroke.
+
+The vocabulary also gets a trigram index (``fuzzy``), used by ``correct`` to
+respell the words of a /search query that matched nothing.
+"""
+import heapq
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from book_resolver import ABBREVIATIONS, alias_key, url_code
+from catalog import get_catalog
+from corpus import CorpusData
+from fuzzy import TrigramIndex, correct_query
+from textnorm import STOPWORDS, WORD_RE, fold, normalize
+
+logger = logging.getLogger(__name__)
+
+MAX_SUGGESTIONS = 20
+CACHED_PREFIX_LENGTH = 3
+
+
+class PrefixIndex:
+    """(key, weight, value) entries; completes a key prefix to the heaviest distinct values"""
+
+    def __init__(self, entries: Iterable[Tuple[str, float, str]]):
+        entries = sorted(entries, key=lambda entry: entry[0])
+        self.keys = [key for key, _, _ in entries]
+        self.weights = [weight for _, weight, _ in entries]
+        self.values = [value for _, _, value in entries]
+        self.distinct = len(set(self.values)) == len(self.values)
+        prefixes = {key[:n] for key in self.keys for n in range(1, CACHED_PREFIX_LENGTH + 1)}
+        self._top = {prefix: self._rank(prefix, MAX_SUGGESTIONS) for prefix in prefixes}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _rank(self, prefix: str, limit: int) -> List[str]:
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + '\uffff', lo)
+        weights, values = self.weights, self.values
+        if self.distinct:
+            return [values[i] for i in heapq.nlargest(limit, range(lo, hi), key=weights.__getitem__)]
+
+        # Several keys per value (a book's name, words and abbreviations): keep the first of each
+        ranked = []
+        for i in sorted(range(lo, hi), key=lambda i: -weights[i]):
+            if values[i] not in ranked:
+                ranked.append(values[i])
+                if len(ranked) == limit:
+                    break
+        return ranked
+
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        if not prefix:
+            return []
+        top = self._top.get(prefix)
+        if top is not None:
+            return top[:limit]
+        return self._rank(prefix, limit)
+
+
+def book_entries(books: Iterable[Dict]) -> List[Tuple[str, float, str]]:
+    """Prefix keys of every book, weighted by biblical order (``books`` in that order)"""
+    catalog = get_catalog()
+    entries = []
+    for position, book in enumerate(books):
+        name = book['name']
+        entry = catalog.get(name)
+        aliases = [name, *WORD_RE.findall(name), *ABBREVIATIONS.get(name, ())]
+        aliases += [code for code in (url_code(book.get('url')), entry.code if entry else None) if code]
+        for key in {alias_key(alias) for alias in aliases}:
+            if key and not key.isdigit() and key not in STOPWORDS:
+                entries.append((key, -position, name))
+    return entries
+
+
+def vocabulary_entries(data: CorpusData) -> List[Tuple[str, float, str]]:
+    """One entry per folded corpus word: its most frequent spelling, weighted by total frequency"""
+    counts = Counter()
+    for i in range(data.verse_count):
+        counts.update(WORD_RE.findall(data.text(i)))
+
+    spellings: Dict[str, Tuple[int, str]] = {}
+    totals: Counter = Counter()
+    for word, count in counts.items():
+        if len(word) < 2 or word.isdigit():
+            continue
+        key = fold(word)
+        totals[key] += count
+        if count > spellings.get(key, (0, ''))[0]:
+            spellings[key] = (count, word)
+    return [(key, total, spellings[key][1]) for key, total in totals.items()
+            if normalize(key) not in STOPWORDS]
+
+
+class Suggester:
+    """Holds the current suggestion indexes and rebuilds them when the corpus reloads"""
+
+    def __init__(self):
+        self.books: Optional[PrefixIndex] = None
+        self.words: Optional[PrefixIndex] = None
+        self.similar_words: Optional[TrigramIndex] = None
+        self.spellings: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.books is not None
+
+    def rebuild(self, data: CorpusData):
+        with self._lock:
+            started = time.perf_counter()
+            books = PrefixIndex(book_entries(
+                {'name': book.name, 'url': book.url} for book in data.books
+            ))
+            vocabulary = vocabulary_entries(data)
+            words = PrefixIndex(vocabulary)
+            similar_words = TrigramIndex((spelling, total, spelling) for _, total, spelling in vocabulary)
+            self.books, self.words, self.similar_words = books, words, similar_words
+            self.spellings = {key: spelling for key, _, spelling in vocabulary}
+            logger.info(
+                f"💡 Suggestions built: {len(books)} book keys, {len(words)} words "
+                f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+            )
+
+    def on_corpus_loaded(self, store):
+        self.rebuild(store.data)
+
+    def load_books(self, books: Iterable[Dict]):
+        """Book suggestions only, for when the corpus store is not loaded"""
+        with self._lock:
+            self.books = PrefixIndex(book_entries(books))
+            self.words = self.similar_words = None
+            self.spellings = {}
+
+    def suggest(self, q: str, limit: int = 10) -> List[str]:
+        """Books whose names start with ``q``, then completions of its last word"""
+        suggestions = self.books.complete(alias_key(q), limit)
+        if self.words is not None and len(suggestions) < limit:
+            head, _, last = q.lstrip().rpartition(' ')
+            head = f"{head} " if head else ''
+            for word in self.words.complete(fold(last), limit):
+                suggestion = head + word
+                if suggestion not in suggestions:
+                    suggestions.append(suggestion)
+                    if len(suggestions) == limit:
+                        break
+        return suggestions
+
+    def correct(self, q: str) -> Optional[str]:
+        """``q`` with misspelled words replaced by the closest corpus words; None if unchanged"""
+        if self.similar_words is None:
+            return None
+        return correct_query(q, self.spellings.get, self.similar_words)
@@ -0,0 +1,102 @@
+"""Reference parsing: spans, book continuation, single-chapter books, limits and errors"""
+import pytest
+
+from book_resolver import BookResolver
+from catalog import get_catalog
+from references import (LAST_VERSE, MAX_REFERENCES, InvalidReferenceError, Span, UnknownBookError,
+                        parse_references, passage_query)
+
+RESOLVER = BookResolver({'id': book.order, 'name': book.name, 'url': book.url, 'total_chapters': book.chapters}
+                        for book in get_catalog())
+
+
+def book_id(name: str) -> int:
+    return get_catalog().get(name).order
+
+
+PARSED = [
+    # (text, [(book, spans), ...])
+    ("Jo 3:16", [('João', [Span(3, 16, 3, 16)])]),
+    ("Jo 3.16", [('João', [Span(3, 16, 3, 16)])]),
+    ("Jo 3:16-18", [('João', [Span(3, 16, 3, 18)])]),
+    ("Jo 3:16-4:2", [('João', [Span(3, 16, 4, 2)])]),
+    ("Jo 3:16,18", [('João', [Span(3, 16, 3, 16), Span(3, 18, 3, 18)])]),
+    ("Jo 3:18,16", [('João', [Span(3, 18, 3, 18), Span(3, 16, 3, 16)])]),
+    ("Jo 3:16,4:1", [('João', [Span(3, 16, 3, 16), Span(4, 1, 4, 1)])]),
+    ("Sl 23", [('Salmos', [Span(23, None, 23, None)])]),
+    ("Sl 23, 25", [('Salmos', [Span(23, None, 23, None), Span(25, None, 25, None)])]),
+    ("Gn 1-3", [('Gênesis', [Span(1, None, 3, None)])]),
+    ("Gn 1-2:3", [('Gênesis', [Span(1, None, 2, 3)])]),
+    ("1 Jo 3", [('1 João', [Span(3, None, 3, None)])]),
+    ("1Co 13:4-7", [('1 Coríntios', [Span(13, 4, 13, 7)])]),
+    ("I Coríntios 13:4", [('1 Coríntios', [Span(13, 4, 13, 4)])]),
+    ("Judas 3", [('Judas', [Span(1, 3, 1, 3)])]),
+    ("Fm 4-6", [('Filemom', [Span(1, 4, 1, 6)])]),
+    ("Judas", [('Judas', [Span(1, None, 1, None)])]),
+    ("Jo 3:16; 4:1", [('João', [Span(3, 16, 3, 16)]), ('João', [Span(4, 1, 4, 1)])]),
+    ("Sl 23; Rm 8:28-39", [('Salmos', [Span(23, None, 23, None)]), ('Romanos', [Span(8, 28, 8, 39)])]),
+    (" Sl 23 ;; Jo 1:1 ", [('Salmos', [Span(23, None, 23, None)]), ('João', [Span(1, 1, 1, 1)])]),
+]
+
+INVALID = [
+    "Jo 0",
+    "Jo 3:0",
+    "Jo 0:16",
+    "Jo 3:16-0",
+    "Jo 3:16,0",
+    "Judas 0",
+    "Jo 3:18-16",
+    "Jo 4-3",
+    "Jo 4:1-3:2",
+    "Jo 3:a",
+    "Jo 3:16-",
+    "Jo",
+    "3:16",
+    "",
+    " ; ",
+]
+
+
+@pytest.mark.parametrize('text,expected', PARSED, ids=[text for text, _ in PARSED])
+def test_parse(text, expected):
+    passages = parse_references(text, RESOLVER)
+    assert [(passage.book_id, list(passage.spans)) for passage in passages] == [
+        (book_id(name), spans) for name, spans in expected
+    ]
+
+
+@pytest.mark.parametrize('text', INVALID)
+def test_invalid(text):
+    with pytest.raises(InvalidReferenceError):
+        parse_references(text, RESOLVER)
+
+
+@pytest.mark.parametrize('text', ["amor 1", "Xyz 3:16"])
+def test_unknown_book(text):
+    with pytest.raises(UnknownBookError):
+        parse_references(text, RESOLVER)
+
+
+def test_misspelled_book_is_corrected():
+    passage, = parse_references("Geremias 1:1", RESOLVER)
+    assert passage.book_id == book_id('Jeremias') and passage.corrected
+    assert not parse_references("Jr 1:1", RESOLVER)[0].corrected
+
+
+def test_max_references():
+    assert len(parse_references('; '.join(['Jo 1:1'] * MAX_REFERENCES), RESOLVER)) == MAX_REFERENCES
+    with pytest.raises(InvalidReferenceError):
+        parse_references('; '.join(['Jo 1:1'] * (MAX_REFERENCES + 1)), RESOLVER)
+
+
+def test_passage_query_keeps_request_order():
+    passages = parse_references("Jo 3:18,16; Sl 23", RESOLVER)
+    query, params = passage_query(passages, 100)
+    assert "ORDER BY r.position, r.span" in query
+    rows = [params[i:i + 7] for i in range(0, len(params) - 1, 7)]
+    assert rows == [
+        (0, 0, book_id('João'), 3, 18, 3, 18),
+        (0, 1, book_id('João'), 3, 16, 3, 16),
+        (1, 0, book_id('Salmos'), 23, 0, 23, LAST_VERSE),
+    ]
+    assert params[-1] == 100
@@ -0,0 +1,89 @@
+"""
+Portuguese text normalization shared by search, suggestions and reference parsing.
+
+- ``fold``: lowercase + strip accents ("Salvação" -> "salvacao"), so readers
+  typing without accents ("fe", "graca") still match.
+- ``stem``: light, plural-oriented stemmer ("graças" -> "graca",
+  "corações" -> "coracao", "homens" -> "homem").
+- ``tokenize``: words with their character offsets in the *original* text,
+  so matches can be highlighted without re-scanning.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Iterator, List, Tuple
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _build_fold_table() -> dict:
+    table = {}
+    for code in range(0xC0, 0x250):
+        char = chr(code)
+        base = ''.join(c for c in unicodedata.normalize('NFD', char) if not unicodedata.combining(c))
+        if base != char and base:
+            table[code] = base.lower()
+    return table
+
+
+_FOLD_TABLE = _build_fold_table()
+
+STOPWORDS = frozenset("""
+a ao aos as at com como da das de do dos e ela elas ele eles em entre era
+essa esse esta este eu foi ha isso isto ja lhe lhes mais mas me meu minha
+na nas nao nem no nos num numa o os ou para pela pelas pelo pelos por qual
+quando que se sem seu seus sua suas tambem te teu tua tu um uma umas uns
+vos
+""".split())
+
+
+def fold(text: str) -> str:
+    """Lowercase and remove diacritics"""
+    return text.lower().translate(_FOLD_TABLE)
+
+
+def stem(term: str) -> str:
+    """Light Portuguese stemmer for folded terms (plural and adverb suffixes only)"""
+    n = len(term)
+    if n <= 3:
+        return term
+    if term.endswith('mente') and n > 7:
+        return term[:-5]
+    if term.endswith(('oes', 'aes')):
+        return term[:-3] + 'ao'
+    if term.endswith('ais') and n > 4:
+        return term[:-3] + 'al'
+    if term.endswith('eis') and n > 4:
+        return term[:-3] + 'el'
+    if term.endswith('ois') and n > 4:
+        return term[:-3] + 'ol'
+    if term.endswith('ns'):
+        return term[:-2] + 'm'
+    if term.endswith(('res', 'zes')) and n > 4:
+        return term[:-2]
+    if term.endswith('s') and not term.endswith(('ss', 'us', 'is')):
+        return term[:-1]
+    return term
+
+
+@lru_cache(maxsize=65536)  # the corpus vocabulary fits; index builds tokenize every verse
+def normalize(word: str) -> str:
+    """The index/query form of a single word"""
+    return stem(fold(word))
+
+
+def tokenize(text: str) -> Iterator[Tuple[str, int, int]]:
+    """Yield (normalized term, start, end) for every word in ``text``"""
+    for match in WORD_RE.finditer(text):
+        yield normalize(match.group()), match.start(), match.end()
+
+
+def query_terms(query: str) -> List[str]:
+    """Distinct normalized query terms, without stopwords unless nothing else is left"""
+    terms = []
+    for word in WORD_RE.findall(query):
+        term = normalize(word)
+        if term not in terms:
+            terms.append(term)
+    content = [term for term in terms if term not in STOPWORDS]
+    return content or terms
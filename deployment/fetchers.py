@@ -0,0 +1,221 @@
+"""
+Page fetchers for chapter pages.
+
+The verses are in the server-rendered HTML (``main p[data-v] span.v/.t``), so
+a plain HTTP client is enough for almost every page; a headless browser is
+only needed when that markup is missing (e.g. the site starts rendering it
+client-side). Backends:
+
+- ``HttpFetcher``: ``requests.Session`` with keep-alive connection pooling;
+- ``SeleniumFetcher``: headless Chrome, started lazily and recycled every
+  ``recycle_after`` pages or after a failure;
+- ``FallbackFetcher``: HTTP first, Selenium only when the response lacks the
+  verse markup or the request fails.
+"""
+import logging
+import random
+import re
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+    SELENIUM_AVAILABLE = True
+except ImportError:  # HTTP-only environments
+    SELENIUM_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+FETCH_MODES = ('auto', 'http', 'selenium')
+
+VERSE_MARKUP_RE = re.compile(r"<p\b[^>]*\bdata-v\b[^>]*>.*?class=[\"']t[\"']", re.DOTALL)
+
+
+def has_verse_markup(html: str) -> bool:
+    """True if the page already contains rendered verse paragraphs"""
+    return bool(html) and VERSE_MARKUP_RE.search(html) is not None
+
+
+class FetchError(Exception):
+    """Raised when a page cannot be fetched"""
+
+
+USER_AGENTS = [
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+]
+
+
+def create_driver():
+    """Headless Chrome with optimized options"""
+    if not SELENIUM_AVAILABLE:
+        raise FetchError("selenium/webdriver-manager not installed; use --fetcher http")
+    chrome_options = Options()
+
+    # Optimize for speed and stealth
+    chrome_options.add_argument("--headless")  # Run in background
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-images")  # Don't load images
+    # chrome_options.add_argument("--disable-javascript")  # Keep JS enabled for dynamic content
+    chrome_options.add_argument("--disable-plugins")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-background-timer-throttling")
+    chrome_options.add_argument("--disable-renderer-backgrounding")
+    chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+
+    # Random user agent rotation
+    chrome_options.add_argument(f"--user-agent={random.choice(USER_AGENTS)}")
+
+    service = Service(ChromeDriverManager().install())
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    driver.set_page_load_timeout(15)
+    driver.implicitly_wait(5)
+    return driver
+
+
+def load_chapter_page(driver, url: str) -> str:
+    """Load a chapter page and return its HTML once the verses are rendered"""
+    driver.get(url)
+
+    # Wait for main content, then for the verse paragraphs themselves
+    # (replaces a fixed 3s sleep after every page)
+    WebDriverWait(driver, 20).until(
+        EC.presence_of_element_located((By.TAG_NAME, "main"))
+    )
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "main p[data-v]"))
+    )
+    WebDriverWait(driver, 10).until(
+        lambda d: d.execute_script("return document.readyState") == "complete"
+    )
+    return driver.page_source
+
+
+class PageFetcher:
+    name = 'base'
+
+    def fetch(self, url: str) -> str:
+        """Return the final HTML of ``url``"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class HttpFetcher(PageFetcher):
+    """Plain HTTP GET over a pooled keep-alive session"""
+
+    name = 'http'
+
+    def __init__(self, timeout: float = 15.0, pool_size: int = 10):
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': random.choice(USER_AGENTS),
+            'Accept': 'text/html,application/xhtml+xml',
+            'Accept-Language': 'pt-BR,pt;q=0.9',
+        })
+
+    def fetch(self, url: str) -> str:
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise FetchError(f"HTTP fetch failed for {url}: {e}") from e
+        # requests assumes ISO-8859-1 for text/html without a charset; the site is UTF-8
+        if 'charset' not in response.headers.get('Content-Type', '').lower():
+            response.encoding = 'utf-8'
+        return response.text
+
+    def close(self):
+        self.session.close()
+
+
+class SeleniumFetcher(PageFetcher):
+    """Headless Chrome, created on first use and recycled periodically"""
+
+    name = 'selenium'
+
+    def __init__(self, recycle_after: int = 200):
+        self.recycle_after = recycle_after
+        self.driver = None
+        self.pages_on_driver = 0
+        self.browsers_started = 0
+
+    def _quit_driver(self):
+        if self.driver:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+        self.driver = None
+        self.pages_on_driver = 0
+
+    def fetch(self, url: str) -> str:
+        if self.driver is not None and self.pages_on_driver >= self.recycle_after:
+            logger.info(f"♻️ Recycling browser after {self.pages_on_driver} pages")
+            self._quit_driver()
+        if self.driver is None:
+            self.driver = create_driver()
+            self.browsers_started += 1
+        self.pages_on_driver += 1
+        try:
+            return load_chapter_page(self.driver, url)
+        except Exception as e:
+            # A failed load often means a wedged browser; the next fetch starts a fresh one
+            self._quit_driver()
+            raise FetchError(f"Browser fetch failed for {url}: {e}") from e
+
+    def close(self):
+        self._quit_driver()
+
+
+class FallbackFetcher(PageFetcher):
+    """HTTP first; the browser only for pages whose verse markup is missing"""
+
+    name = 'auto'
+
+    def __init__(self, primary: PageFetcher, fallback: PageFetcher):
+        self.primary = primary
+        self.fallback = fallback
+        self.fallbacks = 0
+
+    def fetch(self, url: str) -> str:
+        try:
+            html = self.primary.fetch(url)
+            if has_verse_markup(html):
+                return html
+            logger.info(f"No verse markup from {self.primary.name} for {url}, using {self.fallback.name}")
+        except FetchError as e:
+            logger.warning(f"{e}; retrying with {self.fallback.name}")
+        self.fallbacks += 1
+        return self.fallback.fetch(url)
+
+    def close(self):
+        self.primary.close()
+        self.fallback.close()
+
+
+def create_fetcher(mode: str = 'auto', recycle_after: int = 200, timeout: float = 15.0) -> PageFetcher:
+    """Fetcher for a --fetcher mode: auto (HTTP with browser fallback), http or selenium"""
+    if mode == 'http':
+        return HttpFetcher(timeout=timeout)
+    if mode == 'selenium':
+        return SeleniumFetcher(recycle_after=recycle_after)
+    if mode == 'auto':
+        return FallbackFetcher(HttpFetcher(timeout=timeout), SeleniumFetcher(recycle_after=recycle_after))
+    raise ValueError(f"Unknown fetch mode '{mode}', use one of: {', '.join(FETCH_MODES)}")
+
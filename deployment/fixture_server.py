@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for bibliaonline.com.br, for exercising the page fetchers offline.
+
+Serves ``fixtures/`` under the same paths as the site (``/acf/gn/1`` ->
+``fixtures/acf/gn/1.html``):
+
+- ``/acf/gn/1``: verses in the server-rendered HTML (the HTTP fetcher is enough);
+- ``/acf/sl/23``: verses injected by JavaScript (``auto`` must fall back to the browser).
+
+Usage:
+    python fixture_server.py --port 8765            # serve until Ctrl+C
+    python fixture_server.py --check                # check the HTTP fetcher
+    python fixture_server.py --check --selenium     # also check the browser and auto backends (needs Chrome)
+
+``test_fetchers.py`` runs the HTTP and auto fetchers against it (``auto`` with a
+stand-in for the browser).
+"""
+import argparse
+import logging
+import os
+import sys
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from fetchers import FallbackFetcher, HttpFetcher, SeleniumFetcher, has_verse_markup
+from verse_parser import parse_chapter
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# path -> expected verse count once rendered
+FIXTURE_PAGES = {
+    '/acf/gn/1': 5,
+    '/acf/sl/23': 6,
+}
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=FIXTURES_DIR, **kwargs)
+
+    def translate_path(self, path):
+        # Chapter URLs have no extension on the real site
+        path = path.split('?', 1)[0].rstrip('/')
+        if not os.path.splitext(path)[1]:
+            path += '.html'
+        return super().translate_path(path)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """Serve the fixtures on a background thread (``with FixtureServer() as base_url:``)"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self.httpd = ThreadingHTTPServer((host, port), FixtureHandler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> str:
+        self.thread.start()
+        return self.base_url
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def verse_count(html: str) -> int:
+    return len(parse_chapter(html, logging.getLogger(__name__)))
+
+
+def check(with_selenium: bool) -> bool:
+    """Fetch every fixture with each backend and compare against the expected verse counts"""
+    ok = True
+    with FixtureServer() as base_url:
+        backends = {'http': HttpFetcher}
+        if with_selenium:
+            backends['selenium'] = SeleniumFetcher
+            backends['auto'] = lambda: FallbackFetcher(HttpFetcher(), SeleniumFetcher())
+
+        for name, make in backends.items():
+            fetcher = make()
+            try:
+                for path, expected in FIXTURE_PAGES.items():
+                    html = fetcher.fetch(base_url + path)
+                    count = verse_count(html)
+                    # Without a browser, client-rendered pages must be *detected*, not parsed
+                    if name == 'http' and path == '/acf/sl/23':
+                        passed = not has_verse_markup(html) and count == 0
+                    else:
+                        passed = count == expected
+                    ok = ok and passed
+                    print(f"{'✓' if passed else '✗'} {name:<8} {path:<12} {count} verses")
+            finally:
+                fetcher.close()
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve chapter page fixtures locally')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--check', action='store_true', help='Run the fetchers against the fixtures and exit')
+    parser.add_argument('--selenium', action='store_true', help='Include the browser backends in --check')
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(0 if check(args.selenium) else 1)
+
+    server = FixtureServer(port=args.port)
+    print(f"Serving fixtures at {server.base_url}/acf/... (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+"""
+Content-addressed on-disk cache of raw chapter pages.
+
+Every page the scraper fetches is kept, gzip-compressed, so parser changes can
+be tried again offline instead of re-downloading 1,189 pages:
+
+    page_cache/
+        objects/3f/3f9a...e1.html.gz   # page bytes, named by their BLAKE2b hash
+        urls/8c41...07.json            # per URL: content hash, fetch time, status, fetcher, sizes
+
+Identical pages share one object. Metadata files are written atomically
+(temp file + rename), so concurrent workers and interrupted runs never leave
+a half-written entry. ``evict`` applies the retention policy: entries older
+than ``retention_days`` go first, then the oldest until the cache fits in
+``max_bytes``, then objects no URL refers to.
+
+``CachingFetcher`` stores pages as they are fetched; ``CacheOnlyFetcher``
+serves them back and ``replay`` re-runs the verse parser over a whole cached
+corpus (``selenium_main.py --from-cache``).
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+from catalog import CatalogBook
+from fetchers import FetchError, PageFetcher
+from verse_parser import parse_chapter
+
+logger = logging.getLogger(__name__)
+
+PAGE_CACHE_DIR = os.getenv('PAGE_CACHE_DIR', 'page_cache')
+PAGE_CACHE_RETENTION_DAYS = float(os.getenv('PAGE_CACHE_RETENTION_DAYS', '180'))
+PAGE_CACHE_MAX_MB = float(os.getenv('PAGE_CACHE_MAX_MB', '512'))
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class PageCache:
+    def __init__(self, root: str = PAGE_CACHE_DIR, retention_days: float = PAGE_CACHE_RETENTION_DAYS,
+                 max_bytes: int = int(PAGE_CACHE_MAX_MB * 1024 * 1024)):
+        self.root = root
+        self.retention_days = retention_days
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _object_path(self, content_hash: str) -> str:
+        return os.path.join(self.root, 'objects', content_hash[:2], f"{content_hash}.html.gz")
+
+    def _meta_path(self, url: str) -> str:
+        return os.path.join(self.root, 'urls', f"{_digest(url.encode('utf-8'))}.json")
+
+    def put(self, url: str, html: str, status: int = 200, fetcher: Optional[str] = None) -> Dict:
+        """Store a fetched page; returns its metadata"""
+        data = html.encode('utf-8')
+        content_hash = _digest(data)
+        object_path = self._object_path(content_hash)
+        if os.path.exists(object_path):
+            compressed_size = os.path.getsize(object_path)
+        else:
+            compressed = gzip.compress(data, compresslevel=6)
+            _write_atomic(object_path, compressed)
+            compressed_size = len(compressed)
+        meta = {
+            'url': url,
+            'content_hash': content_hash,
+            'fetched_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'status': status,
+            'fetcher': fetcher,
+            'size': len(data),
+            'compressed_size': compressed_size,
+        }
+        _write_atomic(self._meta_path(url), json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+        return meta
+
+    def meta(self, url: str) -> Optional[Dict]:
+        try:
+            with open(self._meta_path(url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def get(self, url: str) -> Optional[str]:
+        """Cached HTML of ``url``, or None"""
+        meta = self.meta(url)
+        if meta is not None:
+            try:
+                with gzip.open(self._object_path(meta['content_hash']), 'rb') as f:
+                    html = f.read().decode('utf-8')
+                self.hits += 1
+                return html
+            except (FileNotFoundError, OSError, EOFError):
+                logger.warning(f"Cache object missing or corrupt for {url}")
+        self.misses += 1
+        return None
+
+    def entries(self) -> Iterator[Dict]:
+        urls_dir = os.path.join(self.root, 'urls')
+        if not os.path.isdir(urls_dir):
+            return
+        for name in os.listdir(urls_dir):
+            if name.endswith('.json'):
+                try:
+                    with open(os.path.join(urls_dir, name), 'r', encoding='utf-8') as f:
+                        yield json.load(f)
+                except (OSError, json.JSONDecodeError):
+                    continue
+
+    def _objects(self) -> Dict[str, int]:
+        """content hash -> size on disk"""
+        objects = {}
+        objects_dir = os.path.join(self.root, 'objects')
+        if not os.path.isdir(objects_dir):
+            return objects
+        for dirpath, _, filenames in os.walk(objects_dir):
+            for name in filenames:
+                if name.endswith('.html.gz'):
+                    objects[name[:-len('.html.gz')]] = os.path.getsize(os.path.join(dirpath, name))
+        return objects
+
+    def stats(self) -> Dict:
+        objects = self._objects()
+        return {
+            'urls': sum(1 for _ in self.entries()),
+            'objects': len(objects),
+            'bytes': sum(objects.values()),
+        }
+
+    def evict(self) -> Dict[str, int]:
+        """Apply the retention policy; returns how many URL entries and objects were removed"""
+        removed = {'urls': 0, 'objects': 0}
+        cutoff = time.time() - self.retention_days * 86400
+        objects = self._objects()
+
+        # Newest first: older entries are dropped once the size budget is spent
+        entries = sorted(self.entries(), key=lambda meta: meta['fetched_at'], reverse=True)
+        kept, budget = set(), self.max_bytes
+        for meta in entries:
+            fetched = datetime.fromisoformat(meta['fetched_at']).timestamp()
+            size = 0 if meta['content_hash'] in kept else objects.get(meta['content_hash'], 0)
+            if fetched < cutoff or size > budget:
+                os.unlink(self._meta_path(meta['url']))
+                removed['urls'] += 1
+                continue
+            budget -= size
+            kept.add(meta['content_hash'])
+
+        for content_hash in objects.keys() - kept:
+            os.unlink(self._object_path(content_hash))
+            removed['objects'] += 1
+        if removed['urls'] or removed['objects']:
+            logger.info(f"🧹 Page cache: evicted {removed['urls']} pages and {removed['objects']} objects")
+        return removed
+
+
+class CachingFetcher(PageFetcher):
+    """Fetch with ``fetcher`` and keep a copy of every page in the cache"""
+
+    def __init__(self, fetcher: PageFetcher, cache: PageCache):
+        self.fetcher = fetcher
+        self.cache = cache
+        self.name = fetcher.name
+
+    @property
+    def fallbacks(self) -> int:
+        return getattr(self.fetcher, 'fallbacks', 0)
+
+    def fetch(self, url: str) -> str:
+        html = self.fetcher.fetch(url)
+        try:
+            self.cache.put(url, html, fetcher=self.fetcher.name)
+        except OSError as e:
+            logger.warning(f"Could not cache {url}: {e}")
+        return html
+
+    def close(self):
+        self.fetcher.close()
+
+
+class CacheOnlyFetcher(PageFetcher):
+    """Serve pages from the cache only; a miss is a fetch error"""
+
+    name = 'cache'
+
+    def __init__(self, cache: PageCache):
+        self.cache = cache
+
+    def fetch(self, url: str) -> str:
+        html = self.cache.get(url)
+        if html is None:
+            raise FetchError(f"{url} is not in the page cache")
+        return html
+
+
+def replay(cache: PageCache, books: List[CatalogBook], loader=None) -> Dict:
+    """Re-parse every cached chapter of ``books``
+
+    With a ``BulkLoader`` the parsed verses are also written to the database,
+    one transaction per book. Returns counts, timings and the chapters that are
+    missing from the cache or parse to no verses.
+    """
+    summary = {'chapters': 0, 'verses': 0, 'missing': [], 'empty': [], 'seconds': 0.0}
+    started = time.perf_counter()
+    for book in books:
+        chapters = []
+        for chapter in range(1, book.chapters + 1):
+            url = f"{book.url}/{chapter}"
+            html = cache.get(url)
+            if html is None:
+                summary['missing'].append(f"{book.name} {chapter}")
+                continue
+            verses = parse_chapter(html, logger)
+            if not verses:
+                summary['empty'].append(f"{book.name} {chapter}")
+                continue
+            chapters.append((chapter, verses))
+            summary['chapters'] += 1
+            summary['verses'] += len(verses)
+        if loader is not None and chapters:
+            loader.load_book(book.name, book.testament, book.url, chapters, book.chapters)
+    summary['seconds'] = time.perf_counter() - started
+    return summary
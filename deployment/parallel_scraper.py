@@ -0,0 +1,347 @@
+"""
+Parallel chapter scraping with a pool of browser workers.
+
+A full re-scrape is 1,189 chapter pages. Instead of walking them in series,
+``ParallelScraper`` puts every chapter on a shared work queue and starts N
+worker threads, each with its own page fetcher (see ``fetchers``: HTTP with a
+headless Chrome fallback by default):
+
+- a per-host rate limiter (``HostRateLimiter``) spaces page loads across *all*
+  workers, so adding workers never exceeds the politeness budget;
+- browsers are only started when a page needs one, and each is recycled every
+  ``recycle_after`` pages and after any failure, bounding Chrome memory;
+- parsed chapters go to a single writer thread, which bulk-loads whatever
+  chapters are waiting (``bulk_loader``: COPY + one merge) and marks their
+  jobs done in one transaction, and refreshes ``book_stats`` and the
+  chapter payloads when a book is complete.
+
+Progress lives in the ``scrape_jobs`` table (see ``scrape_jobs``): a run only
+queues chapters that are not done yet, so an interrupted scrape resumes where
+it stopped without fetching any saved chapter again.
+
+Threads are enough: the Python side only waits on the network, chromedriver
+and Postgres.
+"""
+import logging
+import queue
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+from bulk_loader import LoadStats
+from catalog import CatalogBook
+from models import DatabaseManager, Book
+from fetchers import PageFetcher, create_fetcher
+from page_cache import CachingFetcher, PageCache
+from scrape_jobs import ChapterTask, ScrapeJobQueue
+from verse_parser import parse_chapter
+
+logger = logging.getLogger(__name__)
+
+
+class ChapterResult(NamedTuple):
+    task: ChapterTask
+    verses: Optional[List[Tuple[int, str]]]  # None when the page could not be scraped
+    error: Optional[str] = None
+    duration_ms: int = 0
+
+
+class HostRateLimiter:
+    """Shared politeness budget: at most ``max_rps`` page loads per second per host"""
+
+    def __init__(self, max_rps: float, jitter: float = 0.25):
+        self.interval = 1.0 / max_rps if max_rps > 0 else 0.0
+        self.jitter = jitter
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str):
+        """Block until the next request slot for the URL's host"""
+        if not self.interval:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            # Randomize spacing a little so requests do not arrive on a fixed beat
+            self._next_slot[host] = slot + self.interval * random.uniform(1.0, 1.0 + self.jitter)
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class ChapterWorker(threading.Thread):
+    """Takes chapters off the work queue and fetches them with its own fetcher (and browser)"""
+
+    def __init__(self, worker_id: int, tasks: queue.Queue, results: queue.Queue,
+                 limiter: HostRateLimiter, fetcher: PageFetcher, jobs: ScrapeJobQueue, retries: int = 3):
+        super().__init__(name=f"worker-{worker_id}", daemon=True)
+        self.tasks = tasks
+        self.results = results
+        self.limiter = limiter
+        self.fetcher = fetcher
+        self.jobs = jobs
+        self.stats: Counter = Counter()  # per worker, summed by ParallelScraper afterwards
+        self.retries = retries
+        self.last_error: Optional[str] = None
+
+    def scrape(self, task: ChapterTask) -> Optional[List[Tuple[int, str]]]:
+        self.last_error = None
+        for attempt in range(self.retries):
+            try:
+                self.limiter.acquire(task.url)
+                self.stats['requests'] += 1
+                html = self.fetcher.fetch(task.url)
+                verses = parse_chapter(html, logger)
+                if verses:
+                    self.stats['pages_ok'] += 1
+                    return verses
+                self.last_error = "No verses found"
+                logger.warning(f"No verses found for {task.url}")
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.warning(f"✗ {self.name}: attempt {attempt + 1} failed for {task.url}: {e}")
+            self.stats['errors'] += 1
+            if attempt < self.retries - 1:
+                time.sleep((attempt + 1) * 5)
+        logger.error(f"✗ FAILED to load {task.url} after {self.retries} attempts - SKIPPING")
+        return None
+
+    def run(self):
+        try:
+            while True:
+                task = self.tasks.get()
+                if task is None:
+                    break
+                try:
+                    self.jobs.start(task, self.name)
+                    started = time.monotonic()
+                    verses = self.scrape(task)
+                    duration_ms = int((time.monotonic() - started) * 1000)
+                    self.results.put(ChapterResult(task, verses, self.last_error, duration_ms))
+                except Exception as e:
+                    # Job stays in flight and is requeued by the next run
+                    logger.error(f"❌ {self.name}: could not process {task.url}: {e}")
+                finally:
+                    self.tasks.task_done()
+        finally:
+            self.fetcher.close()
+
+
+class ChapterWriter(threading.Thread):
+    """Single verse writer: bulk-saves scraped chapters, records job outcomes and refreshes finished books"""
+
+    def __init__(self, db_manager: DatabaseManager, results: queue.Queue, chapters_per_book: Dict[int, int],
+                 batch_size: int = 20):
+        super().__init__(name="db-writer", daemon=True)
+        self.results = results
+        self.batch_size = max(1, batch_size)
+        self.book_model = Book(db_manager)
+        self.jobs = ScrapeJobQueue(db_manager)
+        self.remaining = dict(chapters_per_book)
+        self.saved: Counter = Counter()
+        self.failed: List[ChapterTask] = []
+        self.load_stats = LoadStats()
+
+    def save(self, scraped: List[ChapterResult]) -> Dict[ChapterTask, str]:
+        """Save chapters in one transaction; on failure retry them one by one. Returns save errors"""
+        errors: Dict[ChapterTask, str] = {}
+        if not scraped:
+            return errors
+        try:
+            self.load_stats.add(self.jobs.complete_many(
+                [(result.task, result.verses, result.duration_ms) for result in scraped]
+            ))
+            return errors
+        except Exception as e:
+            if len(scraped) == 1:
+                errors[scraped[0].task] = f"Save failed: {e}"
+                return errors
+            logger.warning(f"Batch save of {len(scraped)} chapters failed ({e}), saving one by one")
+        for result in scraped:
+            errors.update(self.save([result]))
+        return errors
+
+    def write(self, batch: List[ChapterResult]):
+        errors = self.save([result for result in batch if result.verses is not None])
+        for result in batch:
+            task = result.task
+            error = errors.get(task)
+            if result.verses is None:
+                error = result.error or "Page could not be scraped"
+            if error is None:
+                self.saved[task.book_id] += 1
+                logger.info(f"💾 {task.book_name} {task.chapter_number}: {len(result.verses)} verses processed")
+            else:
+                logger.error(f"❌ {task.book_name} {task.chapter_number}: {error}")
+                self.failed.append(task)
+                try:
+                    self.jobs.fail(task, error, result.duration_ms)
+                except Exception as e:
+                    logger.error(f"❌ Could not record failure of {task.book_name} {task.chapter_number}: {e}")
+
+            self.remaining[task.book_id] -= 1
+            if self.remaining[task.book_id] == 0:
+                logger.info(f"📖 Completed {task.book_name}: {self.saved[task.book_id]} chapters saved")
+                try:
+                    self.book_model.refresh_stats(task.book_id)
+                    self.book_model.refresh_chapter_payloads(task.book_id)
+                except Exception as e:
+                    logger.warning(f"Could not refresh statistics for {task.book_name}: {e}")
+
+    def run(self):
+        done = False
+        while not done:
+            result = self.results.get()
+            if result is None:
+                break
+            # Take whatever else is already waiting, up to batch_size, into the same transaction
+            batch = [result]
+            while len(batch) < self.batch_size:
+                try:
+                    result = self.results.get_nowait()
+                except queue.Empty:
+                    break
+                if result is None:
+                    done = True
+                    break
+                batch.append(result)
+            self.write(batch)
+
+
+class ParallelScraper:
+    """Scrape books with ``workers`` browsers sharing one work queue"""
+
+    def __init__(self, workers: int = 4, max_rps: float = 2.0, recycle_after: int = 200, retries: int = 3,
+                 fetch_mode: str = 'auto', page_cache: Optional[PageCache] = None):
+        self.workers = max(1, workers)
+        self.fetch_mode = fetch_mode
+        self.page_cache = page_cache
+        self.limiter = HostRateLimiter(max_rps)
+        self.recycle_after = recycle_after
+        self.retries = retries
+        self.stats: Counter = Counter()
+        self.start_time = datetime.now()
+        self.failed: List[ChapterTask] = []
+        self.load_stats = LoadStats()
+
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(threadName)s - %(levelname)s - %(message)s',
+            handlers=[
+                logging.FileHandler('selenium_scraping.log'),
+                logging.StreamHandler()
+            ]
+        )
+
+        self.db_manager = DatabaseManager()
+        self.book_model = Book(self.db_manager)
+        self.jobs = ScrapeJobQueue(self.db_manager)
+
+    def plan(self, books: List[CatalogBook], retry_failed: bool = False, fresh: bool = False) -> List[ChapterTask]:
+        """Register the books, queue a job per chapter and return the chapters still to scrape
+
+        ``retry_failed`` limits the run to failed jobs; ``fresh`` re-scrapes
+        chapters that are already done.
+        """
+        book_ids, tasks = [], []
+        for book in books:
+            book_id = self.book_model.insert(book.name, book.testament, book.url, book.chapters, book.order)
+            book_ids.append(book_id)
+            tasks.extend(
+                ChapterTask(book_id, book.name, book.url, chapter)
+                for chapter in range(1, book.chapters + 1)
+            )
+        self.jobs.enqueue(tasks)
+        self.jobs.requeue_interrupted()
+        if fresh:
+            self.jobs.reset(book_ids)
+
+        pending = self.jobs.pending(book_ids, failed_only=retry_failed)
+        skipped = len(tasks) - len(pending)
+        if skipped:
+            logger.info(f"⏭️ Skipping {skipped} chapters already done{' or not failed' if retry_failed else ''}")
+        return pending
+
+    def create_fetcher(self) -> PageFetcher:
+        fetcher = create_fetcher(self.fetch_mode, self.recycle_after)
+        if self.page_cache is not None:
+            fetcher = CachingFetcher(fetcher, self.page_cache)
+        return fetcher
+
+    def run(self, tasks: List[ChapterTask]) -> Tuple[int, int]:
+        """Scrape ``tasks``; returns (chapters saved, chapters attempted)"""
+        task_queue: queue.Queue = queue.Queue()
+        results: queue.Queue = queue.Queue()
+        for task in tasks:
+            task_queue.put(task)
+
+        writer = ChapterWriter(self.db_manager, results, Counter(task.book_id for task in tasks))
+        workers = [
+            ChapterWorker(i + 1, task_queue, results, self.limiter,
+                          self.create_fetcher(), self.jobs, self.retries)
+            for i in range(min(self.workers, len(tasks)))
+        ]
+        for _ in workers:
+            task_queue.put(None)
+
+        logger.info(f"🚀 Scraping {len(tasks)} chapters with {len(workers)} workers ({self.fetch_mode} fetcher)")
+        writer.start()
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                while worker.is_alive():
+                    worker.join(timeout=1)
+        finally:
+            results.put(None)
+            writer.join()
+
+        for worker in workers:
+            self.stats.update(worker.stats)
+            self.stats['browser_fallbacks'] += getattr(worker.fetcher, 'fallbacks', 0)
+        self.failed = writer.failed
+        self.load_stats = writer.load_stats
+        if self.page_cache is not None:
+            self.page_cache.evict()
+        saved = sum(writer.saved.values())
+        logger.info(f"Scraping completed: {saved}/{len(tasks)} chapters saved")
+        return saved, len(tasks)
+
+    def scrape_books(self, books: List[CatalogBook], retry_failed: bool = False, fresh: bool = False) -> Tuple[int, int]:
+        """Scrape catalog books; returns (complete, total) books"""
+        tasks = self.plan(books, retry_failed=retry_failed, fresh=fresh)
+        if tasks:
+            self.run(tasks)
+        else:
+            logger.info("✅ Nothing to scrape: every chapter is already done")
+        failed_books = {task.book_id for task in self.failed}
+        return len(books) - len(failed_books), len(books)
+
+    def get_performance_summary(self) -> str:
+        requests = self.stats['requests']
+        if requests == 0:
+            return "No requests made yet"
+
+        elapsed_time = (datetime.now() - self.start_time).total_seconds()
+        pages_per_minute = (self.stats['pages_ok'] / elapsed_time) * 60 if elapsed_time > 0 else 0
+        failed = ', '.join(f"{task.book_name} {task.chapter_number}" for task in self.failed) or 'none'
+
+        return f"""
+=== Parallel Scraping Performance ===
+Workers: {self.workers} ({self.fetch_mode} fetcher)
+Total Pages: {requests}
+Success Rate: {self.stats['pages_ok'] / requests * 100:.1f}%
+Error Rate: {self.stats['errors'] / requests * 100:.1f}%
+Browser Fallbacks: {self.stats['browser_fallbacks']}
+Pages per Minute: {pages_per_minute:.1f}
+Total Time: {elapsed_time/60:.1f} minutes
+Database Load: {self.load_stats}
+Failed Chapters: {failed}
+"""
+
+    def close(self):
+        self.db_manager.close()
@@ -0,0 +1,167 @@
+"""
+Durable scrape job queue, one row per (book, chapter) in ``scrape_jobs``.
+
+States: ``pending`` -> ``in_flight`` -> ``done`` | ``failed``. A chapter's
+verses (bulk-loaded with ``bulk_loader``) and its ``done`` mark are written in
+the same transaction, so after a
+crash a chapter is either saved and done (never fetched again) or still
+pending/in flight (fetched again, nothing was saved). ``requeue_interrupted``
+puts the in-flight jobs of a dead run back to pending on the next start.
+
+This replaces recovering failed chapters by grepping the scraper log:
+``selenium_main.py --retry-failed`` re-runs the ``failed`` jobs.
+"""
+import logging
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from psycopg2.extras import execute_values
+
+from bulk_loader import ChapterRows, LoadStats, load_chapters
+from models import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+JOB_STATES = ('pending', 'in_flight', 'done', 'failed')
+
+
+class ChapterTask(NamedTuple):
+    book_id: int
+    book_name: str
+    book_url: str
+    chapter_number: int
+
+    @property
+    def url(self) -> str:
+        return f"{self.book_url}/{self.chapter_number}"
+
+
+class ScrapeJobQueue:
+    def __init__(self, db_manager: DatabaseManager):
+        self.db = db_manager
+
+    def enqueue(self, tasks: Iterable[ChapterTask]) -> int:
+        """Add jobs for new chapters; existing jobs keep their state"""
+        rows = [(task.book_id, task.chapter_number, task.url) for task in tasks]
+        if not rows:
+            return 0
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.executemany("""
+                INSERT INTO scrape_jobs (book_id, chapter_number, url)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (book_id, chapter_number) DO NOTHING
+                """, rows)
+                conn.commit()
+        return len(rows)
+
+    def reset(self, book_ids: Iterable[int]) -> int:
+        """Put every job of these books back to pending (fresh re-scrape)"""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                UPDATE scrape_jobs
+                SET state = 'pending', attempts = 0, last_error = NULL, worker = NULL,
+                    started_at = NULL, finished_at = NULL, duration_ms = NULL
+                WHERE book_id = ANY(%s)
+                """, (list(book_ids),))
+                conn.commit()
+                return cursor.rowcount
+
+    def requeue_interrupted(self) -> int:
+        """Jobs left in flight by a crashed or killed run go back to pending"""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("UPDATE scrape_jobs SET state = 'pending', worker = NULL WHERE state = 'in_flight'")
+                conn.commit()
+                if cursor.rowcount:
+                    logger.info(f"↩️ Requeued {cursor.rowcount} chapters interrupted in a previous run")
+                return cursor.rowcount
+
+    def pending(self, book_ids: Optional[Iterable[int]] = None, failed_only: bool = False) -> List[ChapterTask]:
+        """Jobs still to scrape (or only the failed ones), in biblical order"""
+        states = ['failed'] if failed_only else ['pending', 'failed']
+        query = """
+        SELECT j.book_id, b.name, b.url, j.chapter_number
+        FROM scrape_jobs j
+        JOIN books b ON b.id = j.book_id
+        WHERE j.state = ANY(%s)
+        """
+        params: list = [states]
+        if book_ids is not None:
+            query += " AND j.book_id = ANY(%s)"
+            params.append(list(book_ids))
+        query += " ORDER BY b.biblical_order NULLS LAST, b.id, j.chapter_number"
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(query, params)
+                return [ChapterTask(*row) for row in cursor.fetchall()]
+
+    def start(self, task: ChapterTask, worker: str):
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                UPDATE scrape_jobs
+                SET state = 'in_flight', worker = %s, attempts = attempts + 1,
+                    started_at = CURRENT_TIMESTAMP, finished_at = NULL
+                WHERE book_id = %s AND chapter_number = %s
+                """, (worker, task.book_id, task.chapter_number))
+                conn.commit()
+
+    def complete(self, task: ChapterTask, verses: List[Tuple[int, str]], duration_ms: int) -> LoadStats:
+        """Save the chapter and its verses and mark the job done, atomically"""
+        return self.complete_many([(task, verses, duration_ms)])
+
+    def complete_many(self, scraped: List[Tuple[ChapterTask, List[Tuple[int, str]], int]]) -> LoadStats:
+        """Bulk-load a batch of (task, verses, duration_ms) and mark their jobs done in one transaction"""
+        by_book: Dict[int, List[ChapterRows]] = {}
+        for task, verses, _ in scraped:
+            by_book.setdefault(task.book_id, []).append((task.chapter_number, verses))
+
+        stats = LoadStats()
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                for book_id, chapters in by_book.items():
+                    stats.add(load_chapters(cursor, book_id, chapters))
+                execute_values(cursor, """
+                UPDATE scrape_jobs j
+                SET state = 'done', last_error = NULL, verses_saved = v.verses_saved,
+                    finished_at = CURRENT_TIMESTAMP, duration_ms = v.duration_ms
+                FROM (VALUES %s) AS v(book_id, chapter_number, verses_saved, duration_ms)
+                WHERE j.book_id = v.book_id AND j.chapter_number = v.chapter_number
+                """, [(task.book_id, task.chapter_number, len(verses), duration_ms)
+                      for task, verses, duration_ms in scraped])
+            conn.commit()
+        return stats
+
+    def fail(self, task: ChapterTask, error: str, duration_ms: int):
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                UPDATE scrape_jobs
+                SET state = 'failed', last_error = %s, finished_at = CURRENT_TIMESTAMP, duration_ms = %s
+                WHERE book_id = %s AND chapter_number = %s
+                """, (error[:2000], duration_ms, task.book_id, task.chapter_number))
+                conn.commit()
+
+    def summary(self) -> Dict[str, int]:
+        """Job count per state"""
+        counts = dict.fromkeys(JOB_STATES, 0)
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT state, COUNT(*) FROM scrape_jobs GROUP BY state")
+                counts.update(dict(cursor.fetchall()))
+        return counts
+
+    def failures(self, limit: int = 50) -> List[Tuple[str, int, int, Optional[str]]]:
+        """(book name, chapter, attempts, last error) of failed jobs"""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                SELECT b.name, j.chapter_number, j.attempts, j.last_error
+                FROM scrape_jobs j
+                JOIN books b ON b.id = j.book_id
+                WHERE j.state = 'failed'
+                ORDER BY b.biblical_order NULLS LAST, b.id, j.chapter_number
+                LIMIT %s
+                """, (limit,))
+                return cursor.fetchall()
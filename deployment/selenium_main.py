@@ -1,13 +1,22 @@
 #!/usr/bin/env python3
 """
 Bible Scraper with Selenium - Main execution script
+
+Progress is tracked per chapter in the scrape_jobs table: re-running the same
+command resumes an interrupted scrape, --retry-failed re-scrapes only the
+chapters that failed and --status shows the queue.
+
+Fetched pages are kept in a compressed on-disk cache (page_cache.py);
+--from-cache re-parses them offline, e.g. after a parser change.
 """
 
 import argparse
 import sys
-import logging
-from selenium_scraper import SeleniumBibleScraper
+from catalog import get_catalog
+from parallel_scraper import ParallelScraper
+from fetchers import FETCH_MODES
 from models import DatabaseManager
+from page_cache import PAGE_CACHE_DIR, PageCache, replay
 
 def setup_database():
     """Initialize database with schema"""
@@ -46,6 +55,100 @@ def setup_database():
         print(f"Error initializing database: {e}")
         return False
 
+def select_books(args):
+    """Catalog books for --testament / --book; exits when --book matches no single book"""
+    catalog = get_catalog()
+    if not args.book:
+        return catalog.testament(args.testament)
+
+    matching_books = catalog.find(args.book)
+    if not matching_books:
+        print(f"No books found matching '{args.book}'")
+        sys.exit(1)
+
+    if len(matching_books) > 1:
+        print(f"Multiple books found matching '{args.book}':")
+        for book in matching_books:
+            print(f"  - {book.name}")
+        print("Please be more specific.")
+        sys.exit(1)
+
+    return matching_books
+
+def print_job_status(scraper):
+    """Job counts per state and the failed chapters with their last error"""
+    counts = scraper.jobs.summary()
+    print("=== Scrape Jobs ===")
+    print(", ".join(f"{state}: {count}" for state, count in counts.items()))
+    failures = scraper.jobs.failures()
+    if failures:
+        print("\nFailed chapters:")
+        for book_name, chapter, attempts, error in failures:
+            print(f"  - {book_name} {chapter} ({attempts} attempts): {error}")
+        print("\nRun with --retry-failed to scrape them again.")
+
+def run_scraper(args):
+    """Scrape the selected books through the scrape_jobs queue (resumes interrupted runs)"""
+    scraper = None
+    try:
+        scraper = ParallelScraper(workers=args.workers, max_rps=args.max_rps,
+                                  recycle_after=args.recycle_after, fetch_mode=args.fetcher,
+                                  page_cache=None if args.no_cache else PageCache(args.cache_dir))
+        if args.status:
+            print_job_status(scraper)
+            return
+
+        books = select_books(args)
+
+        mode = "retrying failed chapters" if args.retry_failed else "fresh" if args.fresh else "resuming"
+        print(f"Starting Bible scraping: {len(books)} books, {args.workers} workers ({mode})")
+        print(f"Politeness budget: {args.max_rps} pages/second")
+
+        successful, total = scraper.scrape_books(books, retry_failed=args.retry_failed, fresh=args.fresh)
+
+        print(f"\n=== Scraping Completed ===")
+        print(f"Completely scraped: {successful}/{total} books")
+        print(scraper.get_performance_summary())
+        print_job_status(scraper)
+
+    except KeyboardInterrupt:
+        print("\nScraping interrupted by user; run again to resume")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error during scraping: {e}")
+        sys.exit(1)
+    finally:
+        if scraper:
+            scraper.close()
+
+def run_from_cache(args):
+    """Re-parse the cached chapter pages offline (and optionally save the verses)"""
+    from bulk_loader import BulkLoader
+
+    cache = PageCache(args.cache_dir)
+    books = select_books(args)
+
+    db_manager = DatabaseManager() if args.save else None
+    try:
+        loader = BulkLoader(db_manager) if db_manager else None
+        summary = replay(cache, books, loader)
+        if loader:
+            loader.book_model.refresh_stats()
+            loader.book_model.refresh_chapter_payloads()
+    finally:
+        if db_manager:
+            db_manager.close()
+
+    print(f"=== Replayed {len(books)} books from {args.cache_dir} ===")
+    print(f"Parsed: {summary['chapters']} chapters, {summary['verses']} verses in {summary['seconds']:.1f}s")
+    if loader:
+        print(f"Saved: {loader.stats}")
+    for label in ('missing', 'empty'):
+        chapters = summary[label]
+        if chapters:
+            shown = ', '.join(chapters[:20]) + (f" (+{len(chapters) - 20} more)" if len(chapters) > 20 else '')
+            print(f"{label.capitalize()}: {len(chapters)} chapters - {shown}")
+
 def main():
     parser = argparse.ArgumentParser(description='Bible Scraper with Selenium')
     parser.add_argument('--testament', choices=['old_testament', 'new_testament'],
@@ -53,9 +156,31 @@ def main():
     parser.add_argument('--init-db', action='store_true',
                        help='Initialize database schema')
     parser.add_argument('--book', type=str,
-                       help='Scrape specific book only (partial name matching)')
-    parser.add_argument('--delay', type=float, nargs=2, default=[0.3, 1.0],
-                       help='Delay range between requests (min max in seconds)')
+                       help='Scrape specific book only (name, URL code or partial name)')
+    parser.add_argument('--fetcher', choices=FETCH_MODES, default='auto',
+                       help='Page fetcher: auto (HTTP, browser only when needed), http or selenium')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of parallel browser workers')
+    parser.add_argument('--max-rps', type=float, default=2.0,
+                       help='Politeness budget: max page loads per second to the source host (all workers)')
+    parser.add_argument('--recycle-after', type=int, default=200,
+                       help='Restart each worker browser after this many pages')
+    parser.add_argument('--retry-failed', action='store_true',
+                       help='Only scrape chapters whose job failed in a previous run')
+    parser.add_argument('--fresh', action='store_true',
+                       help='Scrape every selected chapter again, including those already done')
+    parser.add_argument('--status', action='store_true',
+                       help='Show the scrape job queue and exit')
+    parser.add_argument('--cache-dir', default=PAGE_CACHE_DIR,
+                       help='Raw page cache directory (env PAGE_CACHE_DIR)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Do not keep a copy of fetched pages')
+    parser.add_argument('--from-cache', action='store_true',
+                       help='Re-parse cached pages offline instead of fetching (add --save to write the verses)')
+    parser.add_argument('--save', action='store_true',
+                       help='With --from-cache: save the re-parsed verses to the database')
+    parser.add_argument('--evict-cache', action='store_true',
+                       help='Apply the page cache retention policy and exit')
 
     args = parser.parse_args()
 
@@ -68,70 +193,20 @@ def main():
             sys.exit(1)
         return
 
-    # Initialize scraper
-    scraper = None
-    try:
-        scraper = SeleniumBibleScraper(delay_range=tuple(args.delay))
-
-        # Scrape specific book
-        if args.book:
-            try:
-                bible_data = scraper.load_bible_data()
-                all_books = bible_data['old_testament'] + bible_data['new_testament']
-
-                # Find book by partial name match
-                matching_books = [book for book in all_books
-                                if args.book.lower() in book['book'].lower()]
-
-                if not matching_books:
-                    print(f"No books found matching '{args.book}'")
-                    sys.exit(1)
-
-                if len(matching_books) > 1:
-                    print(f"Multiple books found matching '{args.book}':")
-                    for book in matching_books:
-                        print(f"  - {book['book']}")
-                    print("Please be more specific.")
-                    sys.exit(1)
-
-                book_to_scrape = matching_books[0]
-                print(f"Scraping book with Selenium: {book_to_scrape['book']}")
-
-                success = scraper.scrape_book(book_to_scrape)
-                if success:
-                    print(f"Successfully scraped {book_to_scrape['book']}")
-                else:
-                    print(f"Failed to completely scrape {book_to_scrape['book']}")
-
-                print(scraper.get_performance_summary())
-
-            except Exception as e:
-                print(f"Error scraping book: {e}")
-                sys.exit(1)
-            return
-
-        # Full scraping
-        try:
-            print("Starting Bible scraping with Selenium...")
-            print(f"Testament filter: {args.testament or 'All'}")
-            print(f"Delay range: {args.delay[0]}-{args.delay[1]} seconds")
+    if args.retry_failed and args.fresh:
+        parser.error("--retry-failed and --fresh cannot be combined")
 
-            successful, total = scraper.scrape_all_books(args.testament)
-
-            print(f"\n=== Scraping Completed ===")
-            print(f"Successfully scraped: {successful}/{total} books")
-            print(scraper.get_performance_summary())
+    if args.evict_cache:
+        cache = PageCache(args.cache_dir)
+        removed = cache.evict()
+        print(f"Evicted {removed['urls']} pages and {removed['objects']} objects; cache now: {cache.stats()}")
+        return
 
-        except KeyboardInterrupt:
-            print("\nScraping interrupted by user")
-            sys.exit(1)
-        except Exception as e:
-            print(f"Error during scraping: {e}")
-            sys.exit(1)
+    if args.from_cache:
+        run_from_cache(args)
+        return
 
-    finally:
-        if scraper:
-            scraper.close()
+    run_scraper(args)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
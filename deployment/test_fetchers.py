@@ -0,0 +1,64 @@
+"""Page fetchers against the local fixture server (the browser backend is replaced by a stand-in)"""
+import pytest
+
+from fetchers import FallbackFetcher, FetchError, HttpFetcher, PageFetcher, has_verse_markup
+from fixture_server import FIXTURE_PAGES, FixtureServer, check, verse_count
+
+
+class RenderedPages(PageFetcher):
+    """Stand-in for the browser: serves the server-rendered Gênesis 1 page for every URL"""
+
+    name = 'rendered'
+
+    def __init__(self, base_url: str):
+        self.http = HttpFetcher()
+        self.base_url = base_url
+        self.urls = []
+
+    def fetch(self, url: str) -> str:
+        self.urls.append(url)
+        return self.http.fetch(self.base_url + '/acf/gn/1')
+
+    def close(self):
+        self.http.close()
+
+
+@pytest.fixture(scope='module')
+def base_url():
+    with FixtureServer() as url:
+        yield url
+
+
+def test_http_fetcher(base_url):
+    fetcher = HttpFetcher()
+    try:
+        html = fetcher.fetch(base_url + '/acf/gn/1')
+        assert has_verse_markup(html) and verse_count(html) == FIXTURE_PAGES['/acf/gn/1']
+        # Client-rendered page: no verse markup without a browser
+        html = fetcher.fetch(base_url + '/acf/sl/23')
+        assert not has_verse_markup(html) and verse_count(html) == 0
+        with pytest.raises(FetchError):
+            fetcher.fetch(base_url + '/acf/xx/1')
+    finally:
+        fetcher.close()
+
+
+@pytest.mark.parametrize('path,falls_back', [
+    ('/acf/gn/1', False),   # verses in the HTML: HTTP is enough
+    ('/acf/sl/23', True),   # verses rendered by JavaScript
+    ('/acf/xx/1', True),    # HTTP error
+])
+def test_auto_fetcher(base_url, path, falls_back):
+    browser = RenderedPages(base_url)
+    fetcher = FallbackFetcher(HttpFetcher(), browser)
+    try:
+        html = fetcher.fetch(base_url + path)
+        assert verse_count(html) == FIXTURE_PAGES['/acf/gn/1']
+        assert fetcher.fallbacks == int(falls_back)
+        assert browser.urls == ([base_url + path] if falls_back else [])
+    finally:
+        fetcher.close()
+
+
+def test_check_without_browser():
+    assert check(with_selenium=False)
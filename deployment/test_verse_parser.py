@@ -0,0 +1,39 @@
+"""Verse parser backends: bs4/lxml parity and golden output on the fixture pages"""
+import json
+import logging
+import os
+
+import pytest
+
+from verse_parser import (FIXTURES_DIR, _golden_path, parse_chapter, parse_verses_bs4, parse_verses_lxml,
+                          sample_pages)
+
+PAGES = list(sample_pages())
+QUIET = logging.getLogger('verse_parser.test')
+QUIET.disabled = True
+
+
+def test_fixture_pages_exist():
+    assert PAGES
+
+
+@pytest.mark.parametrize('label,html', PAGES, ids=[label for label, _ in PAGES])
+def test_lxml_matches_bs4(label, html):
+    assert parse_verses_lxml(html, QUIET) == parse_verses_bs4(html, QUIET)
+
+
+@pytest.mark.parametrize('label,html', PAGES, ids=[label for label, _ in PAGES])
+def test_golden_output(label, html):
+    golden = _golden_path(os.path.join(FIXTURES_DIR, label))
+    if not os.path.exists(golden):
+        pytest.skip(f"no golden file for {label}")
+    with open(golden, 'r', encoding='utf-8') as f:
+        expected = [tuple(pair) for pair in json.load(f)]
+    assert parse_verses_bs4(html, QUIET) == expected
+    assert parse_chapter(html, QUIET, 'lxml') == expected
+
+
+@pytest.mark.parametrize('backend', ['bs4', 'lxml'])
+def test_page_without_main(backend):
+    assert parse_chapter('<html><body><p data-v="1"><span class="v">1</span></p></body></html>',
+                         QUIET, backend) == []
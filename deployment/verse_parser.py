@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Verse extraction backends for chapter pages.
+
+- ``bs4``: the reference implementation, ``parse_verses_soup`` over a
+  BeautifulSoup tree;
+- ``lxml``: the same extraction on a bare lxml tree with a precompiled XPath.
+  It skips building a BeautifulSoup tree and calling ``find``/``find_all`` for
+  every verse, and is several times faster.
+
+Both must return byte-identical ``(verse_number, text)`` lists. ``lxml``
+mirrors the BeautifulSoup semantics it replaces:
+- the first ``<main>`` only;
+- ``p`` elements carrying a ``data-v`` attribute;
+- the first descendant ``span`` with the ``v``/``t`` class;
+- ``get_text(strip=True)``: every text node stripped, blanks dropped, joined
+  with no separator, and ``<script>``/``<style>`` content and comments left
+  out.
+
+Usage:
+    python verse_parser.py --check                  # golden files + bs4/lxml parity on fixtures and cached pages
+    python verse_parser.py --bench                  # parse timing per backend over the same pages
+    python verse_parser.py --write-golden           # (re)generate fixtures/**/*.verses.json from bs4
+
+The same checks run as tests in test_verse_parser.py (``pytest deployment``).
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import re
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+VERSE_PARSER = os.getenv('VERSE_PARSER', 'lxml')
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+VERSE_PARAGRAPHS = etree.XPath('(//main)[1]//p[@data-v]')
+NON_DIGIT_RE = re.compile(r'\D')
+HIDDEN_TEXT_TAGS = {'script', 'style'}
+
+Verses = List[Tuple[int, str]]
+
+
+def _strings(element) -> Iterator[str]:
+    """Text nodes under ``element`` in document order, as BeautifulSoup's get_text sees them"""
+    if element.text and element.tag not in HIDDEN_TEXT_TAGS:
+        yield element.text
+    for child in element:
+        # Comments and processing instructions have a non-string tag; only their tail is text
+        if isinstance(child.tag, str):
+            yield from _strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def _text(element) -> str:
+    return ''.join(filter(None, (string.strip() for string in _strings(element))))
+
+
+def _first_span(paragraph, css_class: str):
+    for span in paragraph.iter('span'):
+        if css_class in (span.get('class') or '').split():
+            return span
+    return None
+
+
+def parse_verses_soup(soup: BeautifulSoup, log: logging.Logger = logger) -> Verses:
+    """Extract (verse number, text) pairs from a parsed chapter page"""
+    verses = []
+
+    # Find the main content area
+    main_content = soup.find('main')
+    if not main_content:
+        log.warning("No main content found")
+        return verses
+
+    # Find all verse paragraphs
+    verse_paragraphs = main_content.find_all('p', {'data-v': True})
+
+    for p in verse_paragraphs:
+        try:
+            # Extract verse number
+            verse_span = p.find('span', class_='v')
+            if not verse_span:
+                continue
+
+            verse_number_text = verse_span.get_text(strip=True)
+            verse_number = int(NON_DIGIT_RE.sub('', verse_number_text))
+
+            # Extract verse text
+            text_span = p.find('span', class_='t')
+            if not text_span:
+                continue
+
+            verse_text = text_span.get_text(strip=True)
+
+            if verse_text:
+                verses.append((verse_number, verse_text))
+
+        except (ValueError, AttributeError) as e:
+            log.warning(f"Error parsing verse: {e}")
+            continue
+
+    # Sort verses by number to ensure correct order
+    verses.sort(key=lambda x: x[0])
+    return verses
+
+
+def parse_verses_lxml(html: str, log: logging.Logger = logger) -> Verses:
+    """Extract (verse number, text) pairs from a chapter page with lxml"""
+    if not html:
+        log.warning("No main content found")
+        return []
+    # Parse bytes: lxml rejects str input that carries an encoding declaration
+    root = etree.fromstring(html.encode('utf-8'), etree.HTMLParser(encoding='utf-8'))
+    if root is None or next(root.iter('main'), None) is None:
+        log.warning("No main content found")
+        return []
+
+    verses = []
+    for paragraph in VERSE_PARAGRAPHS(root):
+        try:
+            verse_span = _first_span(paragraph, 'v')
+            if verse_span is None:
+                continue
+            verse_number = int(NON_DIGIT_RE.sub('', _text(verse_span)))
+
+            text_span = _first_span(paragraph, 't')
+            if text_span is None:
+                continue
+
+            verse_text = _text(text_span)
+            if verse_text:
+                verses.append((verse_number, verse_text))
+        except ValueError as e:
+            log.warning(f"Error parsing verse: {e}")
+            continue
+
+    verses.sort(key=lambda x: x[0])
+    return verses
+
+
+def parse_verses_bs4(html: str, log: logging.Logger = logger) -> Verses:
+    return parse_verses_soup(BeautifulSoup(html, 'lxml'), log)
+
+
+PARSERS: Dict[str, Callable[[str, logging.Logger], Verses]] = {
+    'lxml': parse_verses_lxml,
+    'bs4': parse_verses_bs4,
+}
+
+
+def parse_chapter(html: str, log: logging.Logger = logger, backend: str = VERSE_PARSER) -> Verses:
+    """Verses of a chapter page with the configured backend (env VERSE_PARSER)"""
+    return PARSERS[backend](html, log)
+
+
+def _golden_path(page_path: str) -> str:
+    return os.path.splitext(page_path)[0] + '.verses.json'
+
+
+def sample_pages(cache_dir: str = None) -> Iterator[Tuple[str, str]]:
+    """(label, html) of every fixture page and, when given, every cached page"""
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '**', '*.html'), recursive=True)):
+        with open(path, 'r', encoding='utf-8') as f:
+            yield os.path.relpath(path, FIXTURES_DIR), f.read()
+    if cache_dir:
+        from page_cache import PageCache
+        cache = PageCache(cache_dir)
+        for meta in cache.entries():
+            html = cache.get(meta['url'])
+            if html is not None:
+                yield meta['url'], html
+
+
+def check(cache_dir: str = None) -> bool:
+    """Compare the backends with each other and with the golden files"""
+    quiet = logging.getLogger('verse_parser.check')
+    quiet.disabled = True
+    ok, pages = True, 0
+    for label, html in sample_pages(cache_dir):
+        pages += 1
+        expected = parse_verses_bs4(html, quiet)
+        actual = parse_verses_lxml(html, quiet)
+        if actual != expected:
+            ok = False
+            diff = next((i for i, pair in enumerate(zip(expected, actual)) if pair[0] != pair[1]),
+                        min(len(expected), len(actual)))
+            print(f"✗ {label}: lxml differs from bs4 at verse index {diff} "
+                  f"({len(actual)} vs {len(expected)} verses)")
+        if not label.startswith(('http://', 'https://')):
+            golden = _golden_path(os.path.join(FIXTURES_DIR, label))
+            if os.path.exists(golden):
+                with open(golden, 'r', encoding='utf-8') as f:
+                    if [tuple(pair) for pair in json.load(f)] != expected:
+                        ok = False
+                        print(f"✗ {label}: output differs from {os.path.relpath(golden, FIXTURES_DIR)}")
+    print(f"{'✓' if ok else '✗'} {pages} pages checked")
+    return ok
+
+
+def write_golden():
+    """Record the reference (bs4) output of every fixture page"""
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '**', '*.html'), recursive=True)):
+        with open(path, 'r', encoding='utf-8') as f:
+            verses = parse_verses_bs4(f.read())
+        with open(_golden_path(path), 'w', encoding='utf-8') as f:
+            json.dump(verses, f, ensure_ascii=False, indent=1)
+            f.write('\n')
+        print(f"{os.path.relpath(path, FIXTURES_DIR)}: {len(verses)} verses")
+
+
+def bench(cache_dir: str = None, rounds: int = 20):
+    """Parse the same pages with each backend and report pages/second"""
+    pages = [html for _, html in sample_pages(cache_dir)]
+    quiet = logging.getLogger('verse_parser.bench')
+    quiet.disabled = True
+    print(f"{len(pages)} pages x {rounds} rounds")
+    timings = {}
+    for name, parse in PARSERS.items():
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for html in pages:
+                parse(html, quiet)
+        timings[name] = time.perf_counter() - start
+        print(f"{name:<5} {timings[name]:.3f}s  {len(pages) * rounds / timings[name]:,.0f} pages/s")
+    print(f"lxml speedup: {timings['bs4'] / timings['lxml']:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verse parser backends: parity check and benchmark')
+    parser.add_argument('--check', action='store_true', help='Check golden files and bs4/lxml parity')
+    parser.add_argument('--bench', action='store_true', help='Benchmark the backends')
+    parser.add_argument('--write-golden', action='store_true', help='Regenerate the fixture golden files')
+    parser.add_argument('--cache-dir', help='Also use every page in this page cache')
+    parser.add_argument('--rounds', type=int, default=20, help='Benchmark rounds over the page set')
+    args = parser.parse_args()
+
+    if args.write_golden:
+        write_golden()
+    if args.bench:
+        bench(args.cache_dir, args.rounds)
+    if args.check or not (args.bench or args.write_golden):
+        sys.exit(0 if check(args.cache_dir) else 1)
+
+
+if __name__ == '__main__':
+    main()
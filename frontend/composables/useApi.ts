@@ -1,4 +1,4 @@
-import type { Book, Chapter, Verse, SearchResult, Stats } from '~/types'
+import type { Book, Chapter, ChapterPayload, Verse, PassageResult, SearchResult, Stats } from '~/types'
 
 export const useApi = () => {
   const config = useRuntimeConfig()
@@ -14,8 +14,21 @@ export const useApi = () => {
   }
 
   // Chapters API
+  const getChapter = async (chapterId: number): Promise<ChapterPayload> => {
+    return await $fetch<ChapterPayload>(`${baseURL}/chapters/${chapterId}/verses`)
+  }
+
+  // The same payload expanded back to verse rows carrying their chapter/book context
   const getChapterVerses = async (chapterId: number): Promise<Verse[]> => {
-    return await $fetch<Verse[]>(`${baseURL}/chapters/${chapterId}/verses`)
+    const chapter = await getChapter(chapterId)
+    return chapter.verses.map(verse => ({
+      ...verse,
+      chapter_id: chapter.id,
+      chapter_number: chapter.chapter_number,
+      book_name: chapter.book_name,
+      testament: chapter.testament,
+      book_id: chapter.book_id
+    }))
   }
 
   // Verses API
@@ -27,15 +40,46 @@ export const useApi = () => {
     return await $fetch<Verse>(`${baseURL}/verses/random`)
   }
 
+  const getDailyVerse = async (): Promise<Verse> => {
+    return await $fetch<Verse>(`${baseURL}/verses/daily`)
+  }
+
   const getVerseByReference = async (book: string, chapter: number, verse: number): Promise<Verse> => {
     return await $fetch<Verse>(`${baseURL}/verse/${book}/${chapter}/${verse}`)
   }
 
+  // Passages API: ranges and reference lists in a single request
+  const getPassage = async (ref: string): Promise<PassageResult> => {
+    return await $fetch<PassageResult>(`${baseURL}/passage`, {
+      query: { ref }
+    })
+  }
+
+  const getVersesBatch = async (references: string[]): Promise<PassageResult> => {
+    return await $fetch<PassageResult>(`${baseURL}/verses/batch`, {
+      method: 'POST',
+      body: { references }
+    })
+  }
+
   // Search API
   const searchVerses = async (query: string, limit: number = 10): Promise<Verse[]> => {
     return await $fetch<Verse[]>(`${baseURL}/search`, {
-      query: { q: query, limit: limit.toString() }
+      query: { q: query, limit: limit.toString(), highlight: 'offsets' }
+    })
+  }
+
+  // Pass the previous page's cursor to continue where it ended
+  const searchVersesPage = async (query: string, limit: number = 20, cursor?: string | null): Promise<SearchResult> => {
+    const response = await $fetch.raw<Verse[]>(`${baseURL}/search`, {
+      query: { q: query, limit: limit.toString(), highlight: 'offsets', ...(cursor ? { cursor } : {}) }
     })
+    return {
+      verses: response._data ?? [],
+      total: Number(response.headers.get('X-Total-Count') ?? 0),
+      query,
+      cursor: response.headers.get('X-Next-Cursor')
+    }
   }
 
   // Stats API
@@ -46,11 +90,16 @@ export const useApi = () => {
   return {
     getBooks,
     getBookChapters,
+    getChapter,
     getChapterVerses,
     getVerse,
     getRandomVerse,
+    getDailyVerse,
     getVerseByReference,
+    getPassage,
+    getVersesBatch,
     searchVerses,
+    searchVersesPage,
     getStats
   }
 }
\ No newline at end of file
@@ -4,19 +4,23 @@ export interface Book {
   testament: 'old_testament' | 'new_testament'
   url: string
   total_chapters: number
-  created_at: string
-  updated_at: string
+  biblical_order?: number | null
 }
 
 export interface Chapter {
   id: number
   book_id: number
   chapter_number: number
-  total_verses: number
-  scraped_at: string
-  created_at: string
-  updated_at: string
+  total_verses: number | null
   book_name: string
+  testament: string
+}
+
+// /chapters/{id}/verses: chapter header once, compact verses, prev/next chapter in biblical order
+export interface ChapterPayload extends Chapter {
+  prev_chapter_id: number | null
+  next_chapter_id: number | null
+  verses: Pick<Verse, 'id' | 'verse_number' | 'text'>[]
 }
 
 export interface Verse {
@@ -24,19 +28,35 @@ export interface Verse {
   chapter_id: number
   verse_number: number
   text: string
-  created_at: string
-  updated_at: string
   chapter_number: number
   book_name: string
   testament: string
   book_id?: number
   relevance_score?: number
+  matches?: [number, number][]  // /search?highlight=offsets: [start, end) of each match in text
+  snippet?: string              // /search?highlight=snippet: HTML excerpt with <mark>
+  date?: string
+}
+
+export interface Passage {
+  reference: string
+  book_id: number
+  book_name: string
+  verses: Verse[]
+}
+
+export interface PassageResult {
+  reference: string
+  passages: Passage[]
+  total_verses: number
 }
 
+// One /search page: total from X-Total-Count, next page cursor from X-Next-Cursor
 export interface SearchResult {
   verses: Verse[]
   total: number
   query: string
+  cursor: string | null
 }
 
 export interface Stats {
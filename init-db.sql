@@ -36,7 +36,8 @@ CREATE TABLE IF NOT EXISTS verses (
     chapter_id INTEGER REFERENCES chapters(id) ON DELETE CASCADE,
     verse_number INTEGER NOT NULL,
     text TEXT NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    text_tsv tsvector GENERATED ALWAYS AS (to_tsvector('portuguese', text)) STORED
 );
 
 -- Create bible_verses view if not exists
@@ -55,5 +56,128 @@ ORDER BY b.biblical_order, c.chapter_number, v.verse_number;
 -- Create indexes for performance
 CREATE INDEX IF NOT EXISTS idx_chapters_book_id ON chapters(book_id);
 CREATE INDEX IF NOT EXISTS idx_verses_chapter_id ON verses(chapter_id);
+CREATE INDEX IF NOT EXISTS idx_chapters_book_chapter ON chapters(book_id, chapter_number);
+CREATE INDEX IF NOT EXISTS idx_verses_chapter_verse ON verses(chapter_id, verse_number);
 CREATE INDEX IF NOT EXISTS idx_books_testament ON books(testament);
-CREATE INDEX IF NOT EXISTS idx_verses_text ON verses USING gin(to_tsvector('portuguese', text));
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_verses_text_tsv ON verses USING gin(text_tsv);
+
+-- Per-book statistics summary (see migrations/002_book_stats.sql)
+CREATE TABLE IF NOT EXISTS book_stats (
+    book_id INTEGER PRIMARY KEY REFERENCES books(id) ON DELETE CASCADE,
+    total_chapters INTEGER NOT NULL DEFAULT 0,
+    total_verses INTEGER NOT NULL DEFAULT 0,
+    total_words BIGINT NOT NULL DEFAULT 0,
+    total_characters BIGINT NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Recompute one book (incremental, after ingesting it) or every book (NULL)
+CREATE OR REPLACE FUNCTION refresh_book_stats(p_book_id INTEGER DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    affected INTEGER;
+BEGIN
+    INSERT INTO book_stats (book_id, total_chapters, total_verses, total_words, total_characters, refreshed_at)
+    SELECT
+        b.id,
+        COUNT(DISTINCT c.id),
+        COUNT(v.id),
+        COALESCE(SUM(array_length(regexp_split_to_array(btrim(v.text), '\s+'), 1)), 0),
+        COALESCE(SUM(LENGTH(v.text)), 0),
+        CURRENT_TIMESTAMP
+    FROM books b
+    LEFT JOIN chapters c ON c.book_id = b.id
+    LEFT JOIN verses v ON v.chapter_id = c.id
+    WHERE p_book_id IS NULL OR b.id = p_book_id
+    GROUP BY b.id
+    ON CONFLICT (book_id) DO UPDATE SET
+        total_chapters = EXCLUDED.total_chapters,
+        total_verses = EXCLUDED.total_verses,
+        total_words = EXCLUDED.total_words,
+        total_characters = EXCLUDED.total_characters,
+        refreshed_at = EXCLUDED.refreshed_at;
+
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Durable scrape job queue (see migrations/004_scrape_jobs.sql)
+CREATE TABLE IF NOT EXISTS scrape_jobs (
+    book_id INTEGER NOT NULL REFERENCES books(id) ON DELETE CASCADE,
+    chapter_number INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    state VARCHAR(16) NOT NULL DEFAULT 'pending'
+        CHECK (state IN ('pending', 'in_flight', 'done', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    worker VARCHAR(64),
+    verses_saved INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    duration_ms INTEGER,
+    PRIMARY KEY (book_id, chapter_number)
+);
+
+CREATE INDEX IF NOT EXISTS idx_scrape_jobs_state ON scrape_jobs(state);
+
+-- Pre-rendered chapter reading payloads (see migrations/006_chapter_payloads.sql)
+CREATE TABLE IF NOT EXISTS chapter_payloads (
+    chapter_id INTEGER PRIMARY KEY REFERENCES chapters(id) ON DELETE CASCADE,
+    book_id INTEGER NOT NULL REFERENCES books(id) ON DELETE CASCADE,
+    payload TEXT NOT NULL,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Render one book's chapters (plus the neighbouring chapters whose prev/next
+-- point into it) after ingesting it, or every chapter (NULL)
+CREATE OR REPLACE FUNCTION refresh_chapter_payloads(p_book_id INTEGER DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    affected INTEGER;
+BEGIN
+    WITH nav AS (
+        SELECT c.id, c.book_id,
+               LAG(c.id) OVER w AS prev_chapter_id,
+               LEAD(c.id) OVER w AS next_chapter_id,
+               LAG(c.book_id) OVER w AS prev_book_id,
+               LEAD(c.book_id) OVER w AS next_book_id
+        FROM chapters c
+        JOIN books b ON b.id = c.book_id
+        WINDOW w AS (ORDER BY b.biblical_order NULLS LAST, b.id, c.chapter_number)
+    )
+    INSERT INTO chapter_payloads (chapter_id, book_id, payload, refreshed_at)
+    SELECT
+        c.id,
+        c.book_id,
+        json_build_object(
+            'id', c.id,
+            'book_id', c.book_id,
+            'chapter_number', c.chapter_number,
+            'total_verses', c.total_verses,
+            'book_name', b.name,
+            'testament', b.testament,
+            'prev_chapter_id', n.prev_chapter_id,
+            'next_chapter_id', n.next_chapter_id,
+            'verses', COALESCE((
+                SELECT json_agg(json_build_object('id', v.id, 'verse_number', v.verse_number, 'text', v.text)
+                                ORDER BY v.verse_number)
+                FROM verses v
+                WHERE v.chapter_id = c.id
+            ), '[]'::json)
+        )::text,
+        CURRENT_TIMESTAMP
+    FROM nav n
+    JOIN chapters c ON c.id = n.id
+    JOIN books b ON b.id = c.book_id
+    WHERE p_book_id IS NULL OR p_book_id IN (n.book_id, n.prev_book_id, n.next_book_id)
+    ON CONFLICT (chapter_id) DO UPDATE SET
+        book_id = EXCLUDED.book_id,
+        payload = EXCLUDED.payload,
+        refreshed_at = EXCLUDED.refreshed_at;
+
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
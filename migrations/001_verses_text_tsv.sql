@@ -0,0 +1,14 @@
+-- Stored Portuguese tsvector for /search?mode=fts
+-- Computed once on write instead of to_tsvector() per row per query.
+-- Safe to re-run.
+
+ALTER TABLE verses
+    ADD COLUMN IF NOT EXISTS text_tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('portuguese', text)) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_verses_text_tsv ON verses USING gin(text_tsv);
+
+-- Superseded by idx_verses_text_tsv (queries no longer call to_tsvector on the fly)
+DROP INDEX IF EXISTS idx_verses_text;
+
+ANALYZE verses;
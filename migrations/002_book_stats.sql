@@ -0,0 +1,45 @@
+-- Per-book corpus statistics, kept up to date by the ingestion side.
+-- /stats and /stats/books/{id} read this summary instead of aggregating
+-- the whole verses table on every request. Safe to re-run.
+
+CREATE TABLE IF NOT EXISTS book_stats (
+    book_id INTEGER PRIMARY KEY REFERENCES books(id) ON DELETE CASCADE,
+    total_chapters INTEGER NOT NULL DEFAULT 0,
+    total_verses INTEGER NOT NULL DEFAULT 0,
+    total_words BIGINT NOT NULL DEFAULT 0,
+    total_characters BIGINT NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Recompute one book (incremental, after ingesting it) or every book (NULL)
+CREATE OR REPLACE FUNCTION refresh_book_stats(p_book_id INTEGER DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    affected INTEGER;
+BEGIN
+    INSERT INTO book_stats (book_id, total_chapters, total_verses, total_words, total_characters, refreshed_at)
+    SELECT
+        b.id,
+        COUNT(DISTINCT c.id),
+        COUNT(v.id),
+        COALESCE(SUM(array_length(regexp_split_to_array(btrim(v.text), '\s+'), 1)), 0),
+        COALESCE(SUM(LENGTH(v.text)), 0),
+        CURRENT_TIMESTAMP
+    FROM books b
+    LEFT JOIN chapters c ON c.book_id = b.id
+    LEFT JOIN verses v ON v.chapter_id = c.id
+    WHERE p_book_id IS NULL OR b.id = p_book_id
+    GROUP BY b.id
+    ON CONFLICT (book_id) DO UPDATE SET
+        total_chapters = EXCLUDED.total_chapters,
+        total_verses = EXCLUDED.total_verses,
+        total_words = EXCLUDED.total_words,
+        total_characters = EXCLUDED.total_characters,
+        refreshed_at = EXCLUDED.refreshed_at;
+
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT refresh_book_stats();
@@ -0,0 +1,10 @@
+-- Composite indexes for point lookups by reference (book, chapter, verse).
+-- /verse/{book}/{chapter}/{verse} resolves the book name in the API and then
+-- queries by book_id + chapter_number + verse_number.
+-- Safe to re-run.
+
+CREATE INDEX IF NOT EXISTS idx_chapters_book_chapter ON chapters(book_id, chapter_number);
+CREATE INDEX IF NOT EXISTS idx_verses_chapter_verse ON verses(chapter_id, verse_number);
+
+ANALYZE chapters;
+ANALYZE verses;
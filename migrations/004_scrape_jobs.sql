@@ -0,0 +1,23 @@
+-- Durable scrape job queue: one row per (book, chapter) with its state,
+-- attempts, last error and timings. The scraper resumes from it after a
+-- crash and `selenium_main.py --retry-failed` re-runs only failed chapters.
+-- Safe to re-run.
+
+CREATE TABLE IF NOT EXISTS scrape_jobs (
+    book_id INTEGER NOT NULL REFERENCES books(id) ON DELETE CASCADE,
+    chapter_number INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    state VARCHAR(16) NOT NULL DEFAULT 'pending'
+        CHECK (state IN ('pending', 'in_flight', 'done', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    worker VARCHAR(64),
+    verses_saved INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    duration_ms INTEGER,
+    PRIMARY KEY (book_id, chapter_number)
+);
+
+CREATE INDEX IF NOT EXISTS idx_scrape_jobs_state ON scrape_jobs(state);
@@ -0,0 +1,7 @@
+-- books.biblical_order for databases created from database_schema.sql, which
+-- did not have the column. The values come from the book catalog
+-- (backend/bible_books.json): run `python backend/catalog.py --sync-db`
+-- afterwards. The API falls back to catalog order while the column is NULL.
+-- Safe to re-run.
+
+ALTER TABLE books ADD COLUMN IF NOT EXISTS biblical_order INTEGER;
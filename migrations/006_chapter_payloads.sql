@@ -0,0 +1,66 @@
+-- Pre-rendered chapter reading payloads: chapter header, prev/next chapter ids
+-- in biblical order and the verse array, as the JSON that
+-- /chapters/{id}/verses serves. Ingestion refreshes them per book
+-- (SELECT refresh_chapter_payloads(book_id)), so serving a chapter from the
+-- database is a single primary-key lookup. Safe to re-run.
+
+CREATE TABLE IF NOT EXISTS chapter_payloads (
+    chapter_id INTEGER PRIMARY KEY REFERENCES chapters(id) ON DELETE CASCADE,
+    book_id INTEGER NOT NULL REFERENCES books(id) ON DELETE CASCADE,
+    payload TEXT NOT NULL,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Render one book's chapters (plus the neighbouring chapters whose prev/next
+-- point into it) after ingesting it, or every chapter (NULL)
+CREATE OR REPLACE FUNCTION refresh_chapter_payloads(p_book_id INTEGER DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    affected INTEGER;
+BEGIN
+    WITH nav AS (
+        SELECT c.id, c.book_id,
+               LAG(c.id) OVER w AS prev_chapter_id,
+               LEAD(c.id) OVER w AS next_chapter_id,
+               LAG(c.book_id) OVER w AS prev_book_id,
+               LEAD(c.book_id) OVER w AS next_book_id
+        FROM chapters c
+        JOIN books b ON b.id = c.book_id
+        WINDOW w AS (ORDER BY b.biblical_order NULLS LAST, b.id, c.chapter_number)
+    )
+    INSERT INTO chapter_payloads (chapter_id, book_id, payload, refreshed_at)
+    SELECT
+        c.id,
+        c.book_id,
+        json_build_object(
+            'id', c.id,
+            'book_id', c.book_id,
+            'chapter_number', c.chapter_number,
+            'total_verses', c.total_verses,
+            'book_name', b.name,
+            'testament', b.testament,
+            'prev_chapter_id', n.prev_chapter_id,
+            'next_chapter_id', n.next_chapter_id,
+            'verses', COALESCE((
+                SELECT json_agg(json_build_object('id', v.id, 'verse_number', v.verse_number, 'text', v.text)
+                                ORDER BY v.verse_number)
+                FROM verses v
+                WHERE v.chapter_id = c.id
+            ), '[]'::json)
+        )::text,
+        CURRENT_TIMESTAMP
+    FROM nav n
+    JOIN chapters c ON c.id = n.id
+    JOIN books b ON b.id = c.book_id
+    WHERE p_book_id IS NULL OR p_book_id IN (n.book_id, n.prev_book_id, n.next_book_id)
+    ON CONFLICT (chapter_id) DO UPDATE SET
+        book_id = EXCLUDED.book_id,
+        payload = EXCLUDED.payload,
+        refreshed_at = EXCLUDED.refreshed_at;
+
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT refresh_chapter_payloads();